@@ -6,35 +6,107 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
 from pathlib import Path
+import importlib
 import sys
 import os
+import queue
 import subprocess
+import threading
+import time
 
 # Adicionar diretório modules ao path
 sys.path.insert(0, str(Path(__file__).parent / "modules"))
 
-from extrator import ExtratorPDF
-from gerador import GeradorOferta
-from conversor import ConversorPDF
+from cache import CacheExtracao
+from metricas import Metricas, medir
+from perfil import Perfilador, perfil_ativo
+
+# Módulos do pipeline: trazem pdfplumber/pdfminer, python-docx/lxml, NumPy e
+# docx2pdf, então não são importados junto com a janela. Eles são carregados
+# em segundo plano (_preaquecer) enquanto o operador escolhe o arquivo, e as
+# tarefas os importam na thread de trabalho, nunca na thread do Tk
+_MODULOS_PIPELINE = ('extrator', 'tabela', 'modelo', 'gerador', 'renderizador', 'conversor')
+
+# Opção "sem filtro" dos filtros de marca e unidade
+_TODAS = "Todas"
+
+# Linhas mostradas na prévia (a contagem considera todas)
+_LINHAS_PREVIA = 500
 
 class AplicacaoOfertaDia:
     """Interface gráfica principal"""
     
-    def __init__(self, root):
+    def __init__(self, root, perfil=False):
         self.root = root
         self.root.title("OFERTA DO DIA - Automação TARUMA")
-        self.root.geometry("800x600")
+        self.root.geometry("900x780")
         self.root.resizable(False, False)
         
         # Variáveis
         self.pdf_path = tk.StringVar()
         self.estoque_minimo = tk.IntVar(value=5)
+        # O docx2pdf depende do Word, que só existe no Windows/macOS
+        self.pdf_direto = tk.BooleanVar(value=sys.platform not in ('win32', 'darwin'))
+        # Com o PDF direto o DOCX só é gerado se pedido (pelo Word ele é sempre gerado)
+        self.com_docx = tk.BooleanVar(value=False)
+        self.marca = tk.StringVar(value=_TODAS)
+        self.unidade = tk.StringVar(value=_TODAS)
         self.produtos = []
+        # Perfil (cProfile/tracemalloc) de cada etapa em output/perfil/
+        self.perfil = perfil_ativo(perfil)
+        # Todos os produtos do PDF (sem filtro), extraídos uma única vez; os
+        # filtros da interface são aplicados sobre ela, sem reler o PDF
+        self.tabela = None
+        self._pdf_da_tabela = None
+        self._previa_agendada = None
         self.ultimo_docx = None
         self.ultimo_pdf = None
+        self.cache = CacheExtracao()
+        self._modelos = None
+        self._trava_modelos = threading.Lock()
+        
+        # O processamento roda numa thread separada e fala com a interface só
+        # por esta fila, que é esvaziada pela thread do Tk (_drenar_fila)
+        self.fila = queue.Queue()
+        self.cancelar = threading.Event()
+        self._trabalhando = False
         
         self._criar_interface()
         self._detectar_pdf_dia()
+        self._drenar_fila()
+        
+        # Qualquer mudança nos filtros atualiza a contagem e a prévia na hora
+        for variavel in (self.estoque_minimo, self.marca, self.unidade):
+            variavel.trace_add('write', lambda *args: self._agendar_previa())
+        self.pdf_path.trace_add('write', lambda *args: self._descartar_tabela())
+        
+        # Depois que a janela aparece, carrega as bibliotecas em segundo plano
+        self.root.after(100, lambda: threading.Thread(target=self._preaquecer, daemon=True).start())
+    
+    def _preaquecer(self):
+        """Importa os módulos do pipeline e compila o template (thread própria)"""
+        inicio = time.perf_counter()
+        for nome in _MODULOS_PIPELINE:
+            try:
+                importlib.import_module(nome)
+            except ImportError as e:
+                # Ex: docx2pdf ausente; o erro só importa se a etapa for usada
+                self._log(f"[INFO] Modulo {nome} indisponivel: {e}")
+        
+        try:
+            if Path("OFERTA-DO-DIA.docx").exists():
+                self._obter_modelos().obter("OFERTA-DO-DIA.docx")
+        except Exception as e:
+            self._log(f"[INFO] Template nao pre-compilado: {e}")
+        self._log(f"[INFO] Bibliotecas carregadas em {time.perf_counter() - inicio:.2f}s")
+    
+    def _obter_modelos(self):
+        """CacheModelos, criado no primeiro uso (importa o python-docx)"""
+        with self._trava_modelos:
+            if self._modelos is None:
+                from modelo import CacheModelos
+                self._modelos = CacheModelos()
+            return self._modelos
     
     def _criar_interface(self):
         """Cria elementos da interface"""
@@ -64,6 +136,17 @@ class AplicacaoOfertaDia:
         
         ttk.Label(config_frame, text="Estoque mínimo (caixas):").grid(row=0, column=0, sticky=tk.W)
         ttk.Spinbox(config_frame, from_=1, to=100, textvariable=self.estoque_minimo, width=10).grid(row=0, column=1, padx=10)
+        ttk.Checkbutton(config_frame, text="Gerar PDF direto (sem Word)", variable=self.pdf_direto).grid(row=0, column=2, padx=10)
+        ttk.Checkbutton(config_frame, text="Gerar DOCX também", variable=self.com_docx).grid(row=0, column=3, padx=10)
+        
+        ttk.Label(config_frame, text="Marca:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        self.combo_marca = ttk.Combobox(config_frame, textvariable=self.marca, values=[_TODAS], width=25, state='readonly')
+        self.combo_marca.grid(row=1, column=1, padx=10, pady=(5, 0))
+        ttk.Label(config_frame, text="Unidade:").grid(row=1, column=2, sticky=tk.W, padx=10, pady=(5, 0))
+        self.combo_unidade = ttk.Combobox(config_frame, textvariable=self.unidade, values=[_TODAS], width=8, state='readonly')
+        self.combo_unidade.grid(row=1, column=3, pady=(5, 0))
+        self.label_contagem = ttk.Label(config_frame, text="", font=('Arial', 10, 'bold'))
+        self.label_contagem.grid(row=1, column=4, padx=10, pady=(5, 0))
         
         # Seção 3: Ações
         ttk.Label(main_frame, text="3. Processar:", font=('Arial', 11, 'bold')).grid(row=6, column=0, sticky=tk.W, pady=(20, 5))
@@ -71,9 +154,17 @@ class AplicacaoOfertaDia:
         btn_frame = ttk.Frame(main_frame)
         btn_frame.grid(row=7, column=0, columnspan=3, pady=10)
         
-        ttk.Button(btn_frame, text="▶ GERAR OFERTA DO DIA", command=self._processar_completo, 
-                  style='Accent.TButton').pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="📄 Apenas Extrair Dados", command=self._apenas_extrair).pack(side=tk.LEFT, padx=5)
+        self.btn_gerar = ttk.Button(btn_frame, text="▶ GERAR OFERTA DO DIA", command=self._processar_completo, 
+                  style='Accent.TButton')
+        self.btn_gerar.pack(side=tk.LEFT, padx=5)
+        self.btn_extrair = ttk.Button(btn_frame, text="📄 Apenas Extrair Dados", command=self._apenas_extrair)
+        self.btn_extrair.pack(side=tk.LEFT, padx=5)
+        self.btn_cancelar = ttk.Button(btn_frame, text="✖ Cancelar", command=self._cancelar, state='disabled')
+        self.btn_cancelar.pack(side=tk.LEFT, padx=5)
+        
+        # Progresso por página da extração
+        self.progresso = ttk.Progressbar(btn_frame, length=200, mode='determinate')
+        self.progresso.pack(side=tk.LEFT, padx=5)
         
         # Seção 4: Abrir Arquivos
         ttk.Label(main_frame, text="4. Abrir Arquivos:", font=('Arial', 11, 'bold')).grid(row=7, column=0, sticky=tk.W, pady=(20, 5))
@@ -84,13 +175,17 @@ class AplicacaoOfertaDia:
         ttk.Button(open_frame, text="📄 Abrir DOCX", command=self._abrir_docx).pack(side=tk.LEFT, padx=5)
         ttk.Button(open_frame, text="📕 Abrir PDF", command=self._abrir_pdf).pack(side=tk.LEFT, padx=5)
         ttk.Button(open_frame, text="📂 Abrir Pasta Output", command=self._abrir_pasta).pack(side=tk.LEFT, padx=5)
+        ttk.Button(open_frame, text="🗑 Limpar Cache", command=self._limpar_cache).pack(side=tk.LEFT, padx=5)
+        
+        # Área de log e prévia dos produtos (abas)
+        ttk.Label(main_frame, text="Log de Execução / Prévia:", font=('Arial', 11, 'bold')).grid(row=9, column=0, sticky=tk.W, pady=(20, 5))
         
-        # Área de log
-        ttk.Label(main_frame, text="Log de Execução:", font=('Arial', 11, 'bold')).grid(row=9, column=0, sticky=tk.W, pady=(20, 5))
+        abas = ttk.Notebook(main_frame)
+        abas.grid(row=10, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
         
         # Frame com scrollbar para log
-        log_frame = ttk.Frame(main_frame)
-        log_frame.grid(row=10, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+        log_frame = ttk.Frame(abas)
+        abas.add(log_frame, text="Log")
         
         scrollbar = ttk.Scrollbar(log_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -100,6 +195,22 @@ class AplicacaoOfertaDia:
         self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=self.log_text.yview)
         
+        # Prévia dos produtos que entram na oferta com os filtros atuais
+        previa_frame = ttk.Frame(abas)
+        abas.add(previa_frame, text="Prévia dos Produtos")
+        
+        colunas = ('descricao', 'estoque', 'unidade', 'preco', 'marca')
+        self.previa = ttk.Treeview(previa_frame, columns=colunas, show='headings', height=12)
+        for coluna, titulo, largura in zip(colunas, ('Descrição', 'Estoque', 'Unid.', 'Preço', 'Marca'),
+                                          (330, 70, 50, 90, 160)):
+            self.previa.heading(coluna, text=titulo)
+            self.previa.column(coluna, width=largura, anchor=tk.W if coluna in ('descricao', 'marca') else tk.CENTER)
+        
+        scrollbar_previa = ttk.Scrollbar(previa_frame, command=self.previa.yview)
+        scrollbar_previa.pack(side=tk.RIGHT, fill=tk.Y)
+        self.previa.config(yscrollcommand=scrollbar_previa.set)
+        self.previa.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
         # Rodapé
         rodape = ttk.Label(main_frame, text="© 2025 TARUMA Comercial - Sistema de Automação", 
                           font=('Arial', 9), foreground='gray')
@@ -127,12 +238,169 @@ class AplicacaoOfertaDia:
             self._log(f"[OK] Arquivo selecionado: {filename}")
     
     def _log(self, mensagem):
-        """Adiciona mensagem ao log"""
-        self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, mensagem + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
-        self.root.update()
+        """Adiciona mensagem ao log (pode ser chamado de qualquer thread)"""
+        self.fila.put(('log', mensagem))
+    
+    def _na_interface(self, funcao, *args):
+        """Agenda uma chamada na thread do Tk (ex: messagebox a partir da thread de trabalho)"""
+        self.fila.put(('chamar', funcao, args))
+    
+    def _drenar_fila(self):
+        """Aplica as mensagens pendentes da fila em lote e se reagenda"""
+        linhas = []
+        chamadas = []
+        try:
+            try:
+                for _ in range(1000):
+                    mensagem = self.fila.get_nowait()
+                    if mensagem[0] == 'log':
+                        linhas.append(mensagem[1])
+                    elif mensagem[0] == 'progresso':
+                        _, atual, total = mensagem
+                        self.progresso.config(maximum=max(total, 1), value=atual)
+                    else:
+                        chamadas.append(mensagem)
+            except queue.Empty:
+                pass
+            
+            if linhas:
+                self.log_text.config(state='normal')
+                self.log_text.insert(tk.END, "\n".join(linhas) + "\n")
+                self.log_text.see(tk.END)
+                self.log_text.config(state='disabled')
+            
+            for _, funcao, args in chamadas:
+                # Uma chamada com erro não pode impedir as seguintes (ex:
+                # _tarefa_concluida, que reabilita os botões)
+                try:
+                    funcao(*args)
+                except Exception as e:
+                    nome = getattr(funcao, '__name__', repr(funcao))
+                    self._log(f"[ERRO] Erro na interface ({nome}): {e}")
+        finally:
+            # Reagenda sempre: se a fila parar, nenhuma mensagem chega mais à janela
+            self.root.after(50, self._drenar_fila)
+    
+    def _iniciar_tarefa(self, tarefa, *args):
+        """Executa tarefa(*args) numa thread de trabalho, bloqueando novos cliques até terminar"""
+        if self._trabalhando:
+            return
+        self._trabalhando = True
+        self.cancelar.clear()
+        self.progresso.config(value=0)
+        self.btn_gerar.config(state='disabled')
+        self.btn_extrair.config(state='disabled')
+        self.btn_cancelar.config(state='normal')
+        
+        def executar():
+            try:
+                from extrator import ExtracaoCancelada
+                try:
+                    tarefa(*args)
+                except ExtracaoCancelada:
+                    self._log("[INFO] Processamento cancelado")
+            except Exception as e:
+                self._log(f"\n[ERRO] {str(e)}")
+                self._na_interface(messagebox.showerror, "Erro", f"Erro durante processamento:\n{str(e)}")
+            finally:
+                self._na_interface(self._tarefa_concluida)
+        
+        threading.Thread(target=executar, daemon=True).start()
+    
+    def _tarefa_concluida(self):
+        self._trabalhando = False
+        self.btn_gerar.config(state='normal')
+        self.btn_extrair.config(state='normal')
+        self.btn_cancelar.config(state='disabled')
+    
+    def _cancelar(self):
+        """Pede para a extração em andamento parar na próxima página"""
+        self.cancelar.set()
+        self._log("[INFO] Cancelando...")
+    
+    def _agendar_previa(self):
+        """Atualiza a prévia logo após a última mudança nos filtros (digitação no spinbox)"""
+        if self._previa_agendada is not None:
+            self.root.after_cancel(self._previa_agendada)
+        self._previa_agendada = self.root.after(150, self._atualizar_previa)
+    
+    def _filtros(self):
+        """Filtros atuais da interface (lidos na thread do Tk)"""
+        try:
+            estoque_minimo = self.estoque_minimo.get()
+        except tk.TclError:
+            # Spinbox vazio ou com texto inválido durante a digitação
+            estoque_minimo = 0
+        marca = self.marca.get()
+        unidade = self.unidade.get()
+        return {
+            'estoque_minimo': estoque_minimo,
+            'marcas': None if marca == _TODAS else [marca],
+            'unidades': None if unidade == _TODAS else [unidade],
+        }
+    
+    def _atualizar_previa(self):
+        """Reaplica os filtros sobre a tabela em memória e mostra contagem e prévia"""
+        self._previa_agendada = None
+        if self.tabela is None:
+            self.label_contagem.config(text="")
+            return
+        
+        filtrada = self.tabela.filtrar(**self._filtros())
+        self.label_contagem.config(text=f"{len(filtrada)} de {len(self.tabela)} produtos")
+        
+        self.previa.delete(*self.previa.get_children())
+        for produto in filtrada[:_LINHAS_PREVIA]:
+            self.previa.insert('', tk.END, values=(
+                produto['descricao'], produto['estoque'], produto['unidade'],
+                f"R$ {produto['preco']:.2f}", produto['marca']
+            ))
+    
+    def _descartar_tabela(self):
+        """Outro PDF foi escolhido: a prévia do anterior deixa de valer"""
+        self.tabela = None
+        self._pdf_da_tabela = None
+        self.previa.delete(*self.previa.get_children())
+        self.label_contagem.config(text="")
+    
+    def _tabela_carregada(self, tabela, pdf_path):
+        """Guarda a tabela extraída e atualiza as opções dos filtros (thread do Tk)"""
+        self.tabela = tabela
+        self._pdf_da_tabela = pdf_path
+        self.combo_marca.config(values=[_TODAS] + sorted(tabela.valores('marca')))
+        self.combo_unidade.config(values=[_TODAS] + sorted(tabela.valores('unidade')))
+        self._atualizar_previa()
+    
+    def _obter_tabela(self, extrator):
+        """
+        Tabela completa do PDF (executado na thread de trabalho); só lê o PDF
+        se ele ainda não foi extraído ou se mudou
+        """
+        pdf_path = (extrator.pdf_path, os.path.getmtime(extrator.pdf_path))
+        if self.tabela is not None and self._pdf_da_tabela == pdf_path:
+            self._log(f"[OK] Usando os {len(self.tabela)} produtos já extraídos (filtros aplicados em memória)")
+            return self.tabela
+        
+        tabela = extrator.extrair_tabela()
+        if len(tabela):
+            self._na_interface(self._tabela_carregada, tabela, pdf_path)
+        return tabela
+    
+    def _produtos_filtrados(self, tabela, filtros, metricas=None):
+        """Aplica os filtros na tabela e devolve a lista de produtos da oferta"""
+        with medir(metricas, 'filtrar'):
+            produtos = tabela.filtrar(**filtros).para_lista()
+        if metricas is not None:
+            metricas.contar('produtos_emitidos', len(produtos))
+        print(f"Total de produtos filtrados (estoque > {filtros['estoque_minimo']}): {len(produtos)}")
+        return produtos
+    
+    def _novo_extrator(self, pdf_path, metricas=None):
+        """ExtratorPDF ligado à barra de progresso e ao botão Cancelar (thread de trabalho)"""
+        from extrator import ExtratorPDF
+        return ExtratorPDF(pdf_path, cache=self.cache, backend='auto',
+                           progresso=lambda atual, total: self.fila.put(('progresso', atual, total)),
+                           cancelar=self.cancelar, metricas=metricas)
     
     def _abrir_arquivo(self, caminho):
         """Abre arquivo com aplicação padrão do sistema"""
@@ -185,6 +453,11 @@ class AplicacaoOfertaDia:
         pasta_output.mkdir(parents=True, exist_ok=True)
         self._abrir_arquivo(str(pasta_output))
     
+    def _limpar_cache(self):
+        """Remove as extrações e os templates compilados em cache (força reprocessar)"""
+        removidas = self.cache.invalidar() + self._obter_modelos().invalidar()
+        self._log(f"[OK] Cache limpo ({removidas} entradas removidas)")
+    
     def _apenas_extrair(self):
         """Apenas extrai e mostra produtos filtrados"""
         if not self.pdf_path.get():
@@ -195,27 +468,37 @@ class AplicacaoOfertaDia:
         self._log("INICIANDO EXTRAÇÃO DE DADOS...")
         self._log("="*80)
         
+        # As variáveis do Tk são lidas aqui, na thread da interface
+        self._iniciar_tarefa(self._tarefa_extrair, self.pdf_path.get(), self._filtros())
+    
+    def _tarefa_extrair(self, pdf_path, filtros):
+        """Extração (executada na thread de trabalho)"""
+        from extrator import ExtracaoCancelada
+        
         try:
-            extrator = ExtratorPDF(self.pdf_path.get())
-            self.produtos = extrator.extrair_produtos(estoque_minimo=self.estoque_minimo.get())
+            extrator = self._novo_extrator(pdf_path)
+            estoque_minimo = filtros['estoque_minimo']
+            self.produtos = self._produtos_filtrados(self._obter_tabela(extrator), filtros)
             
             if self.produtos:
-                caminho_txt = extrator.salvar_resumo()
+                caminho_txt = extrator.salvar_resumo(produtos=self.produtos)
                 self._log(f"\n[OK] {len(self.produtos)} produtos extraídos com sucesso!")
                 self._log(f"[OK] Resumo salvo em: {caminho_txt}")
                 
-                messagebox.showinfo("Sucesso", 
-                    f"Extração concluída!\n\n{len(self.produtos)} produtos encontrados com estoque > {self.estoque_minimo.get()}\n\nResumo salvo em:\n{caminho_txt}")
+                self._na_interface(messagebox.showinfo, "Sucesso", 
+                    f"Extração concluída!\n\n{len(self.produtos)} produtos encontrados com estoque > {estoque_minimo}\n\nResumo salvo em:\n{caminho_txt}")
             else:
                 self._log("[AVISO] Nenhum produto encontrado com os critérios especificados")
-                messagebox.showwarning("Aviso", "Nenhum produto encontrado!")
+                self._na_interface(messagebox.showwarning, "Aviso", "Nenhum produto encontrado!")
                 
+        except ExtracaoCancelada:
+            raise
         except Exception as e:
             self._log(f"[ERRO] {str(e)}")
-            messagebox.showerror("Erro", f"Erro ao extrair dados:\n{str(e)}")
+            self._na_interface(messagebox.showerror, "Erro", f"Erro ao extrair dados:\n{str(e)}")
     
     def _processar_completo(self):
-        """Executa processo completo: extrair → gerar DOCX → converter PDF"""
+        """Executa processo completo: extrair → gerar DOCX → converter PDF (ou extrair → PDF direto)"""
         if not self.pdf_path.get():
             messagebox.showerror("Erro", "Selecione um arquivo PDF primeiro!")
             return
@@ -224,67 +507,107 @@ class AplicacaoOfertaDia:
         self._log("PROCESSAMENTO COMPLETO INICIADO")
         self._log("="*80)
         
+        perfilador = Perfilador("output/perfil") if self.perfil else None
+        metricas = Metricas(perfilador, pdf=self.pdf_path.get(), origem='app', pdf_direto=self.pdf_direto.get())
+        self._iniciar_tarefa(self._tarefa_completa, self.pdf_path.get(), self._filtros(),
+                             self.pdf_direto.get(), metricas, self.com_docx.get())
+    
+    def _tarefa_completa(self, pdf_path, filtros, pdf_direto, metricas, com_docx=False):
+        """Processo completo (executado na thread de trabalho)"""
+        from extrator import ExtracaoCancelada
+        
         try:
-            # Passo 1: Extrair produtos
-            self._log("\n[1/3] Extraindo produtos do PDF...")
-            extrator = ExtratorPDF(self.pdf_path.get())
-            self.produtos = extrator.extrair_produtos(estoque_minimo=self.estoque_minimo.get())
-            
-            if not self.produtos:
-                self._log("[ERRO] Nenhum produto encontrado!")
-                messagebox.showwarning("Aviso", "Nenhum produto encontrado com os critérios especificados!")
-                return
-            
-            self._log(f"[OK] {len(self.produtos)} produtos extraídos")
-            
-            # Passo 2: Gerar DOCX
+            extrator = self._novo_extrator(pdf_path, metricas)
+            sucesso = self._pipeline_completo(extrator, filtros, pdf_direto, metricas, com_docx)
+            metricas.definir('sucesso', sucesso)
+        except ExtracaoCancelada:
+            metricas.definir('cancelado', True)
+            raise
+        finally:
+            metricas.salvar()
+            if metricas.perfilador is not None:
+                self._log(f"[INFO] Perfil das etapas gravado em: {metricas.perfilador.pasta}")
+    
+    def _pipeline_completo(self, extrator, filtros, pdf_direto, metricas, com_docx=False):
+        """Extrair → gerar DOCX → PDF; devolve True se o PDF foi gerado
+
+        Com pdf_direto o DOCX só é gerado se com_docx (o renderizador não depende dele)
+        """
+        from extrator import ExtracaoCancelada
+        from gerador import GeradorOferta
+        
+        # Passo 1: Extrair produtos
+        self._log("\n[1/3] Extraindo produtos do PDF...")
+        self.produtos = self._produtos_filtrados(self._obter_tabela(extrator), filtros, metricas)
+        
+        if not self.produtos:
+            self._log("[ERRO] Nenhum produto encontrado!")
+            self._na_interface(messagebox.showwarning, "Aviso", "Nenhum produto encontrado com os critérios especificados!")
+            return False
+        
+        self._log(f"[OK] {len(self.produtos)} produtos extraídos")
+        
+        if self.cancelar.is_set():
+            raise ExtracaoCancelada()
+        
+        # Passo 2: Gerar DOCX
+        docx_path = None
+        if com_docx or not pdf_direto:
             self._log("\n[2/3] Gerando documento OFERTA-DO-DIA.docx...")
-            gerador = GeradorOferta(self.produtos)
+            gerador = GeradorOferta(self.produtos, modelos=self._obter_modelos(), metricas=metricas)
             docx_path = gerador.gerar_docx()
             
             if not docx_path:
                 self._log("[ERRO] Falha ao gerar DOCX!")
-                return
+                return False
             
             self._log(f"[OK] DOCX gerado: {docx_path}")
-            
-            # Passo 3: Converter para PDF
+        else:
+            self._log("\n[2/3] DOCX não solicitado (PDF direto)")
+        
+        # Passo 3: Converter para PDF
+        if pdf_direto:
+            self._log("\n[3/3] Gerando PDF direto...")
+            from renderizador import RenderizadorPDF
+            with medir(metricas, 'renderizar_pdf'):
+                pdf_path = RenderizadorPDF(self.produtos).gerar_pdf()
+        else:
             self._log("\n[3/3] Convertendo para PDF...")
-            conversor = ConversorPDF()
-            pdf_path = conversor.converter(docx_path)
+            # converter_lote abre o Word na própria thread (o COM precisa ser
+            # inicializado na thread que o usa, e esta não é a thread principal)
+            from conversor import ConversorPDF
+            pdf_path = ConversorPDF.converter_lote([docx_path], metricas=metricas)[0]['pdf']
+        
+        if pdf_path:
+            self._log(f"[OK] PDF gerado: {pdf_path}")
+            self._log("\n" + "="*80)
+            self._log("PROCESSO CONCLUÍDO COM SUCESSO!")
+            self._log("="*80)
             
-            if pdf_path:
-                self._log(f"[OK] PDF gerado: {pdf_path}")
-                self._log("\n" + "="*80)
-                self._log("PROCESSO CONCLUÍDO COM SUCESSO!")
-                self._log("="*80)
-                
-                # Armazenar caminhos
-                self.ultimo_docx = docx_path
-                self.ultimo_pdf = pdf_path
-                
-                # Abrir PDF automaticamente
-                self._log("\n[INFO] Abrindo PDF automaticamente...")
-                self._abrir_arquivo(pdf_path)
-                
-                messagebox.showinfo("Sucesso!", 
-                    f"OFERTA DO DIA gerada com sucesso!\n\n"
-                    f"Produtos incluídos: {len(self.produtos)}\n\n"
-                    f"Arquivos gerados:\n"
-                    f"• {docx_path}\n"
-                    f"• {pdf_path}\n\n"
-                    f"PDF aberto automaticamente!")
-            else:
-                self._log("[ERRO] Falha ao converter para PDF!")
-                
-        except Exception as e:
-            self._log(f"\n[ERRO] {str(e)}")
-            messagebox.showerror("Erro", f"Erro durante processamento:\n{str(e)}")
+            # Armazenar caminhos
+            self.ultimo_docx = docx_path
+            self.ultimo_pdf = pdf_path
+            
+            # Abrir PDF automaticamente
+            self._log("\n[INFO] Abrindo PDF automaticamente...")
+            self._na_interface(self._abrir_arquivo, pdf_path)
+            
+            arquivos = "".join(f"• {caminho}\n" for caminho in (docx_path, pdf_path) if caminho)
+            self._na_interface(messagebox.showinfo, "Sucesso!", 
+                f"OFERTA DO DIA gerada com sucesso!\n\n"
+                f"Produtos incluídos: {len(self.produtos)}\n\n"
+                f"Arquivos gerados:\n"
+                f"{arquivos}\n"
+                f"PDF aberto automaticamente!")
+            return True
+        
+        self._log("[ERRO] Falha ao converter para PDF!")
+        return False
 
 def main():
     """Função principal"""
     root = tk.Tk()
-    app = AplicacaoOfertaDia(root)
+    app = AplicacaoOfertaDia(root, perfil='--profile' in sys.argv[1:])
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,321 @@
+"""
+OFERTA DO DIA - Linha de comando (sem interface gráfica)
+Roda as etapas do pipeline com caminhos explícitos e devolve o resultado em
+JSON na saída padrão; as mensagens de progresso vão para a saída de erro.
+Não importa o Tk, então funciona em servidores sem tela.
+
+Uso:
+    python cli.py extract 22112025.PDF --json produtos.json
+    python cli.py generate produtos.json --docx saida/OFERTA-DO-DIA.docx
+    python cli.py convert saida/OFERTA-DO-DIA.docx
+    python cli.py run 22112025.PDF --saida saida/ --jobs 4
+    python cli.py batch exemplos/ --de 2025-11-01 --ate 2025-11-30
+    python cli.py diff 21112025.PDF 22112025.PDF --saida saida/
+    python cli.py variants exemplos/variantes.json 22112025.PDF --saida saida/variantes
+
+Códigos de saída: 0 = sucesso, 1 = falha no processamento, 2 = argumentos
+inválidos, 130 = interrompido (Ctrl+C)
+"""
+import argparse
+import contextlib
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Adicionar diretório modules ao path
+sys.path.insert(0, str(Path(__file__).parent / "modules"))
+
+# Os módulos do pipeline (pdfplumber, python-docx, docx2pdf...) são
+# importados dentro de cada comando, só quando são usados
+
+SUCESSO = 0
+FALHA = 1
+INTERROMPIDO = 130
+
+def _data(texto):
+    try:
+        return datetime.strptime(texto, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Data invalida (use AAAA-MM-DD): {texto}")
+
+def _data_validade(args, pdf_path=None):
+    """--data, senão a data do nome DDMMYYYY.PDF, senão hoje"""
+    if args.data:
+        return args.data
+    if pdf_path:
+        from lote import data_do_arquivo
+        data = data_do_arquivo(pdf_path)
+        if data:
+            return data
+    return datetime.now()
+
+def _cache(args):
+    if args.sem_cache:
+        return None
+    from cache import CacheExtracao
+    return CacheExtracao(args.cache_dir)
+
+def _extrair(args, metricas=None):
+    """Produtos filtrados do PDF do ERGON (ou None se o arquivo não existe)"""
+    from extrator import ExtratorPDF
+
+    if not Path(args.pdf).exists():
+        print(f"[ERRO] Arquivo {args.pdf} nao encontrado!")
+        return None
+    extrator = ExtratorPDF(args.pdf, cache=_cache(args), motor=args.motor, backend=args.backend,
+                           metricas=metricas)
+    return extrator.extrair_produtos(estoque_minimo=args.estoque_minimo, jobs=args.jobs)
+
+def comando_extract(args):
+    produtos = _extrair(args)
+    if produtos is None:
+        return FALHA, {'erro': f"Arquivo nao encontrado: {args.pdf}"}
+
+    resultado = {'pdf': args.pdf, 'produtos': len(produtos), 'json': None}
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(produtos, ensure_ascii=False, indent=2), encoding='utf-8')
+        resultado['json'] = args.json
+    if args.listar:
+        resultado['lista'] = produtos
+    return (SUCESSO if produtos else FALHA), resultado
+
+def comando_generate(args):
+    from gerador import GeradorOferta
+    from modelo import CacheModelos
+
+    if args.entrada.lower().endswith('.json'):
+        produtos = json.loads(Path(args.entrada).read_text(encoding='utf-8'))
+        data = _data_validade(args)
+    else:
+        args.pdf = args.entrada
+        produtos = _extrair(args)
+        if produtos is None:
+            return FALHA, {'erro': f"Arquivo nao encontrado: {args.entrada}"}
+        data = _data_validade(args, args.entrada)
+
+    modelos = CacheModelos(args.cache_dir) if not args.sem_cache else None
+    docx = GeradorOferta(produtos, modelos=modelos).gerar_docx(args.template, args.docx, data_validade=data)
+    resultado = {'entrada': args.entrada, 'produtos': len(produtos), 'docx': docx,
+                 'data_validade': data.strftime("%Y-%m-%d")}
+    return (SUCESSO if docx else FALHA), resultado
+
+def comando_convert(args):
+    from conversor import ConversorPDF
+
+    pdfs = None
+    if args.pdf:
+        if len(args.pdf) != len(args.docx):
+            return FALHA, {'erro': "Informe um --pdf para cada DOCX"}
+        pdfs = args.pdf
+    resultados = ConversorPDF.converter_lote(args.docx, pdfs, max_simultaneos=args.jobs or 1)
+    return (SUCESSO if all(r['sucesso'] for r in resultados) else FALHA), {'arquivos': resultados}
+
+def comando_run(args):
+    from gerador import GeradorOferta
+    from metricas import Metricas, medir
+    from modelo import CacheModelos
+    from perfil import Perfilador, perfil_ativo
+
+    saida = Path(args.saida)
+    data = _data_validade(args, args.pdf)
+    perfilador = Perfilador(saida / "perfil") if perfil_ativo(args.profile) else None
+    metricas = Metricas(perfilador, pdf=args.pdf, origem='cli', pdf_direto=not args.word)
+    resultado = {'pdf_ergon': args.pdf, 'data_validade': data.strftime("%Y-%m-%d"),
+                 'produtos': 0, 'docx': None, 'pdf': None, 'erro': None}
+
+    try:
+        produtos = _extrair(args, metricas)
+        if not produtos:
+            resultado['erro'] = "Nenhum produto encontrado" if produtos is not None else "Arquivo nao encontrado"
+            return FALHA, resultado
+        resultado['produtos'] = len(produtos)
+
+        # O renderizador direto não precisa do DOCX: só é gerado para o Word ou com --docx
+        if args.word or args.docx:
+            modelos = CacheModelos(args.cache_dir) if not args.sem_cache else None
+            resultado['docx'] = GeradorOferta(produtos, modelos=modelos, metricas=metricas).gerar_docx(
+                args.template, str(saida / "OFERTA-DO-DIA.docx"), data_validade=data)
+            if not resultado['docx']:
+                resultado['erro'] = "Falha ao gerar DOCX"
+                return FALHA, resultado
+
+        if args.word:
+            from conversor import ConversorPDF
+            resultado['pdf'] = ConversorPDF.converter(resultado['docx'], metricas=metricas)
+        else:
+            from renderizador import RenderizadorPDF
+            with medir(metricas, 'renderizar_pdf'):
+                resultado['pdf'] = RenderizadorPDF(produtos).gerar_pdf(
+                    args.template, str(saida / "OFERTA-DO-DIA.pdf"), data=data)
+        if not resultado['pdf']:
+            resultado['erro'] = "Falha ao gerar PDF"
+            return FALHA, resultado
+        return SUCESSO, resultado
+    finally:
+        metricas.definir('sucesso', resultado['erro'] is None)
+        metricas.salvar(str(saida / "metricas.jsonl"))
+        resultado['etapas_s'] = {nome: etapa['parede_s'] for nome, etapa in metricas.etapas.items()}
+
+def _produtos_de(args, entrada):
+    """Produtos filtrados de um PDF do ERGON ou de um JSON do extract (None se não existe)"""
+    if entrada.lower().endswith('.json'):
+        from extrator import ExtratorPDF
+
+        if not Path(entrada).exists():
+            print(f"[ERRO] Arquivo {entrada} nao encontrado!")
+            return None
+        produtos = json.loads(Path(entrada).read_text(encoding='utf-8'))
+        return ExtratorPDF.filtrar(produtos, args.estoque_minimo)
+    args.pdf = entrada
+    return _extrair(args)
+
+def comando_diff(args):
+    from delta import comparar, salvar_delta
+
+    anteriores = _produtos_de(args, args.anterior)
+    atuais = _produtos_de(args, args.atual)
+    if anteriores is None or atuais is None:
+        return FALHA, {'erro': "Arquivo nao encontrado"}
+
+    delta = comparar(anteriores, atuais)
+    json_path, txt_path = salvar_delta(delta, args.saida)
+    return SUCESSO, {'anterior': args.anterior, 'atual': args.atual, 'resumo': delta['resumo'],
+                     'json': json_path, 'texto': txt_path}
+
+def comando_variants(args):
+    from metricas import Metricas
+    from variantes import carregar_variantes, gerar_variantes
+
+    variantes = carregar_variantes(args.especificacao, args.saida)
+    if not Path(args.pdf).exists():
+        return FALHA, {'erro': f"Arquivo nao encontrado: {args.pdf}"}
+    metricas = Metricas(pdf=args.pdf, origem='cli', pdf_direto=not args.word)
+    resultados = gerar_variantes(args.pdf, variantes, data=args.data, pdf_direto=not args.word, jobs=args.jobs,
+                                 cache_dir=None if args.sem_cache else args.cache_dir, motor=args.motor,
+                                 metricas=metricas, docx=args.docx)
+    metricas.salvar(str(Path(args.saida) / "metricas.jsonl"))
+    sucesso = all(resultado['pdf'] for resultado in resultados)
+    return (SUCESSO if sucesso else FALHA), {'pdf_ergon': args.pdf, 'variantes': resultados}
+
+def comando_batch(args):
+    from lote import processar_lote
+
+    resultados = processar_lote(args.pasta, args.de, args.ate, saida=args.saida, template_path=args.template,
+                                estoque_minimo=args.estoque_minimo, pdf_direto=not args.word, jobs=args.jobs,
+                                perfil=args.profile, historico=args.historico, docx=args.docx,
+                                cache_dir=None if args.sem_cache else args.cache_dir)
+    for resultado in resultados:
+        # O registro completo já está em saida/metricas.jsonl
+        resultado.pop('metricas', None)
+    sucesso = bool(resultados) and all(resultado['pdf'] for resultado in resultados)
+    return (SUCESSO if sucesso else FALHA), {'dias': resultados}
+
+def _opcoes_extracao(parser):
+    parser.add_argument("--estoque-minimo", type=int, default=5, help="Estoque mínimo (padrão: 5)")
+    parser.add_argument("--jobs", type=int, default=1, help="Processos da extração (0 = um por núcleo)")
+    parser.add_argument("--motor", default="texto", choices=("texto", "colunas"), help="Motor de extração")
+    parser.add_argument("--backend", default="auto", choices=("auto", "pdfminer", "pdfium"),
+                        help="Leitor do PDF")
+    _opcoes_cache(parser)
+
+def _opcoes_cache(parser):
+    parser.add_argument("--sem-cache", action="store_true", help="Não usa o cache de extração/template")
+    parser.add_argument("--cache-dir", default="output/.cache", help="Pasta do cache")
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="OFERTA DO DIA - pipeline pela linha de comando (saída em JSON)")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    extract = comandos.add_parser("extract", help="Extrai e filtra os produtos do PDF do ERGON")
+    extract.add_argument("pdf", help="PDF do ERGON")
+    extract.add_argument("--json", help="Grava a lista de produtos neste arquivo JSON")
+    extract.add_argument("--listar", action="store_true", help="Inclui a lista de produtos no resultado")
+    _opcoes_extracao(extract)
+    extract.set_defaults(funcao=comando_extract)
+
+    generate = comandos.add_parser("generate", help="Gera o DOCX da oferta (a partir do PDF ou do JSON do extract)")
+    generate.add_argument("entrada", help="PDF do ERGON ou JSON gerado por 'extract --json'")
+    generate.add_argument("--docx", default="output/OFERTA-DO-DIA.docx", help="DOCX de saída")
+    generate.add_argument("--template", default="OFERTA-DO-DIA.docx", help="Template DOCX")
+    generate.add_argument("--data", type=_data, help="Data de validade (AAAA-MM-DD)")
+    _opcoes_extracao(generate)
+    generate.set_defaults(funcao=comando_generate)
+
+    convert = comandos.add_parser("convert", help="Converte DOCX para PDF pelo Word (docx2pdf)")
+    convert.add_argument("docx", nargs="+", help="Arquivos DOCX")
+    convert.add_argument("--pdf", nargs="+", help="PDFs de saída (um por DOCX; padrão: mesmo nome)")
+    convert.add_argument("--jobs", type=int, default=1, help="Sessões do Word em paralelo")
+    convert.set_defaults(funcao=comando_convert)
+
+    run = comandos.add_parser("run", help="Pipeline completo: extração → DOCX → PDF")
+    run.add_argument("pdf", help="PDF do ERGON")
+    run.add_argument("--saida", default="output", help="Pasta de saída (DOCX, PDF e metricas.jsonl)")
+    run.add_argument("--template", default="OFERTA-DO-DIA.docx", help="Template DOCX")
+    run.add_argument("--data", type=_data, help="Data de validade (padrão: a do nome do arquivo, ou hoje)")
+    run.add_argument("--word", action="store_true", help="Converte o PDF pelo Word em vez do renderizador direto")
+    run.add_argument("--docx", action="store_true", help="Grava também o DOCX com o renderizador direto")
+    run.add_argument("--profile", action="store_true", help="Grava cProfile/memória de cada etapa em saida/perfil/")
+    _opcoes_extracao(run)
+    run.set_defaults(funcao=comando_run)
+
+    diff = comandos.add_parser("diff", help="Alterações da oferta entre dois dias (novos, removidos, preço, estoque)")
+    diff.add_argument("anterior", help="PDF do ERGON (ou JSON do extract) do dia anterior")
+    diff.add_argument("atual", help="PDF do ERGON (ou JSON do extract) do dia")
+    diff.add_argument("--saida", default="output", help="Pasta de alteracoes.json e alteracoes.txt")
+    _opcoes_extracao(diff)
+    diff.set_defaults(funcao=comando_diff)
+
+    variants = comandos.add_parser("variants", help="Várias ofertas (filtro/ordem/template próprios) de uma extração")
+    variants.add_argument("especificacao", help="JSON com as variantes (ver exemplos/variantes.json)")
+    variants.add_argument("pdf", help="PDF do ERGON")
+    variants.add_argument("--saida", default="output/variantes", help="Pasta padrão (cada variante em saida/<nome>/)")
+    variants.add_argument("--data", type=_data, help="Data de validade (padrão: a do nome do arquivo, ou hoje)")
+    variants.add_argument("--word", action="store_true", help="Converte os PDFs pelo Word em vez do renderizador direto")
+    variants.add_argument("--docx", action="store_true", help="Grava também os DOCX com o renderizador direto")
+    variants.add_argument("--jobs", type=int, default=None, help="Processos para gerar as variantes (0 = um por núcleo)")
+    variants.add_argument("--motor", default="texto", choices=("texto", "colunas"), help="Motor de extração")
+    _opcoes_cache(variants)
+    variants.set_defaults(funcao=comando_variants)
+
+    batch = comandos.add_parser("batch", help="Vários dias (DDMMYYYY.PDF de uma pasta) em paralelo")
+    batch.add_argument("pasta", help="Pasta com os PDFs do ERGON")
+    batch.add_argument("--de", type=_data, help="Data inicial (AAAA-MM-DD)")
+    batch.add_argument("--ate", type=_data, help="Data final (AAAA-MM-DD)")
+    batch.add_argument("--saida", default="output", help="Pasta raiz (cada dia em saida/AAAA-MM-DD/)")
+    batch.add_argument("--template", default="OFERTA-DO-DIA.docx", help="Template DOCX")
+    batch.add_argument("--estoque-minimo", type=int, default=5, help="Estoque mínimo (padrão: 5)")
+    batch.add_argument("--jobs", type=int, default=None, help="Número de processos (padrão: um por núcleo)")
+    batch.add_argument("--word", action="store_true", help="Converte o PDF pelo Word em vez do renderizador direto")
+    batch.add_argument("--docx", action="store_true", help="Grava também o DOCX com o renderizador direto")
+    batch.add_argument("--profile", action="store_true", help="Grava cProfile/memória de cada etapa")
+    batch.add_argument("--historico", nargs="?", const="output/historico.sqlite3", default=None,
+                       help="Grava a extração completa de cada dia no histórico SQLite")
+    _opcoes_cache(batch)
+    batch.set_defaults(funcao=comando_batch)
+
+    return parser
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    if getattr(args, 'jobs', None) == 0:
+        args.jobs = None
+
+    saida_json = sys.stdout
+    try:
+        # Mensagens do pipeline vão para stderr; stdout fica só com o JSON
+        with contextlib.redirect_stdout(sys.stderr):
+            codigo, resultado = args.funcao(args)
+    except KeyboardInterrupt:
+        codigo, resultado = INTERROMPIDO, {'erro': "Interrompido"}
+    except Exception as e:
+        codigo, resultado = FALHA, {'erro': str(e)}
+
+    resultado = {'comando': args.comando, 'sucesso': codigo == SUCESSO, **resultado}
+    json.dump(resultado, saida_json, ensure_ascii=False, indent=2, default=str)
+    saida_json.write("\n")
+    return codigo
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Módulo Cache - Cache em disco da extração do PDF do ERGON
+Evita reprocessar o mesmo PDF a cada clique: a chave é o hash do conteúdo
+do arquivo mais a versão do parser. Um índice por arquivo guarda também os
+produtos de cada página pela impressão digital da página, para reprocessar
+só as páginas alteradas quando o mesmo PDF é reemitido.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+class CacheExtracao:
+    """Cache persistente (com descarte LRU) da lista completa de produtos de um PDF"""
+
+    def __init__(self, diretorio="output/.cache", tamanho_maximo=50 * 1024 * 1024):
+        """
+        Args:
+            diretorio (str): Pasta onde as entradas do cache são gravadas
+            tamanho_maximo (int): Tamanho máximo do cache em bytes; as entradas
+                usadas há mais tempo são descartadas quando o limite é excedido
+        """
+        self.diretorio = Path(diretorio)
+        self.tamanho_maximo = tamanho_maximo
+
+    def chave(self, pdf_path, versao):
+        """
+        Calcula a chave de cache de um PDF
+
+        Args:
+            pdf_path (str): Caminho do PDF do ERGON
+            versao (str): Versão do parser (muda a chave quando o parser muda)
+
+        Returns:
+            str: Chave no formato "<sha256 do conteúdo>-<versao>"
+        """
+        sha = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(bloco)
+        return f"{sha.hexdigest()}-{versao}"
+
+    def obter(self, chave):
+        """
+        Busca uma entrada no cache
+
+        Returns:
+            list: Produtos armazenados, ou None se não houver entrada
+        """
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                produtos = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        # Marca a entrada como usada recentemente (LRU pelo mtime); outro
+        # processo pode tê-la podado logo depois da leitura
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+        return produtos
+
+    def salvar(self, chave, produtos):
+        """Grava uma entrada no cache e descarta as mais antigas se passar do limite"""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        caminho = self._caminho(chave)
+
+        # Grava em arquivo temporário (nome único: vários processos usam o
+        # mesmo cache) e renomeia para nunca deixar entrada pela metade
+        fd, temporario = tempfile.mkstemp(suffix='.tmp', dir=self.diretorio)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(produtos, f, ensure_ascii=False)
+            os.replace(temporario, caminho)
+        except BaseException:
+            Path(temporario).unlink(missing_ok=True)
+            raise
+
+        self._podar()
+
+    def obter_paginas(self, pdf_path, versao):
+        """
+        Busca o índice de páginas da última extração deste arquivo
+
+        Args:
+            pdf_path (str): Caminho do PDF do ERGON (o índice é por caminho,
+                não por conteúdo, para sobreviver à reemissão do arquivo)
+            versao (str): Versão do parser
+
+        Returns:
+            dict: Impressão digital da página -> produtos da página, ou None
+        """
+        return self.obter(self._chave_paginas(pdf_path, versao))
+
+    def salvar_paginas(self, pdf_path, versao, paginas):
+        """Grava o índice de páginas (impressão digital -> produtos) deste arquivo"""
+        self.salvar(self._chave_paginas(pdf_path, versao), paginas)
+
+    def invalidar(self, pdf_path=None):
+        """
+        Remove entradas do cache
+
+        Args:
+            pdf_path (str): Remove apenas as entradas deste PDF (todas as versões
+                do parser). Se None, limpa o cache inteiro.
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        if pdf_path is None:
+            padrao = "*.json"
+        else:
+            padrao = f"{self.chave(pdf_path, '')[:-1]}-*.json"
+
+        removidas = 0
+        for caminho in self.diretorio.glob(padrao):
+            caminho.unlink(missing_ok=True)
+            removidas += 1
+        if pdf_path is not None:
+            for caminho in self.diretorio.glob(f"{self._chave_paginas(pdf_path, '')}*.json"):
+                caminho.unlink(missing_ok=True)
+                removidas += 1
+        return removidas
+
+    def _chave_paginas(self, pdf_path, versao):
+        """Chave do índice de páginas: "paginas-<sha256 do caminho>-<versao>" """
+        caminho = str(Path(pdf_path).resolve())
+        return f"paginas-{hashlib.sha256(caminho.encode('utf-8')).hexdigest()}-{versao}"
+
+    def _caminho(self, chave):
+        return self.diretorio / f"{chave}.json"
+
+    def _podar(self):
+        """Descarta as entradas usadas há mais tempo até caber no tamanho máximo"""
+        entradas = []
+        for caminho in self.diretorio.glob("*.json"):
+            # Outro processo pode ter acabado de podar ou substituir a entrada
+            try:
+                info = caminho.stat()
+            except OSError:
+                continue
+            entradas.append((info.st_mtime, info.st_size, caminho))
+
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, caminho in sorted(entradas):
+            if total <= self.tamanho_maximo:
+                break
+            try:
+                caminho.unlink(missing_ok=True)
+            except OSError:
+                continue
+            total -= tamanho
@@ -2,19 +2,31 @@
 Módulo Conversor - Converte DOCX para PDF
 """
 from docx2pdf import convert
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import queue
+import subprocess
+import sys
+import time
+
+from metricas import medir
+from perfil import perfilar
+
+# Formato "PDF" do SaveAs do Word (wdFormatPDF)
+_WD_FORMAT_PDF = 17
 
 class ConversorPDF:
     """Classe para converter DOCX para PDF"""
     
     @staticmethod
-    def converter(docx_path, pdf_path=None):
+    def converter(docx_path, pdf_path=None, metricas=None):
         """
         Converte arquivo DOCX para PDF
         
         Args:
             docx_path (str): Caminho do arquivo DOCX
             pdf_path (str): Caminho de saída do PDF (opcional)
+            metricas (Metricas): Recebe a latência da conversão (opcional)
             
         Returns:
             str: Caminho do arquivo PDF gerado
@@ -34,7 +46,8 @@ class ConversorPDF:
             Path(pdf_path).parent.mkdir(parents=True, exist_ok=True)
             
             # Converter
-            convert(docx_path, pdf_path)
+            with medir(metricas, 'conversao'):
+                convert(docx_path, pdf_path)
             
             print(f"[OK] PDF gerado: {pdf_path}")
             return pdf_path
@@ -43,6 +56,186 @@ class ConversorPDF:
             print(f"[ERRO] Erro ao converter para PDF: {e}")
             return None
 
+    @staticmethod
+    def converter_lote(docx_paths, pdf_paths=None, max_simultaneos=1, metricas=None):
+        """
+        Converte vários DOCX para PDF reaproveitando a mesma sessão do conversor
+        
+        Cada sessão (uma instância do Word) é aberta uma única vez e converte
+        vários arquivos em sequência; com max_simultaneos > 1, várias sessões
+        trabalham em paralelo sobre a mesma fila de arquivos.
+        
+        Args:
+            docx_paths (list): Caminhos dos arquivos DOCX
+            pdf_paths (list): Caminhos de saída dos PDFs (opcional, mesma ordem;
+                por padrão usa o mesmo nome do DOCX)
+            max_simultaneos (int): Número máximo de sessões convertendo ao mesmo tempo
+            metricas (Metricas): Recebe a latência de cada conversão (opcional)
+            
+        Returns:
+            list: Um dicionário por arquivo, na ordem de entrada, com as chaves
+            'docx', 'pdf' (None se falhou), 'sucesso', 'erro' e 'segundos'
+            (latência da conversão)
+        """
+        docx_paths = [str(caminho) for caminho in docx_paths]
+        if pdf_paths is None:
+            pdf_paths = [str(Path(caminho).with_suffix('.pdf')) for caminho in docx_paths]
+        
+        resultados = [
+            {'docx': docx, 'pdf': None, 'sucesso': False, 'erro': None, 'segundos': None}
+            for docx in docx_paths
+        ]
+        
+        pendentes = queue.Queue()
+        for indice, (docx, pdf) in enumerate(zip(docx_paths, pdf_paths)):
+            if not Path(docx).exists():
+                resultados[indice]['erro'] = "Arquivo DOCX nao encontrado"
+                print(f"[ERRO] Arquivo DOCX nao encontrado: {docx}")
+                continue
+            Path(pdf).parent.mkdir(parents=True, exist_ok=True)
+            pendentes.put((indice, docx, str(pdf)))
+        
+        if pendentes.empty():
+            return resultados
+        
+        perfilador = metricas.perfilador if metricas is not None else None
+        
+        def trabalhar(feitos):
+            try:
+                sessao = _abrir_sessao()
+            except Exception as e:
+                erro = f"Falha ao iniciar o conversor: {e}"
+                sessao = None
+            
+            try:
+                while True:
+                    try:
+                        indice, docx, pdf = pendentes.get_nowait()
+                    except queue.Empty:
+                        return
+                    
+                    feitos.append(indice)
+                    resultado = resultados[indice]
+                    if sessao is None:
+                        resultado['erro'] = erro
+                        print(f"[ERRO] {docx}: {erro}")
+                        continue
+                    
+                    inicio = time.perf_counter()
+                    try:
+                        print(f"Convertendo {docx} para PDF...")
+                        with perfilar(perfilador, 'conversao'):
+                            sessao.converter(docx, pdf)
+                        resultado['segundos'] = time.perf_counter() - inicio
+                        resultado['pdf'] = pdf
+                        resultado['sucesso'] = True
+                        print(f"[OK] PDF gerado: {pdf}")
+                    except (Exception, SystemExit) as e:
+                        # O docx2pdf encerra com sys.exit quando o Word do macOS falha
+                        resultado['erro'] = str(e) or e.__class__.__name__
+                        print(f"[ERRO] Erro ao converter {docx} para PDF: {resultado['erro']}")
+            finally:
+                if sessao is not None:
+                    sessao.fechar()
+        
+        sessoes = max(1, min(max_simultaneos, pendentes.qsize()))
+        with ThreadPoolExecutor(max_workers=sessoes) as executor:
+            trabalhos = []
+            for _ in range(sessoes):
+                feitos = []
+                trabalhos.append((executor.submit(trabalhar, feitos), feitos))
+        
+        # Falha da sessão fora de uma conversão (ex: o Word não fechou): vale
+        # para os arquivos que ela atendeu
+        for futuro, feitos in trabalhos:
+            try:
+                futuro.result()
+            except (Exception, SystemExit) as e:
+                erro = f"Falha no conversor: {str(e) or e.__class__.__name__}"
+                print(f"[ERRO] {erro}")
+                for indice in feitos:
+                    if resultados[indice]['erro'] is None:
+                        resultados[indice]['erro'] = erro
+        
+        # Arquivos que ficaram na fila porque todas as sessões falharam
+        while not pendentes.empty():
+            indice, docx, _ = pendentes.get_nowait()
+            resultados[indice]['erro'] = "Nao convertido: o conversor falhou antes deste arquivo"
+            print(f"[ERRO] {docx}: {resultados[indice]['erro']}")
+        
+        if metricas is not None:
+            # A CPU da conversão é gasta pelo Word, fora deste processo
+            latencias = [resultado['segundos'] for resultado in resultados if resultado['sucesso']]
+            for segundos in latencias:
+                metricas.registrar_etapa('conversao', segundos, 0.0)
+            metricas.definir('latencias_conversao_s', latencias)
+        
+        convertidos = sum(1 for resultado in resultados if resultado['sucesso'])
+        print(f"[OK] {convertidos}/{len(resultados)} arquivos convertidos para PDF")
+        return resultados
+
+def _abrir_sessao():
+    """Abre uma sessão de conversão para a plataforma atual"""
+    if sys.platform == 'win32':
+        return _SessaoWordWindows()
+    return _SessaoDocx2pdf()
+
+class _SessaoWordWindows:
+    """Uma instância do Word (COM) mantida aberta enquanto a sessão durar"""
+    
+    def __init__(self):
+        import pythoncom
+        import win32com.client
+        
+        # Cada thread precisa inicializar o COM antes de criar o Word
+        pythoncom.CoInitialize()
+        self._pythoncom = pythoncom
+        self._word = None
+        try:
+            self._word = win32com.client.DispatchEx("Word.Application")
+            self._word.Visible = False
+            self._word.DisplayAlerts = 0
+        except BaseException:
+            # Sem sessão, fechar() nunca é chamado: desfaz aqui o que já foi aberto
+            if self._word is not None:
+                try:
+                    self._word.Quit()
+                except Exception:
+                    pass
+            pythoncom.CoUninitialize()
+            raise
+    
+    def converter(self, docx_path, pdf_path):
+        doc = self._word.Documents.Open(str(Path(docx_path).resolve()), ReadOnly=True)
+        try:
+            doc.SaveAs(str(Path(pdf_path).resolve()), FileFormat=_WD_FORMAT_PDF)
+        finally:
+            doc.Close(0)
+    
+    def fechar(self):
+        try:
+            self._word.Quit()
+        finally:
+            self._pythoncom.CoUninitialize()
+
+class _SessaoDocx2pdf:
+    """
+    Sessão via docx2pdf (macOS): o Word é mantido aberto entre os arquivos
+    (keep_active) e fechado só no fim da sessão
+    """
+    
+    def __init__(self):
+        self._usou_word = False
+    
+    def converter(self, docx_path, pdf_path):
+        convert(docx_path, pdf_path, keep_active=True)
+        self._usou_word = True
+    
+    def fechar(self):
+        if self._usou_word and sys.platform == 'darwin':
+            subprocess.run(['osascript', '-e', 'tell application "Microsoft Word" to quit'],
+                           capture_output=True)
+
 if __name__ == "__main__":
     # Teste
     conversor = ConversorPDF()
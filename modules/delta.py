@@ -0,0 +1,117 @@
+"""
+Módulo Delta - O que mudou na oferta em relação ao dia anterior
+Compara duas extrações (listas de produtos do ExtratorPDF, do cache ou do
+JSON de 'cli.py extract') pelo código do produto e grava um relatório
+compacto (JSON e texto) só com os itens novos, os que saíram e os que
+mudaram de preço ou estoque, ao lado do produtos_filtrados.txt.
+"""
+import json
+from pathlib import Path
+
+def _indexar(produtos):
+    """
+    Índice código -> produto (se o código se repetir, vale a primeira linha)
+
+    Returns:
+        tuple: (dict código -> produto, lista de códigos na ordem original)
+    """
+    indice = {}
+    ordem = []
+    for produto in produtos:
+        codigo = produto['codigo']
+        if codigo not in indice:
+            indice[codigo] = produto
+            ordem.append(codigo)
+    return indice, ordem
+
+def comparar(anteriores, atuais):
+    """
+    Compara duas extrações pelo código do produto em tempo linear
+
+    Args:
+        anteriores (iterable): Produtos do dia anterior
+        atuais (iterable): Produtos do dia
+
+    Returns:
+        dict: 'novos' e 'removidos' (produtos), 'preco' e 'estoque' (produtos
+        do dia com 'preco_anterior'/'estoque_anterior') e 'resumo' com as
+        contagens. As listas seguem a ordem do relatório do ERGON.
+    """
+    antes, _ = _indexar(anteriores)
+    agora, ordem = _indexar(atuais)
+
+    novos = []
+    preco = []
+    estoque = []
+    for codigo in ordem:
+        produto = agora[codigo]
+        anterior = antes.get(codigo)
+        if anterior is None:
+            novos.append(produto)
+            continue
+        if produto['preco'] != anterior['preco']:
+            preco.append({**produto, 'preco_anterior': anterior['preco']})
+        if produto['estoque'] != anterior['estoque']:
+            estoque.append({**produto, 'estoque_anterior': anterior['estoque']})
+
+    removidos = [produto for codigo, produto in antes.items() if codigo not in agora]
+
+    return {
+        'resumo': {
+            'anteriores': len(antes),
+            'atuais': len(agora),
+            'novos': len(novos),
+            'removidos': len(removidos),
+            'preco': len(preco),
+            'estoque': len(estoque),
+        },
+        'novos': novos,
+        'removidos': removidos,
+        'preco': preco,
+        'estoque': estoque,
+    }
+
+def salvar_delta(delta, pasta="output", nome="alteracoes"):
+    """
+    Grava o relatório de alterações em <pasta>/<nome>.json e <nome>.txt
+
+    Args:
+        delta (dict): Resultado de comparar()
+        pasta (str): Pasta de saída (a mesma do produtos_filtrados.txt)
+        nome (str): Nome dos arquivos, sem extensão
+
+    Returns:
+        tuple: (caminho do JSON, caminho do texto)
+    """
+    pasta = Path(pasta)
+    pasta.mkdir(parents=True, exist_ok=True)
+    caminho_json = pasta / f"{nome}.json"
+    caminho_txt = pasta / f"{nome}.txt"
+
+    caminho_json.write_text(json.dumps(delta, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    resumo = delta['resumo']
+    with open(caminho_txt, 'w', encoding='utf-8') as f:
+        f.write("ALTERACOES EM RELACAO AO DIA ANTERIOR\n")
+        f.write("="*80 + "\n")
+        f.write(f"Novos: {resumo['novos']} | Removidos: {resumo['removidos']} | "
+                f"Preco alterado: {resumo['preco']} | Estoque alterado: {resumo['estoque']}\n")
+
+        f.write("\nNOVOS\n")
+        for p in delta['novos']:
+            f.write(f"   {p['codigo']} {p['descricao']} | {p['estoque']} {p['unidade']} | R$ {p['preco']:.2f}\n")
+
+        f.write("\nREMOVIDOS\n")
+        for p in delta['removidos']:
+            f.write(f"   {p['codigo']} {p['descricao']}\n")
+
+        f.write("\nPRECO ALTERADO\n")
+        for p in delta['preco']:
+            f.write(f"   {p['codigo']} {p['descricao']} | R$ {p['preco_anterior']:.2f} -> R$ {p['preco']:.2f}\n")
+
+        f.write("\nESTOQUE ALTERADO\n")
+        for p in delta['estoque']:
+            f.write(f"   {p['codigo']} {p['descricao']} | {p['estoque_anterior']} -> {p['estoque']} {p['unidade']}\n")
+
+    print(f"[OK] Alteracoes salvas em: {caminho_txt}")
+    return str(caminho_json), str(caminho_txt)
@@ -2,39 +2,125 @@
 Módulo Extrator - Extrai dados do PDF do ERGON
 Filtra produtos com estoque > 5 caixas
 """
-import pdfplumber
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from leitores import BACKENDS, abrir_leitor, impressoes_paginas
+from metricas import Metricas, medir
+
+# Versão do parser: faz parte da chave do cache de extração, então deve ser
+# incrementada sempre que mudar o resultado da extração de um mesmo PDF
+VERSAO_PARSER = "1"
+
+# Linhas de cabeçalho/rodapé do relatório do ERGON
+_LINHA_IGNORADA = re.compile(r'-----|Código|TARUMA|Emitido|Pagina')
+# Data/hora de emissão no fluxo de conteúdo: muda a cada reemissão do PDF em
+# todas as páginas, mas não afeta os produtos
+_EMISSAO_NO_FLUXO = re.compile(rb'\(Emitido em[^)]*\)')
+_UNIDADES = frozenset(('CX', 'FD', 'UN'))
+_PALAVRA = re.compile(r'\S+')
+
+# Motores de extração: 'texto' reconstrói as linhas com extract_text e as
+# tokeniza; 'colunas' distribui as palavras nas colunas pela posição x
+MOTORES = ('texto', 'colunas')
+
+# Colunas do relatório do ERGON: (campo, título no cabeçalho, alinhada à direita).
+# As colunas numéricas são alinhadas à direita, então são reconhecidas pela
+# borda direita da palavra; as demais pela borda esquerda
+_COLUNAS = (
+    ('codigo', 'Código', False),
+    ('numero', 'Número', False),
+    ('descricao', 'Descrição', False),
+    ('estoque', 'Estoque', True),
+    ('unidade', 'Unid.', False),
+    ('local', 'Local', False),
+    ('marca', 'Marca', False),
+    ('preco', 'Pr.Venda', True),
+)
+_TOLERANCIA_X = 2
+
+def _eh_inteiro(token):
+    """Equivalente a -?\\d+"""
+    return (token[1:] if token[:1] == '-' else token).isdecimal()
+
+def _eh_preco(token):
+    """Equivalente a [\\d,]+"""
+    digitos = token.replace(',', '')
+    return digitos == '' or digitos.isdecimal()
+
+class ExtracaoCancelada(Exception):
+    """A extração foi interrompida pelo evento de cancelamento"""
+
 class ExtratorPDF:
     """Classe para extrair e filtrar produtos do PDF do ERGON"""
     
-    def __init__(self, pdf_path):
+    def __init__(self, pdf_path, cache=None, motor='texto', backend='pdfminer', progresso=None, cancelar=None,
+                 metricas=None):
+        """
+        Args:
+            pdf_path (str): Caminho do PDF do ERGON
+            cache (CacheExtracao): Cache de extração em disco (opcional)
+            motor (str): 'texto' (padrão) ou 'colunas' (posição das palavras;
+                recupera linhas sem Marca ou com preço >= 1.000,00)
+            backend (str): Leitor do PDF: 'pdfminer' (padrão), 'pdfium' (texto
+                nativo, mais rápido) ou 'auto' (escolhe o mais rápido que
+                produzir os mesmos produtos numa página de amostra)
+            progresso (callable): Chamado como progresso(paginas_processadas,
+                total_paginas) após cada página (ou intervalo, no modo paralelo)
+            cancelar (threading.Event): Quando setado, a extração para na
+                próxima página com ExtracaoCancelada
+            metricas (Metricas): Recebe os tempos por página e os contadores
+                de linhas lidas/reconhecidas/ignoradas (opcional)
+        """
+        if motor not in MOTORES:
+            raise ValueError(f"Motor de extracao invalido: {motor} (use {', '.join(MOTORES)})")
+        if backend != 'auto' and backend not in BACKENDS:
+            raise ValueError(f"Backend de PDF invalido: {backend} (use auto, {', '.join(BACKENDS)})")
+        if motor == 'colunas' and backend == 'pdfium':
+            raise ValueError("O motor 'colunas' precisa do backend pdfminer (posicao das palavras)")
+        
         self.pdf_path = pdf_path
+        self.cache = cache
+        self.motor = motor
+        self.backend = backend
+        self._backend_resolvido = None if backend == 'auto' else backend
+        self.progresso = progresso
+        self.cancelar = cancelar
+        self.metricas = metricas
         self.produtos = []
+        self._layout_colunas = None
     
-    def extrair_produtos(self, estoque_minimo=5):
+    def extrair_produtos(self, estoque_minimo=5, jobs=1):
         """
         Extrai produtos do PDF e filtra por estoque mínimo
         
         Args:
             estoque_minimo (int): Estoque mínimo para filtrar (padrão: 5)
+            jobs (int): Número de processos para extrair as páginas em paralelo
+                (padrão: 1 = sequencial; None = um por núcleo)
             
         Returns:
             list: Lista de dicionários com dados dos produtos
         """
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                print(f"Processando {len(pdf.pages)} paginas...")
-                
-                for num_pagina, pagina in enumerate(pdf.pages, 1):
-                    texto = pagina.extract_text()
-                    self._processar_pagina(texto, estoque_minimo)
-                    print(f"[OK] Pagina {num_pagina} processada")
-                
-                print(f"\nTotal de produtos filtrados (estoque > {estoque_minimo}): {len(self.produtos)}")
-                return self.produtos
+            if self.cache is not None:
+                # O cache guarda a lista completa (sem filtro de estoque), então
+                # qualquer estoque_minimo é aplicado sobre as linhas em cache
+                self.produtos.extend(self.filtrar(self._extrair_com_cache(jobs), estoque_minimo))
+            else:
+                self.produtos.extend(self._extrair(estoque_minimo, jobs))
+            
+            if self.metricas is not None:
+                self.metricas.contar('produtos_emitidos', len(self.produtos))
+            print(f"\nTotal de produtos filtrados (estoque > {estoque_minimo}): {len(self.produtos)}")
+            return self.produtos
                 
+        except ExtracaoCancelada:
+            print("[INFO] Extracao cancelada")
+            raise
         except FileNotFoundError:
             print(f"[ERRO] Arquivo {self.pdf_path} nao encontrado!")
             return []
@@ -42,59 +128,511 @@ class ExtratorPDF:
             print(f"[ERRO] Erro ao processar PDF: {e}")
             return []
     
-    def _processar_pagina(self, texto, estoque_minimo):
-        """Processa uma página do PDF e extrai produtos"""
+    def extrair_tabela(self, jobs=1):
+        """
+        Extrai todos os produtos (sem filtro de estoque) para uma tabela colunar
+        
+        Os filtros (estoque mínimo, marca, unidade, faixa de preço) e a
+        ordenação são aplicados depois, na própria tabela, sem reprocessar o PDF.
+        
+        Args:
+            jobs (int): Número de processos (ver extrair_produtos)
+            
+        Returns:
+            TabelaProdutos: Tabela com todos os produtos (vazia em caso de erro)
+        """
+        from tabela import TabelaProdutos
+        
+        try:
+            if self.cache is not None:
+                todos = self._extrair_com_cache(jobs)
+            else:
+                todos = self._extrair(None, jobs)
+        except ExtracaoCancelada:
+            print("[INFO] Extracao cancelada")
+            raise
+        except FileNotFoundError:
+            print(f"[ERRO] Arquivo {self.pdf_path} nao encontrado!")
+            todos = []
+        except Exception as e:
+            print(f"[ERRO] Erro ao processar PDF: {e}")
+            todos = []
+        
+        tabela = TabelaProdutos.de_produtos(todos)
+        print(f"\nTotal de produtos extraidos: {len(tabela)}")
+        return tabela
+    
+    def _extrair_com_cache(self, jobs):
+        """Lista completa de produtos (sem filtro), lida do cache quando possível"""
+        versao = f"{VERSAO_PARSER}-{self.motor}-{self.backend}"
+        chave = self.cache.chave(self.pdf_path, versao)
+        with medir(self.metricas, 'cache_leitura'):
+            todos = self.cache.obter(chave)
+        if todos is None:
+            todos = self._extrair_incremental(versao, jobs)
+            with medir(self.metricas, 'cache_gravacao'):
+                self.cache.salvar(chave, todos)
+        else:
+            print(f"[OK] Produtos carregados do cache ({len(todos)} linhas)")
+            if self.metricas is not None:
+                self.metricas.contar('cache_acertos')
+        return todos
+    
+    def _extrair_incremental(self, versao, jobs):
+        """
+        Extrai o PDF reaproveitando as páginas que não mudaram desde a última
+        extração do mesmo arquivo
+        
+        Quando o ERGON reemite o PDF do dia, a maior parte das páginas é
+        idêntica: só as páginas cuja impressão digital (hash do fluxo de
+        conteúdo) mudou são processadas de novo; as demais vêm do índice de
+        páginas do cache.
+        
+        Returns:
+            list: Lista completa de produtos (sem filtro), na ordem das páginas
+        """
+        with medir(self.metricas, 'impressoes_paginas'):
+            impressoes = impressoes_paginas(self.pdf_path, ignorar=_EMISSAO_NO_FLUXO)
+            anteriores = self.cache.obter_paginas(self.pdf_path, versao) or {}
+        
+        pendentes = [numero for numero, impressao in enumerate(impressoes, 1) if impressao not in anteriores]
+        reaproveitadas = len(impressoes) - len(pendentes)
+        if reaproveitadas:
+            print(f"[OK] {reaproveitadas} de {len(impressoes)} paginas sem alteracao (carregadas do cache)")
+        
+        novas = dict(self._extrair_paginas(None, jobs, pendentes)) if pendentes else {}
+        paginas = {}
+        todos = []
+        for numero, impressao in enumerate(impressoes, 1):
+            produtos = novas[numero] if numero in novas else anteriores[impressao]
+            paginas[impressao] = produtos
+            todos.extend(produtos)
+        
+        with medir(self.metricas, 'cache_gravacao'):
+            self.cache.salvar_paginas(self.pdf_path, versao, paginas)
+        if self.metricas is not None:
+            self.metricas.contar('paginas_reaproveitadas', reaproveitadas)
+            self.metricas.contar('paginas_reprocessadas', len(pendentes))
+        return todos
+    
+    def _extrair(self, estoque_minimo, jobs):
+        """Extrai os produtos do PDF, sequencialmente ou em paralelo"""
+        return [produto for _, produtos in self._extrair_paginas(estoque_minimo, jobs) for produto in produtos]
+    
+    def _extrair_paginas(self, estoque_minimo, jobs, paginas=None):
+        """
+        Extrai os produtos de cada página, sequencialmente ou em paralelo
+        
+        Args:
+            estoque_minimo (int): Estoque mínimo (None não filtra)
+            jobs (int): Número de processos (ver extrair_produtos)
+            paginas (list): Números das páginas (a partir de 1); None = todas
+            
+        Returns:
+            list: Pares (número da página, produtos), na ordem das páginas
+        """
+        jobs = jobs or os.cpu_count() or 1
+        with medir(self.metricas, 'extracao'):
+            if jobs > 1:
+                return self._extrair_paralelo(estoque_minimo, jobs, paginas)
+            return list(self._iter_paginas(estoque_minimo, paginas))
+    
+    @staticmethod
+    def filtrar(produtos, estoque_minimo):
+        """
+        Filtra produtos com estoque acima do mínimo
+        
+        Args:
+            produtos (list): Lista de produtos (ex: lista completa do cache)
+            estoque_minimo (int): Estoque mínimo; None não filtra
+            
+        Returns:
+            list: Produtos com estoque > estoque_minimo
+        """
+        if estoque_minimo is None:
+            return list(produtos)
+        return [p for p in produtos if p['estoque'] > estoque_minimo]
+    
+    def iter_produtos(self, estoque_minimo=5):
+        """
+        Gera os produtos filtrados à medida que cada página é processada
+        
+        Os objetos de layout da página são liberados logo após a extração do
+        texto, então o consumo de memória não cresce com o número de páginas.
+        Ao contrário de extrair_produtos, não acumula em self.produtos e deixa
+        as exceções (ex: FileNotFoundError) propagarem.
+        
+        Args:
+            estoque_minimo (int): Estoque mínimo para filtrar (padrão: 5;
+                None não filtra)
+            
+        Yields:
+            dict: Dados de um produto
+        """
+        for _, produtos in self._iter_paginas(estoque_minimo):
+            yield from produtos
+    
+    def _iter_paginas(self, estoque_minimo, paginas=None):
+        """Gera (número da página, produtos) para as páginas pedidas (None = todas)"""
+        with abrir_leitor(self._resolver_backend(), self.pdf_path, paginas) as leitor:
+            total_paginas = len(leitor)
+            print(f"Processando {total_paginas} paginas...")
+            
+            for processadas, pagina in enumerate(leitor, 1):
+                self._verificar_cancelamento()
+                # O leitor libera os recursos da página ao avançar para a próxima
+                produtos = self._produtos_medidos(pagina, estoque_minimo)
+                print(f"[OK] Pagina {pagina.numero} processada")
+                if self.progresso is not None:
+                    self.progresso(processadas, total_paginas)
+                yield pagina.numero, produtos
+    
+    def _verificar_cancelamento(self):
+        """Interrompe a extração se o evento de cancelamento foi setado"""
+        if self.cancelar is not None and self.cancelar.is_set():
+            raise ExtracaoCancelada()
+    
+    def _resolver_backend(self):
+        """
+        Resolve o backend 'auto' na primeira extração
+        
+        Extrai a primeira página com os dois backends e usa o pdfium apenas se
+        ele for mais rápido e produzir exatamente os mesmos produtos.
+        """
+        if self._backend_resolvido is not None:
+            return self._backend_resolvido
+        
+        self._backend_resolvido = 'pdfminer'
+        if self.motor == 'colunas':
+            return self._backend_resolvido
+        
+        amostras = {}
+        for backend in BACKENDS:
+            inicio = time.perf_counter()
+            try:
+                with abrir_leitor(backend, self.pdf_path, paginas=[1]) as leitor:
+                    produtos = [self._processar_pagina(p.texto(), None) for p in leitor]
+            except ImportError:
+                continue
+            amostras[backend] = (time.perf_counter() - inicio, produtos)
+        
+        if 'pdfium' in amostras:
+            tempo_pdfium, produtos_pdfium = amostras['pdfium']
+            tempo_pdfminer, produtos_pdfminer = amostras['pdfminer']
+            if produtos_pdfium != produtos_pdfminer:
+                print("[INFO] Backend pdfium diverge do pdfminer na amostra; usando pdfminer")
+            elif tempo_pdfium < tempo_pdfminer:
+                self._backend_resolvido = 'pdfium'
+        
+        print(f"[INFO] Backend de PDF: {self._backend_resolvido}")
+        return self._backend_resolvido
+    
+    def _extrair_paralelo(self, estoque_minimo, jobs, paginas=None):
+        """
+        Divide as páginas em intervalos contíguos e extrai cada intervalo em um
+        processo separado. Os resultados são juntados na ordem original das
+        páginas, então a saída é idêntica à do modo sequencial.
+        """
+        backend = self._resolver_backend()
+        if paginas is None:
+            with abrir_leitor(backend, self.pdf_path) as leitor:
+                paginas = list(range(1, len(leitor) + 1))
+        total_paginas = len(paginas)
+        print(f"Processando {total_paginas} paginas...")
+        
+        jobs = min(jobs, total_paginas)
+        tamanho, resto = divmod(total_paginas, jobs)
+        
+        intervalos = []
+        inicio = 0
+        for i in range(jobs):
+            fim = inicio + tamanho + (1 if i < resto else 0)
+            intervalos.append(paginas[inicio:fim])
+            inicio = fim
+        
+        print(f"[INFO] Extraindo em paralelo com {jobs} processos")
+        produtos_extraidos = []
+        processadas = 0
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            resultados = executor.map(
+                _extrair_intervalo,
+                [self.pdf_path] * jobs,
+                intervalos,
+                [estoque_minimo] * jobs,
+                [self.motor] * jobs,
+                [backend] * jobs,
+                [self.metricas is not None] * jobs
+            )
+            for intervalo, (por_pagina, metricas) in zip(intervalos, resultados):
+                if self.cancelar is not None and self.cancelar.is_set():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise ExtracaoCancelada()
+                produtos_extraidos.extend(por_pagina)
+                if metricas is not None:
+                    self.metricas.mesclar(metricas)
+                print(f"[OK] Paginas {intervalo[0]}-{intervalo[-1]} processadas")
+                processadas += len(intervalo)
+                if self.progresso is not None:
+                    self.progresso(processadas, total_paginas)
+        
+        return produtos_extraidos
+    
+    def _produtos_medidos(self, pagina, estoque_minimo):
+        """_produtos_da_pagina, registrando o tempo da página nas métricas"""
+        if self.metricas is None:
+            return self._produtos_da_pagina(pagina, estoque_minimo)
+        
+        parede = time.perf_counter()
+        cpu = time.process_time()
+        produtos = self._produtos_da_pagina(pagina, estoque_minimo, self.metricas.contadores)
+        self.metricas.pagina(pagina.numero, time.perf_counter() - parede, time.process_time() - cpu,
+                             len(produtos))
+        return produtos
+    
+    def _produtos_da_pagina(self, pagina, estoque_minimo, contagem=None):
+        """Extrai os produtos filtrados de uma página com o motor configurado"""
+        if self.motor == 'colunas':
+            produtos = self._processar_pagina_colunas(pagina.palavras(), estoque_minimo, contagem)
+            if produtos is not None:
+                return produtos
+            # Página sem o cabeçalho do relatório: usa o motor de texto
+        
+        return self._processar_pagina(pagina.texto(), estoque_minimo, contagem)
+    
+    def _processar_pagina(self, texto, estoque_minimo, contagem=None):
+        """
+        Processa uma página do PDF e retorna os produtos filtrados
+        
+        Args:
+            contagem (dict): Quando informado, recebe a soma de linhas_lidas,
+                linhas_ignoradas e linhas_reconhecidas da página
+        """
+        produtos = []
         linhas = texto.split('\n')
+        ignoradas = reconhecidas = 0
         
         for linha in linhas:
             # Ignorar cabeçalhos e linhas de separação
             if self._ignorar_linha(linha):
+                ignoradas += 1
                 continue
             
             produto = self._extrair_produto(linha)
-            if produto and produto['estoque'] > estoque_minimo:
-                self.produtos.append(produto)
+            if produto:
+                reconhecidas += 1
+                if estoque_minimo is None or produto['estoque'] > estoque_minimo:
+                    produtos.append(produto)
+        
+        if contagem is not None:
+            _somar_linhas(contagem, len(linhas), ignoradas, reconhecidas)
+        return produtos
+    
+    def _processar_pagina_colunas(self, palavras, estoque_minimo, contagem=None):
+        """
+        Processa uma página pelo motor 'colunas'
+        
+        As posições das colunas são aprendidas uma vez, no cabeçalho
+        ("Código ... Pr.Venda") da primeira página, e reaproveitadas nas demais.
+        Apenas as palavras abaixo do cabeçalho (corpo da tabela) são usadas.
+        
+        Returns:
+            list: Produtos filtrados, ou None se o cabeçalho não foi encontrado
+        """
+        if self._layout_colunas is None:
+            self._layout_colunas = self._aprender_colunas(palavras)
+            if self._layout_colunas is None:
+                return None
+        
+        layout = self._layout_colunas
+        linhas = {}
+        for palavra in palavras:
+            if palavra['top'] < layout['corpo'] or palavra['text'].startswith('-----'):
+                continue
+            linhas.setdefault(round(palavra['top']), []).append(palavra)
+        
+        produtos = []
+        reconhecidas = 0
+        for topo in sorted(linhas):
+            campos = {campo: [] for campo, _, _ in _COLUNAS}
+            for palavra in sorted(linhas[topo], key=lambda p: p['x0']):
+                campos[self._coluna_da_palavra(palavra, layout)].append(palavra['text'])
+            
+            produto = self._montar_produto(campos)
+            if produto:
+                reconhecidas += 1
+                if estoque_minimo is None or produto['estoque'] > estoque_minimo:
+                    produtos.append(produto)
+        
+        if contagem is not None:
+            # O cabeçalho fica acima do corpo, então nenhuma linha é ignorada
+            _somar_linhas(contagem, len(linhas), 0, reconhecidas)
+        return produtos
+    
+    def _aprender_colunas(self, palavras):
+        """Localiza o cabeçalho do relatório e guarda a posição x de cada coluna"""
+        titulos = {titulo: campo for campo, titulo, _ in _COLUNAS}
+        encontrados = {}
+        topo_cabecalho = None
+        for palavra in palavras:
+            campo = titulos.get(palavra['text'])
+            if campo and (topo_cabecalho is None or abs(palavra['top'] - topo_cabecalho) < 1):
+                topo_cabecalho = palavra['top']
+                encontrados[campo] = palavra
+        
+        if len(encontrados) != len(_COLUNAS):
+            return None
+        
+        # O corpo da tabela começa depois da linha "-----" abaixo do cabeçalho
+        corpo = max(p['bottom'] for p in encontrados.values())
+        for palavra in palavras:
+            if palavra['text'].startswith('-----') and palavra['top'] > topo_cabecalho:
+                corpo = palavra['bottom']
+                break
+        
+        return {
+            'corpo': corpo,
+            'esquerda': [(encontrados[c]['x0'], c) for c, _, direita in _COLUNAS if not direita],
+            'direita': [(encontrados[c]['x1'], c) for c, _, direita in _COLUNAS if direita],
+        }
+    
+    def _coluna_da_palavra(self, palavra, layout):
+        """Decide a coluna de uma palavra pela posição x"""
+        for x1, campo in layout['direita']:
+            if abs(palavra['x1'] - x1) <= _TOLERANCIA_X:
+                return campo
+        
+        coluna = layout['esquerda'][0][1]
+        for x0, campo in layout['esquerda']:
+            if palavra['x0'] >= x0 - _TOLERANCIA_X:
+                coluna = campo
+        return coluna
+    
+    def _montar_produto(self, campos):
+        """Monta o produto a partir das palavras de cada coluna (motor 'colunas')"""
+        codigo = ' '.join(campos['codigo'])
+        estoque = ' '.join(campos['estoque'])
+        unidade = ' '.join(campos['unidade'])
+        preco = ' '.join(campos['preco'])
+        
+        if not codigo.isdecimal() or not _eh_inteiro(estoque) or unidade not in _UNIDADES:
+            return None
+        
+        try:
+            return {
+                'codigo': codigo,
+                'numero': ' '.join(campos['numero']),
+                'descricao': ' '.join(campos['descricao']),
+                'estoque': int(estoque),
+                'unidade': unidade,
+                'local': ' '.join(campos['local']),
+                'marca': ' '.join(campos['marca']),
+                'preco': float(preco.replace('.', '').replace(',', '.'))
+            }
+        except ValueError:
+            return None
     
     def _ignorar_linha(self, linha):
         """Verifica se a linha deve ser ignorada"""
-        return ('-----' in linha or 
-                'Código' in linha or 
-                'TARUMA' in linha or 
-                'Emitido' in linha or
-                'Pagina' in linha or
-                linha.strip() == '')
+        return _LINHA_IGNORADA.search(linha) is not None or not linha.strip()
     
     def _extrair_produto(self, linha):
-        """Extrai dados do produto de uma linha usando regex"""
-        # Padrão: Código Número Descrição Estoque Unid Local Marca Preço
-        padrao = r'^(\d+)\s+(\S+)\s+(.+?)\s+(-?\d+)\s+(CX|FD|UN)\s+(\S+)?\s+(.+?)\s+([\d,]+)$'
-        match = re.match(padrao, linha.strip())
+        """
+        Extrai dados do produto de uma linha
         
-        if match:
-            try:
-                return {
-                    'codigo': match.group(1),
-                    'numero': match.group(2),
-                    'descricao': match.group(3).strip(),
-                    'estoque': int(match.group(4)),
-                    'unidade': match.group(5),
-                    'local': match.group(6) if match.group(6) else "",
-                    'marca': match.group(7).strip(),
-                    'preco': float(match.group(8).replace(',', '.'))
-                }
-            except (ValueError, IndexError):
+        Layout: Código Número Descrição Estoque Unid [Local] Marca Preço
+        
+        Tokenizador de passagem única, equivalente à regex antiga
+        ^(\d+)\s+(\S+)\s+(.+?)\s+(-?\d+)\s+(CX|FD|UN)\s+(\S+)?\s+(.+?)\s+([\d,]+)$
+        mas sem backtracking: fixa Código/Número no início e Preço no fim e
+        ancora no primeiro par "Estoque Unid" que deixa campos suficientes
+        para Local e Marca.
+        """
+        texto = linha.strip()
+        tokens = texto.split()
+        total = len(tokens)
+        
+        # Mínimo: Código Número Estoque Unid Preço (demais campos dependem dos espaços)
+        if total < 5 or not tokens[0].isdecimal() or not _eh_preco(tokens[-1]):
+            return None
+        
+        if ' '.join(tokens) == texto:
+            # Caso comum (espaço simples entre os campos): busca direta
+            for k in range(3, total - 4):
+                if tokens[k + 1] in _UNIDADES and _eh_inteiro(tokens[k]):
+                    break
+            else:
+                return None
+            local = tokens[k + 2]
+            descricao = ' '.join(tokens[2:k])
+            marca = ' '.join(tokens[k + 3:-1])
+        else:
+            # Espaçamento irregular: a regex aceitava campos vazios quando
+            # havia espaços de sobra, então é preciso olhar o tamanho dos vãos
+            palavras = list(_PALAVRA.finditer(texto))
+            inicios = [m.start() for m in palavras]
+            fins = [m.end() for m in palavras]
+            
+            def vao(i):
+                return inicios[i] - fins[i - 1]
+            
+            # A Descrição só fica vazia (k == 2) se nenhuma outra âncora servir,
+            # igual à ordem em que a regex tentava as alternativas
+            for k in [*range(3, total - 2), 2]:
+                if tokens[k + 1] not in _UNIDADES or not _eh_inteiro(tokens[k]):
+                    continue
+                if k == 2 and vao(2) < 3:
+                    continue
+                
+                restantes = total - k - 3  # tokens entre Unid e Preço
+                if restantes >= 2:
+                    local = tokens[k + 2]
+                    marca = texto[inicios[k + 3]:fins[-2]]
+                elif restantes == 1 and vao(total - 1) >= 3:
+                    local, marca = tokens[k + 2], ""
+                elif restantes == 1 and vao(k + 2) >= 2:
+                    local, marca = "", tokens[k + 2]
+                elif restantes == 0 and vao(total - 1) >= 4:
+                    local, marca = "", ""
+                else:
+                    continue
+                descricao = texto[inicios[2]:fins[k - 1]] if k > 2 else ""
+                break
+            else:
                 return None
-        return None
+        
+        try:
+            return {
+                'codigo': tokens[0],
+                'numero': tokens[1],
+                'descricao': descricao.strip(),
+                'estoque': int(tokens[k]),
+                'unidade': tokens[k + 1],
+                'local': local,
+                'marca': marca.strip(),
+                'preco': float(tokens[-1].replace(',', '.'))
+            }
+        except ValueError:
+            return None
     
-    def salvar_resumo(self, caminho_saida="output/produtos_filtrados.txt"):
-        """Salva resumo dos produtos filtrados em arquivo de texto"""
+    def salvar_resumo(self, caminho_saida="output/produtos_filtrados.txt", produtos=None):
+        """
+        Salva resumo dos produtos filtrados em arquivo de texto
+        
+        Args:
+            caminho_saida (str): Caminho do arquivo de resumo
+            produtos (iterable): Produtos a salvar (padrão: self.produtos).
+                Aceita o gerador de iter_produtos para gravar durante a extração.
+        """
+        if produtos is None:
+            produtos = self.produtos
+        
         Path(caminho_saida).parent.mkdir(parents=True, exist_ok=True)
         
         with open(caminho_saida, 'w', encoding='utf-8') as f:
             f.write("PRODUTOS COM ESTOQUE > 5 CAIXAS\n")
             f.write("="*80 + "\n\n")
             
-            for i, p in enumerate(self.produtos, 1):
+            for i, p in enumerate(produtos, 1):
                 f.write(f"{i}. {p['descricao']}\n")
                 f.write(f"   Codigo: {p['codigo']} | Estoque: {p['estoque']} {p['unidade']} | Preco: R$ {p['preco']:.2f}\n")
                 f.write(f"   Marca: {p['marca']}\n\n")
@@ -102,6 +640,27 @@ class ExtratorPDF:
         print(f"[OK] Produtos salvos em: {caminho_saida}")
         return caminho_saida
 
+def _somar_linhas(contagem, lidas, ignoradas, reconhecidas):
+    contagem['linhas_lidas'] = contagem.get('linhas_lidas', 0) + lidas
+    contagem['linhas_ignoradas'] = contagem.get('linhas_ignoradas', 0) + ignoradas
+    contagem['linhas_reconhecidas'] = contagem.get('linhas_reconhecidas', 0) + reconhecidas
+
+def _extrair_intervalo(pdf_path, paginas, estoque_minimo, motor, backend, coletar_metricas=False):
+    """
+    Extrai os produtos de um intervalo de páginas (executado no processo filho)
+    
+    Returns:
+        tuple: (pares (número da página, produtos), métricas do intervalo
+        como dict ou None)
+    """
+    metricas = Metricas() if coletar_metricas else None
+    extrator = ExtratorPDF(pdf_path, motor=motor, backend=backend, metricas=metricas)
+    por_pagina = []
+    with abrir_leitor(backend, pdf_path, paginas) as leitor:
+        for pagina in leitor:
+            por_pagina.append((pagina.numero, extrator._produtos_medidos(pagina, estoque_minimo)))
+    return por_pagina, metricas.para_dict() if metricas is not None else None
+
 if __name__ == "__main__":
     from datetime import datetime
     
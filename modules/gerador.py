@@ -2,25 +2,41 @@
 Módulo Gerador - Gera documento OFERTA-DO-DIA.docx
 """
 from docx import Document
+from docx.oxml import parse_xml
 from pathlib import Path
 from datetime import datetime
 import os
 
+from metricas import medir
+from modelo import LINHA_INICIO, partes_prototipo, montar_linhas, reescrever_datas_validade
+
 class GeradorOferta:
     """Classe para gerar documento OFERTA-DO-DIA"""
     
-    def __init__(self, produtos):
+    def __init__(self, produtos, modelos=None, metricas=None):
+        """
+        Args:
+            produtos (iterable): Produtos a inserir na tabela
+            modelos (CacheModelos): Cache de templates compilados (opcional). Com
+                ele o template é analisado uma única vez e as gerações seguintes
+                não reabrem o DOCX do template.
+            metricas (Metricas): Recebe o tempo de cada etapa da geração e o
+                tamanho do DOCX (opcional)
+        """
         self.produtos = produtos
+        self.modelos = modelos
+        self.metricas = metricas
         self.template_path = None
         self.output_dir = "output"
     
-    def gerar_docx(self, template_path="OFERTA-DO-DIA.docx", output_path="output/OFERTA-DO-DIA.docx"):
+    def gerar_docx(self, template_path="OFERTA-DO-DIA.docx", output_path="output/OFERTA-DO-DIA.docx", data_validade=None):
         """
         Gera documento DOCX com produtos filtrados
         
         Args:
             template_path (str): Caminho do template DOCX
             output_path (str): Caminho de saída do DOCX gerado
+            data_validade (datetime): Data de validade da oferta (padrão: hoje)
             
         Returns:
             str: Caminho do arquivo gerado
@@ -29,30 +45,54 @@ class GeradorOferta:
         self.output_dir = os.path.dirname(output_path)
         
         try:
+            # Caminho rápido: esqueleto do template já compilado
+            modelo = None
+            if self.modelos is not None and Path(template_path).exists():
+                with medir(self.metricas, 'carregar_template'):
+                    modelo = self.modelos.obter(template_path)
+            
+            if modelo is not None:
+                print(f"[OK] Template carregado (compilado): {template_path}")
+                with medir(self.metricas, 'preencher_tabela'):
+                    linhas = montar_linhas(modelo.partes, self.produtos)
+                print(f"[OK] {len(linhas)} produtos inseridos na tabela (Colunas: Descrição, Unidade, Preço)")
+                
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                with medir(self.metricas, 'salvar_docx'):
+                    modelo.renderizar(linhas, output_path, data=data_validade)
+                print(f"[OK] DOCX gerado: {output_path}")
+                self._registrar_docx(output_path, len(linhas))
+                return output_path
+            
             # Criar novo documento ou usar template existente
-            if Path(template_path).exists():
-                doc = Document(template_path)
-                print(f"[OK] Template carregado: {template_path}")
-            else:
-                doc = Document()
-                self._criar_template_basico(doc)
-                print("[INFO] Criando documento novo (template nao encontrado)")
-                self.template_path = None # Marca que não usou template
+            with medir(self.metricas, 'carregar_template'):
+                if Path(template_path).exists():
+                    doc = Document(template_path)
+                    print(f"[OK] Template carregado: {template_path}")
+                else:
+                    doc = Document()
+                    self._criar_template_basico(doc, data_validade)
+                    print("[INFO] Criando documento novo (template nao encontrado)")
+                    self.template_path = None # Marca que não usou template
             
             # Adicionar produtos
-            self._adicionar_produtos(doc)
+            with medir(self.metricas, 'preencher_tabela'):
+                total = self._adicionar_produtos(doc)
+            
+            # Atualizar data de validade direto no XML das partes (antes de salvar),
+            # para que o pacote seja gravado uma única vez
+            if self.template_path:
+                with medir(self.metricas, 'data_validade'):
+                    self._adicionar_data_validade(doc, data_validade)
             
             # Garantir que diretório existe
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
             
             # Salvar documento
-            doc.save(output_path)
+            with medir(self.metricas, 'salvar_docx'):
+                doc.save(output_path)
             print(f"[OK] DOCX gerado: {output_path}")
-            
-            # Atualizar data de validade via XML (após salvar)
-            # Isso é feito DEPOIS de salvar porque precisamos editar o arquivo no disco
-            if self.template_path:
-                self._adicionar_data_validade(output_path)
+            self._registrar_docx(output_path, total)
             
             return output_path
             
@@ -62,97 +102,56 @@ class GeradorOferta:
             traceback.print_exc()
             return None
     
-    def _adicionar_data_validade(self, output_path):
+    def _registrar_docx(self, output_path, produtos):
+        """Guarda nas métricas o tamanho do DOCX gerado e quantos produtos ele tem"""
+        if self.metricas is not None:
+            self.metricas.definir('produtos_docx', produtos)
+            self.metricas.definir('tamanho_docx_bytes', os.path.getsize(output_path))
+    
+    def _adicionar_data_validade(self, doc, data_validade=None):
         """
-        Atualiza a data de validade editando diretamente o XML do DOCX
+        Atualiza a data de validade editando diretamente o XML das partes do DOCX
         Isso é necessário porque o python-docx as vezes não encontra textos em headers complexos
-        """
-        import zipfile
-        import re
-        import tempfile
-        import shutil
         
+        A edição é feita em memória, antes de salvar: só as partes que mencionam
+        VALIDO são substituídas e o documento é gravado uma única vez pelo doc.save
+        """
         print("[INFO] Tentando atualizar data via XML direto...")
         
-        # Criar diretório temporário
-        temp_dir = tempfile.mkdtemp()
-        
         try:
-            # Extrair DOCX
-            with zipfile.ZipFile(output_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
+            # Data de validade (hoje, se não informada)
+            data = data_validade or datetime.now()
+            data_hoje = data.strftime("%d/%m/%Y")
+            data_hoje_curta = data.strftime("%d/%m/%y")
             
-            # Data de hoje
-            data_hoje = datetime.now().strftime("%d/%m/%Y")
-            data_hoje_curta = datetime.now().strftime("%d/%m/%y")
-            
-            # Padrão para encontrar datas: DD/MM/YY ou DD/MM/YYYY
-            # Procura datas que estejam no mesmo arquivo XML que "VALIDO"
-            padrao_data = r'(\d{2}/\d{2}/\d{2,4})'
-            
-            # Arquivos para verificar
-            arquivos_modificados = 0
+            def nova_data(data_antiga, arquivo):
+                # Evitar substituir a própria data de hoje se já estiver certa
+                if data_antiga == data_hoje or data_antiga == data_hoje_curta:
+                    return None
+                
+                # Substituir pela data de hoje (mantendo formato curto/longo)
+                nova = data_hoje_curta if len(data_antiga) == 8 else data_hoje
+                print(f"[XML] Substituindo {data_antiga} por {nova} em {arquivo}")
+                return nova
             
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    if file.endswith('.xml'):
-                        file_path = os.path.join(root, file)
-                        
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        # Verificar se tem "VALIDO" neste arquivo
-                        if 'VALIDO' in content.upper() or 'VÁLIDO' in content.upper():
-                            # Procurar datas neste arquivo
-                            datas_encontradas = re.findall(padrao_data, content)
-                            
-                            if datas_encontradas:
-                                novo_content = content
-                                for data_antiga in datas_encontradas:
-                                    # Evitar substituir a própria data de hoje se já estiver certa
-                                    if data_antiga == data_hoje or data_antiga == data_hoje_curta:
-                                        continue
-                                        
-                                    # Substituir pela data de hoje (mantendo formato curto/longo)
-                                    if len(data_antiga) == 8: # DD/MM/YY
-                                        novo_content = novo_content.replace(data_antiga, data_hoje_curta)
-                                        print(f"[XML] Substituindo {data_antiga} por {data_hoje_curta} em {file}")
-                                    else: # DD/MM/YYYY
-                                        novo_content = novo_content.replace(data_antiga, data_hoje)
-                                        print(f"[XML] Substituindo {data_antiga} por {data_hoje} em {file}")
-                                
-                                if novo_content != content:
-                                    with open(file_path, 'w', encoding='utf-8') as f:
-                                        f.write(novo_content)
-                                    arquivos_modificados += 1
+            arquivos_modificados = reescrever_datas_validade(doc, nova_data)
             
             if arquivos_modificados > 0:
-                # Recompactar DOCX
-                with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zip_out:
-                    for root, dirs, files in os.walk(temp_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arcname = os.path.relpath(file_path, temp_dir)
-                            zip_out.write(file_path, arcname)
                 print(f"[OK] Data atualizada com sucesso via XML em {arquivos_modificados} arquivos!")
             else:
                 print("[INFO] Nenhuma data antiga encontrada para substituir no XML")
                 
         except Exception as e:
             print(f"[ERRO] Falha ao editar XML: {e}")
-        finally:
-            # Limpar temporários
-            shutil.rmtree(temp_dir)
 
-    
-    def _criar_template_basico(self, doc):
+    def _criar_template_basico(self, doc, data_validade=None):
         """Cria template básico se não existir"""
         # Título
         titulo = doc.add_heading('OFERTA DO DIA', 0)
         titulo.alignment = 1  # Centralizado
         
         # Data e Validade
-        data_hoje = datetime.now().strftime("%d/%m/%Y")
+        data_hoje = (data_validade or datetime.now()).strftime("%d/%m/%Y")
         p_data = doc.add_paragraph(f"Data: {data_hoje}")
         p_data.alignment = 1
         
@@ -166,70 +165,43 @@ class GeradorOferta:
         doc.add_paragraph("")  # Espaço
     
     def _adicionar_produtos(self, doc):
-        """Adiciona produtos à tabela existente no template"""
+        """Adiciona produtos à tabela existente no template e devolve quantos foram inseridos"""
         
         # Procurar tabela existente
         if not doc.tables:
             print("[ERRO] Nenhuma tabela encontrada no template!")
-            return
+            return 0
 
         tabela = doc.tables[0] # Usa a primeira tabela
         print(f"[INFO] Tabela encontrada: {len(tabela.rows)} linhas, {len(tabela.columns)} colunas")
         
-        # Identificar linha de início dos dados
-        # Assume que as 2 primeiras linhas são cabeçalho (baseado na análise: 'HIGIENE...' e 'NOME...')
-        linha_inicio = 2 
-        
-        # Limpar dados existentes (da linha_inicio em diante)
-        # Se houver muitas linhas vazias no template, vamos usá-las
-        # Se houver dados antigos, vamos sobrescrever
-        
-        total_produtos = len(self.produtos)
-        total_linhas_tabela = len(tabela.rows)
-        
-        for i, produto in enumerate(self.produtos):
-            indice_linha = linha_inicio + i
-            
-            # Se a linha já existe, usa ela
-            if indice_linha < total_linhas_tabela:
-                linha = tabela.rows[indice_linha]
-            else:
-                # Se não existe, cria nova
-                linha = tabela.add_row()
-            
-            # Preencher células (Mapeamento: 0=Desc, 1=Unid, 2=Preço)
-            celulas = linha.cells
-            
-            # Garantir 3 colunas
-            if len(celulas) >= 3:
-                # Descrição
-                celulas[0].text = str(produto['descricao'])
-                # Unidade (limpar 'CX' duplicado se vier da extração, ex: '255 CX')
-                # O template pede UNIDADE (ex: CX, FD, UN). 
-                # A extração retorna 'estoque' (ex: 955) e 'unidade' (ex: CX).
-                # O usuário quer apenas a UNIDADE na coluna 2? Ou Estoque?
-                # Na imagem 1: Coluna 2 tem "CX". Coluna 3 tem "R$ 118.00".
-                # O estoque NÃO aparece na imagem.
-                celulas[1].text = str(produto['unidade'])
-                
-                # Preço
-                celulas[2].text = f"R$ {produto['preco']:.2f}"
-                
-                # Centralizar Unidade e Preço (opcional, mas fica bonito)
-                for p in celulas[1].paragraphs: p.alignment = 1 # Center
-                for p in celulas[2].paragraphs: p.alignment = 1 # Center
-        
-        # Limpar linhas excedentes (se o template tiver mais linhas que produtos)
-        ultima_linha_preenchida = linha_inicio + total_produtos
-        
-        # Não podemos deletar linhas facilmente no python-docx sem mexer no XML
-        # Então vamos apenas limpar o texto das linhas sobrando para ficarem vazias
-        for i in range(ultima_linha_preenchida, total_linhas_tabela):
-            linha = tabela.rows[i]
-            for celula in linha.cells:
-                celula.text = ""
-        
-        print(f"[OK] {total_produtos} produtos inseridos na tabela (Colunas: Descrição, Unidade, Preço)")
+        # Preenchimento em lote direto no XML: a primeira linha de dados do
+        # template vira o protótipo, todas as linhas <w:tr> são montadas de uma
+        # vez a partir dele e substituem as linhas de dados antigas (as que
+        # sobrarem são removidas em vez de ficarem em branco)
+        tbl = tabela._tbl
+        linhas_xml = tbl.tr_lst
+        prototipo = linhas_xml[min(LINHA_INICIO, len(linhas_xml) - 1)]
+        partes = partes_prototipo(prototipo)
+        
+        if partes is None:
+            print("[ERRO] Tabela do template precisa ter pelo menos 3 colunas!")
+            return 0
+        
+        for linha in linhas_xml[LINHA_INICIO:]:
+            tbl.remove(linha)
+        
+        # self.produtos pode ser um gerador (ExtratorPDF.iter_produtos), então
+        # é percorrido uma única vez
+        novas_linhas = montar_linhas(partes, self.produtos)
+        
+        if novas_linhas:
+            declaracoes = partes[0]
+            bloco = parse_xml(f"<w:tbl {declaracoes}>{''.join(novas_linhas)}</w:tbl>")
+            tbl.extend(list(bloco))
+        
+        print(f"[OK] {len(novas_linhas)} produtos inseridos na tabela (Colunas: Descrição, Unidade, Preço)")
+        return len(novas_linhas)
 
 if __name__ == "__main__":
     # Teste com dados de exemplo
@@ -0,0 +1,374 @@
+"""
+Módulo Histórico - Arquivo SQLite com a extração completa de cada dia
+O resumo em produtos_filtrados.txt é sobrescrito a cada execução; aqui cada
+dia importado fica guardado (todas as linhas do PDF, sem filtro de estoque)
+para consultar o histórico de preço de um produto, o que mudou de um dia
+para o outro e quais produtos passaram a ter estoque suficiente.
+
+Uso:
+    python modules/historico.py importar exemplos/ --de 2025-01-01
+    python modules/historico.py precos 1234
+    python modules/historico.py variacoes 2025-11-22
+    python modules/historico.py limite 2025-11-22 --estoque-minimo 5
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+
+ARQUIVO_HISTORICO = "output/historico.sqlite3"
+
+# Linhas por chamada de executemany na importação
+_TAMANHO_LOTE = 10000
+# A partir de quantos dias numa importação os índices de consulta são
+# recriados no fim em vez de atualizados linha a linha (carga inicial de um
+# ano inteiro, por exemplo)
+_DIAS_RECRIAR_INDICES = 30
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS dias (
+    data TEXT PRIMARY KEY,
+    pdf TEXT,
+    linhas INTEGER NOT NULL,
+    importado_em TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS produtos (
+    data TEXT NOT NULL,
+    codigo TEXT NOT NULL,
+    numero TEXT NOT NULL,
+    descricao TEXT NOT NULL,
+    estoque INTEGER NOT NULL,
+    unidade TEXT NOT NULL,
+    local TEXT NOT NULL,
+    marca TEXT NOT NULL,
+    preco REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_produtos_data ON produtos (data);
+"""
+
+# Índices das consultas; o índice por data fica sempre, pois a importação
+# usa para substituir um dia já gravado
+_INDICES_CONSULTA = """
+CREATE INDEX IF NOT EXISTS idx_produtos_codigo_data ON produtos (codigo, data);
+CREATE INDEX IF NOT EXISTS idx_produtos_marca ON produtos (marca);
+"""
+
+_INSERIR_PRODUTO = """
+INSERT INTO produtos (data, codigo, numero, descricao, estoque, unidade, local, marca, preco)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _texto_data(data):
+    """datetime/date ou 'AAAA-MM-DD' -> 'AAAA-MM-DD'"""
+    if isinstance(data, (datetime, date)):
+        return data.strftime("%Y-%m-%d")
+    return datetime.strptime(data, "%Y-%m-%d").strftime("%Y-%m-%d")
+
+class HistoricoProdutos:
+    """Arquivo SQLite (local, sem servidor) com os produtos de cada dia"""
+
+    def __init__(self, caminho=ARQUIVO_HISTORICO):
+        """
+        Args:
+            caminho (str): Arquivo do banco (criado se não existir)
+        """
+        self.caminho = caminho
+        if caminho != ":memory:":
+            Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+        # Transações controladas explicitamente (BEGIN/COMMIT em importar)
+        self._conexao = sqlite3.connect(caminho, isolation_level=None)
+        self._conexao.row_factory = sqlite3.Row
+        self._conexao.executescript(_ESQUEMA + _INDICES_CONSULTA)
+
+    def close(self):
+        self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def importar_dia(self, data, produtos, pdf=None):
+        """
+        Grava a extração completa de um dia (substitui o dia se já existir)
+
+        Args:
+            data (datetime): Data do relatório
+            produtos (iterable): Produtos do ExtratorPDF, sem filtro de estoque
+                (lista de dicionários ou TabelaProdutos)
+            pdf (str): PDF de origem (informativo)
+
+        Returns:
+            int: Número de linhas gravadas
+        """
+        return self.importar([(data, produtos, pdf)])[0]
+
+    def importar(self, dias):
+        """
+        Grava vários dias numa única transação
+
+        As linhas são inseridas com executemany em lotes de _TAMANHO_LOTE;
+        um dia já importado é substituído. Se algo falhar, nada é gravado.
+        Em cargas grandes os índices de consulta são recriados uma vez no fim,
+        o que é bem mais rápido que mantê-los a cada linha.
+
+        Args:
+            dias (list): Tuplas (data, produtos, pdf)
+
+        Returns:
+            list: Número de linhas gravadas de cada dia
+        """
+        gravadas = []
+        recriar_indices = len(dias) >= _DIAS_RECRIAR_INDICES
+        self._conexao.execute("BEGIN")
+        try:
+            if recriar_indices:
+                self._conexao.execute("DROP INDEX IF EXISTS idx_produtos_codigo_data")
+                self._conexao.execute("DROP INDEX IF EXISTS idx_produtos_marca")
+
+            for data, produtos, pdf in dias:
+                data = _texto_data(data)
+                self._conexao.execute("DELETE FROM produtos WHERE data = ?", (data,))
+
+                linhas = (
+                    (data, p['codigo'], p['numero'], p['descricao'], p['estoque'], p['unidade'], p['local'],
+                     p['marca'], p['preco'])
+                    for p in produtos
+                )
+                total = 0
+                while True:
+                    lote = list(islice(linhas, _TAMANHO_LOTE))
+                    if not lote:
+                        break
+                    self._conexao.executemany(_INSERIR_PRODUTO, lote)
+                    total += len(lote)
+
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO dias (data, pdf, linhas, importado_em) VALUES (?, ?, ?, ?)",
+                    (data, pdf, total, datetime.now().isoformat(timespec='seconds'))
+                )
+                gravadas.append(total)
+
+            if recriar_indices:
+                for comando in _INDICES_CONSULTA.strip().splitlines():
+                    self._conexao.execute(comando)
+            self._conexao.execute("COMMIT")
+        except BaseException:
+            self._conexao.execute("ROLLBACK")
+            raise
+        return gravadas
+
+    def dias(self):
+        """
+        Returns:
+            list: Datas importadas ('AAAA-MM-DD'), em ordem
+        """
+        return [linha['data'] for linha in self._conexao.execute("SELECT data FROM dias ORDER BY data")]
+
+    def dia_anterior(self, data):
+        """
+        Returns:
+            str: Último dia importado antes de 'data', ou None
+        """
+        linha = self._conexao.execute(
+            "SELECT MAX(data) AS data FROM dias WHERE data < ?", (_texto_data(data),)
+        ).fetchone()
+        return linha['data']
+
+    def historico_precos(self, codigo, data_inicial=None, data_final=None):
+        """
+        Preço e estoque de um produto em cada dia importado
+
+        Args:
+            codigo (str): Código do produto no ERGON
+            data_inicial, data_final (datetime): Intervalo de datas (opcional)
+
+        Returns:
+            list: Dicionários com 'data', 'preco', 'estoque' e 'descricao',
+            em ordem de data
+        """
+        consulta = "SELECT data, preco, estoque, descricao FROM produtos WHERE codigo = ?"
+        parametros = [str(codigo)]
+        if data_inicial is not None:
+            consulta += " AND data >= ?"
+            parametros.append(_texto_data(data_inicial))
+        if data_final is not None:
+            consulta += " AND data <= ?"
+            parametros.append(_texto_data(data_final))
+        consulta += " ORDER BY data"
+        return [dict(linha) for linha in self._conexao.execute(consulta, parametros)]
+
+    def variacoes(self, data, anterior=None, marca=None):
+        """
+        Produtos cujo preço ou estoque mudou em relação ao dia anterior
+
+        Args:
+            data (datetime): Dia consultado
+            anterior (datetime): Dia de comparação (padrão: o último dia
+                importado antes de 'data')
+            marca (str): Considera apenas esta marca (opcional)
+
+        Returns:
+            list: Dicionários com 'codigo', 'descricao', 'marca', 'unidade',
+            'preco_anterior', 'preco', 'estoque_anterior' e 'estoque',
+            ordenados por código
+        """
+        data = _texto_data(data)
+        anterior = _texto_data(anterior) if anterior is not None else self.dia_anterior(data)
+        if anterior is None:
+            return []
+
+        consulta = """
+            SELECT atual.codigo, atual.descricao, atual.marca, atual.unidade,
+                   antes.preco AS preco_anterior, atual.preco,
+                   antes.estoque AS estoque_anterior, atual.estoque
+            FROM produtos AS atual
+            JOIN produtos AS antes ON antes.codigo = atual.codigo AND antes.data = ?
+            WHERE atual.data = ? AND (atual.preco != antes.preco OR atual.estoque != antes.estoque)
+        """
+        parametros = [anterior, data]
+        if marca is not None:
+            consulta += " AND atual.marca = ?"
+            parametros.append(marca)
+        consulta += " ORDER BY CAST(atual.codigo AS INTEGER)"
+        return [dict(linha) for linha in self._conexao.execute(consulta, parametros)]
+
+    def cruzaram_limite(self, data, estoque_minimo=5, anterior=None, marca=None):
+        """
+        Produtos que passaram a ter estoque acima do mínimo neste dia (no dia
+        anterior estavam no mínimo ou abaixo, ou não apareciam no relatório)
+
+        Args:
+            data (datetime): Dia consultado
+            estoque_minimo (int): Estoque mínimo da oferta
+            anterior (datetime): Dia de comparação (padrão: o último dia
+                importado antes de 'data')
+            marca (str): Considera apenas esta marca (opcional)
+
+        Returns:
+            list: Dicionários com 'codigo', 'descricao', 'marca', 'unidade',
+            'preco', 'estoque' e 'estoque_anterior' (None se o produto não
+            aparecia), ordenados por código; vazia se não há dia anterior
+        """
+        data = _texto_data(data)
+        anterior = _texto_data(anterior) if anterior is not None else self.dia_anterior(data)
+        if anterior is None:
+            return []
+
+        consulta = """
+            SELECT atual.codigo, atual.descricao, atual.marca, atual.unidade, atual.preco, atual.estoque,
+                   antes.estoque AS estoque_anterior
+            FROM produtos AS atual
+            LEFT JOIN produtos AS antes ON antes.codigo = atual.codigo AND antes.data = ?
+            WHERE atual.data = ? AND atual.estoque > ? AND (antes.estoque IS NULL OR antes.estoque <= ?)
+        """
+        parametros = [anterior, data, estoque_minimo, estoque_minimo]
+        if marca is not None:
+            consulta += " AND atual.marca = ?"
+            parametros.append(marca)
+        consulta += " ORDER BY CAST(atual.codigo AS INTEGER)"
+        return [dict(linha) for linha in self._conexao.execute(consulta, parametros)]
+
+def importar_pdfs(pasta, caminho=ARQUIVO_HISTORICO, data_inicial=None, data_final=None, motor='texto', cache=None):
+    """
+    Extrai os PDFs do ERGON de uma pasta (DDMMYYYY.PDF) e grava todos no
+    histórico numa única transação
+
+    Args:
+        pasta (str): Pasta com os PDFs
+        caminho (str): Arquivo do histórico
+        data_inicial, data_final (datetime): Intervalo de datas (opcional)
+        motor (str): Motor de extração ('texto' ou 'colunas')
+        cache (CacheExtracao): Cache da extração; os dias já processados pelo
+            lote ou pela interface não são extraídos de novo (opcional)
+
+    Returns:
+        int: Número de dias importados
+    """
+    from extrator import ExtratorPDF
+    from lote import listar_pdfs
+
+    arquivos = listar_pdfs(pasta, data_inicial, data_final)
+    if not arquivos:
+        print(f"[ERRO] Nenhum PDF do ERGON (DDMMYYYY.PDF) encontrado em: {pasta}")
+        return 0
+
+    dias = []
+    for data, pdf_path in arquivos:
+        # A tabela colunar ocupa bem menos memória que as listas de dicionários
+        # enquanto os dias aguardam a transação
+        tabela = ExtratorPDF(pdf_path, cache=cache, motor=motor, backend='auto').extrair_tabela()
+        if len(tabela):
+            dias.append((data, tabela, pdf_path))
+
+    inicio = time.perf_counter()
+    with HistoricoProdutos(caminho) as historico:
+        gravadas = historico.importar(dias)
+    print(f"[OK] {len(dias)} dias ({sum(gravadas)} linhas) gravados em {caminho} "
+          f"em {time.perf_counter() - inicio:.2f}s")
+    return len(dias)
+
+def _data_argumento(texto):
+    try:
+        return datetime.strptime(texto, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Data invalida (use AAAA-MM-DD): {texto}")
+
+def _imprimir(linhas, colunas):
+    if not linhas:
+        print("[INFO] Nenhum resultado")
+        return
+    print(" | ".join(colunas))
+    print("-" * 80)
+    for linha in linhas:
+        print(" | ".join(str(linha[coluna]) for coluna in colunas))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Histórico diário dos produtos do ERGON (SQLite)")
+    parser.add_argument("--banco", default=ARQUIVO_HISTORICO, help="Arquivo do histórico")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    importar = comandos.add_parser("importar", help="Importa os PDFs DDMMYYYY.PDF de uma pasta")
+    importar.add_argument("pasta", help="Pasta com os PDFs do ERGON")
+    importar.add_argument("--de", type=_data_argumento, help="Data inicial (AAAA-MM-DD)")
+    importar.add_argument("--ate", type=_data_argumento, help="Data final (AAAA-MM-DD)")
+    importar.add_argument("--motor", default="texto", choices=("texto", "colunas"), help="Motor de extração")
+    importar.add_argument("--sem-cache", action="store_true", help="Não usa o cache de extração")
+
+    precos = comandos.add_parser("precos", help="Histórico de preço e estoque de um produto")
+    precos.add_argument("codigo", help="Código do produto")
+    precos.add_argument("--de", type=_data_argumento, help="Data inicial (AAAA-MM-DD)")
+    precos.add_argument("--ate", type=_data_argumento, help="Data final (AAAA-MM-DD)")
+
+    variacoes = comandos.add_parser("variacoes", help="Mudanças de preço/estoque em relação ao dia anterior")
+    variacoes.add_argument("data", type=_data_argumento, help="Dia (AAAA-MM-DD)")
+    variacoes.add_argument("--anterior", type=_data_argumento, help="Dia de comparação (padrão: o anterior)")
+    variacoes.add_argument("--marca", help="Apenas esta marca")
+
+    limite = comandos.add_parser("limite", help="Produtos que passaram do estoque mínimo neste dia")
+    limite.add_argument("data", type=_data_argumento, help="Dia (AAAA-MM-DD)")
+    limite.add_argument("--estoque-minimo", type=int, default=5)
+    limite.add_argument("--anterior", type=_data_argumento, help="Dia de comparação (padrão: o anterior)")
+    limite.add_argument("--marca", help="Apenas esta marca")
+    args = parser.parse_args()
+
+    if args.comando == "importar":
+        from cache import CacheExtracao
+
+        cache = None if args.sem_cache else CacheExtracao()
+        sys.exit(0 if importar_pdfs(args.pasta, args.banco, args.de, args.ate, args.motor, cache) else 1)
+
+    with HistoricoProdutos(args.banco) as historico:
+        if args.comando == "precos":
+            _imprimir(historico.historico_precos(args.codigo, args.de, args.ate),
+                      ('data', 'preco', 'estoque', 'descricao'))
+        elif args.comando == "variacoes":
+            _imprimir(historico.variacoes(args.data, args.anterior, args.marca),
+                      ('codigo', 'descricao', 'preco_anterior', 'preco', 'estoque_anterior', 'estoque'))
+        else:
+            _imprimir(historico.cruzaram_limite(args.data, args.estoque_minimo, args.anterior, args.marca),
+                      ('codigo', 'descricao', 'estoque_anterior', 'estoque', 'preco'))
@@ -0,0 +1,144 @@
+"""
+Módulo Leitores - Backends de leitura do PDF do ERGON
+pdfminer: via pdfplumber (padrão); fornece texto e palavras com posição
+pdfium: via pypdfium2 (dependência do pdfplumber); extração de texto nativa, bem mais rápida
+"""
+import hashlib
+
+import pdfplumber
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+BACKENDS = ('pdfminer', 'pdfium')
+
+def abrir_leitor(backend, pdf_path, paginas=None):
+    """
+    Abre o PDF com o backend escolhido
+
+    Args:
+        backend (str): 'pdfminer' ou 'pdfium'
+        pdf_path (str): Caminho do PDF
+        paginas (list): Números das páginas a ler, começando em 1 (padrão: todas)
+
+    Returns:
+        Leitor (LeitorPdfminer ou LeitorPdfium), usado como context manager
+    """
+    if backend == 'pdfminer':
+        return LeitorPdfminer(pdf_path, paginas)
+    if backend == 'pdfium':
+        return LeitorPdfium(pdf_path, paginas)
+    raise ValueError(f"Backend de PDF invalido: {backend} (use {', '.join(BACKENDS)})")
+
+def impressoes_paginas(pdf_path, ignorar=None):
+    """
+    Impressão digital de cada página: hash do fluxo de conteúdo (descomprimido)
+
+    Só a estrutura do PDF é lida (sem análise de layout), então é muito mais
+    rápido que extrair o texto. Páginas com a mesma impressão produzem os
+    mesmos produtos.
+
+    Args:
+        pdf_path (str): Caminho do PDF
+        ignorar (re.Pattern): Trechos (bytes) do fluxo removidos antes do
+            hash, ex: a hora de emissão repetida em todas as páginas
+
+    Returns:
+        list: Um hash (hex) por página, na ordem das páginas
+    """
+    impressoes = []
+    with open(pdf_path, 'rb') as f:
+        documento = PDFDocument(PDFParser(f))
+        for pagina in PDFPage.create_pages(documento):
+            sha = hashlib.sha256()
+            for fluxo in pagina.contents:
+                fluxo = resolve1(fluxo)
+                if fluxo is not None:
+                    dados = fluxo.get_data()
+                    sha.update(ignorar.sub(b'', dados) if ignorar is not None else dados)
+            impressoes.append(sha.hexdigest())
+    return impressoes
+
+class LeitorPdfminer:
+    """Leitor baseado no pdfplumber/pdfminer (Python puro)"""
+
+    suporta_palavras = True
+
+    def __init__(self, pdf_path, paginas=None):
+        self._pdf = pdfplumber.open(pdf_path, pages=paginas)
+
+    def __len__(self):
+        return len(self._pdf.pages)
+
+    def __iter__(self):
+        """Percorre as páginas liberando o cache de layout de cada uma ao avançar"""
+        for pagina in self._pdf.pages:
+            yield _PaginaPdfminer(pagina)
+            pagina.close()
+
+    def close(self):
+        self._pdf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class _PaginaPdfminer:
+    def __init__(self, pagina):
+        self._pagina = pagina
+        self.numero = pagina.page_number
+
+    def texto(self):
+        return self._pagina.extract_text()
+
+    def palavras(self):
+        return self._pagina.extract_words()
+
+class LeitorPdfium:
+    """Leitor baseado no pypdfium2 (PDFium nativo); apenas texto"""
+
+    suporta_palavras = False
+
+    def __init__(self, pdf_path, paginas=None):
+        import pypdfium2
+
+        self._pdf = pypdfium2.PdfDocument(pdf_path)
+        if paginas is None:
+            self._indices = range(len(self._pdf))
+        else:
+            self._indices = [numero - 1 for numero in paginas]
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __iter__(self):
+        for indice in self._indices:
+            pagina = self._pdf[indice]
+            pagina_texto = pagina.get_textpage()
+            yield _PaginaPdfium(indice + 1, pagina_texto)
+            pagina_texto.close()
+            pagina.close()
+
+    def close(self):
+        self._pdf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class _PaginaPdfium:
+    def __init__(self, numero, pagina_texto):
+        self._pagina_texto = pagina_texto
+        self.numero = numero
+
+    def texto(self):
+        # O PDFium separa as linhas com \r\n
+        return self._pagina_texto.get_text_range().replace('\r\n', '\n')
+
+    def palavras(self):
+        raise NotImplementedError("O backend pdfium nao fornece a posicao das palavras")
@@ -0,0 +1,373 @@
+"""
+Módulo Lote - Processamento de vários dias de uma vez
+Roda extração → geração do DOCX → PDF para cada DDMMYYYY.PDF de uma pasta
+(ou de um intervalo de datas), em paralelo, gravando cada dia em
+output/AAAA-MM-DD/ para que as execuções não sobrescrevam umas às outras.
+Cada dia também recebe alteracoes.json/.txt com o que mudou em relação ao
+PDF do dia anterior.
+
+Uso:
+    python modules/lote.py exemplos/
+    python modules/lote.py . --de 2025-11-01 --ate 2025-11-30
+"""
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from cache import CacheExtracao
+from delta import comparar, salvar_delta
+from extrator import ExtratorPDF
+from gerador import GeradorOferta
+from metricas import Metricas, anexar_registro, medir
+from modelo import CacheModelos
+from perfil import Perfilador, perfil_ativo
+from renderizador import RenderizadorPDF
+
+_NOME_PDF_ERGON = re.compile(r'^(\d{2})(\d{2})(\d{4})\.pdf$', re.IGNORECASE)
+
+# Caches do processo filho, reaproveitados entre os arquivos que ele processa
+_CACHE = None
+_MODELOS = None
+
+def data_do_arquivo(pdf_path):
+    """
+    Data do relatório a partir do nome DDMMYYYY.PDF
+
+    Returns:
+        datetime, ou None se o nome não seguir o padrão
+    """
+    match = _NOME_PDF_ERGON.match(Path(pdf_path).name)
+    if not match:
+        return None
+    dia, mes, ano = match.groups()
+    try:
+        return datetime(int(ano), int(mes), int(dia))
+    except ValueError:
+        return None
+
+def listar_pdfs(pasta, data_inicial=None, data_final=None):
+    """
+    Lista os PDFs do ERGON de uma pasta, em ordem de data
+
+    Args:
+        pasta (str): Pasta com os arquivos DDMMYYYY.PDF
+        data_inicial (datetime): Ignora dias anteriores (opcional)
+        data_final (datetime): Ignora dias posteriores (opcional)
+
+    Returns:
+        list: Tuplas (data, caminho do PDF)
+    """
+    encontrados = []
+    for caminho in Path(pasta).iterdir():
+        data = data_do_arquivo(caminho)
+        if data is None:
+            continue
+        if data_inicial and data < data_inicial:
+            continue
+        if data_final and data > data_final:
+            continue
+        encontrados.append((data, str(caminho)))
+
+    if data_inicial and data_final:
+        dias = {data for data, _ in encontrados}
+        dia = data_inicial
+        while dia <= data_final:
+            if dia not in dias:
+                print(f"[INFO] Sem PDF do ERGON para {dia.strftime('%d/%m/%Y')}")
+            dia += timedelta(days=1)
+
+    return sorted(encontrados)
+
+def pdf_anterior(pasta, data):
+    """
+    Returns:
+        str: PDF do ERGON do último dia antes de 'data' na pasta, ou None
+    """
+    anteriores = [caminho for dia, caminho in listar_pdfs(pasta) if dia < data]
+    return anteriores[-1] if anteriores else None
+
+def gravar_alteracoes(pdf_anterior, produtos, pasta, estoque_minimo=5, cache=None, metricas=None, anteriores=None):
+    """
+    Compara a oferta do dia com a do PDF do dia anterior e grava
+    alteracoes.json e alteracoes.txt na pasta do dia
+
+    Args:
+        pdf_anterior (str): PDF do ERGON do dia anterior
+        produtos (list): Produtos filtrados do dia
+        pasta (str): Pasta do dia (a mesma do produtos_filtrados.txt)
+        estoque_minimo (int): Mesmo filtro usado nos produtos do dia
+        cache (CacheExtracao): Cache da extração (opcional)
+        metricas (Metricas): Recebe o tempo da etapa 'alteracoes' (opcional)
+        anteriores (list): Produtos filtrados do dia anterior, se já foram
+            extraídos (senão pdf_anterior é lido)
+
+    Returns:
+        dict: Resumo das alterações, ou None se o dia anterior não tiver produtos
+    """
+    with medir(metricas, 'alteracoes'):
+        if anteriores is None:
+            anteriores = ExtratorPDF(pdf_anterior, cache=cache, backend='auto').extrair_produtos(estoque_minimo)
+        if not anteriores:
+            return None
+        delta = comparar(anteriores, produtos)
+        salvar_delta(delta, pasta)
+    return delta['resumo']
+
+def processar_lote(pasta, data_inicial=None, data_final=None, saida="output", template_path="OFERTA-DO-DIA.docx",
+                   estoque_minimo=5, pdf_direto=None, jobs=None, perfil=False, historico=None, docx=False,
+                   cache_dir="output/.cache"):
+    """
+    Processa todos os dias encontrados
+
+    Args:
+        pasta (str): Pasta com os PDFs do ERGON
+        data_inicial, data_final (datetime): Intervalo de datas (opcional)
+        saida (str): Pasta raiz; cada dia é gravado em saida/AAAA-MM-DD/
+        template_path (str): Template DOCX
+        estoque_minimo (int): Estoque mínimo para entrar na oferta
+        pdf_direto (bool): Gera o PDF com o RenderizadorPDF em vez do Word
+            (padrão: sim, exceto no Windows/macOS)
+        jobs (int): Número de processos (padrão: os.cpu_count())
+        perfil (bool): Grava cProfile/tracemalloc de cada etapa em
+            saida/AAAA-MM-DD/perfil/ (também ativado por TABELADODIA_PERFIL)
+        historico (str): Arquivo SQLite do histórico; a extração completa de
+            cada dia processado é gravada nele (opcional)
+        docx (bool): Grava também o DOCX com o PDF direto (pelo Word o DOCX
+            é sempre gerado)
+        cache_dir (str): Pasta do cache de extração/template (None = sem cache)
+
+    Returns:
+        list: Um dicionário por dia com 'data', 'pdf_ergon', 'produtos',
+        'docx' (None se não foi gerado), 'pdf', 'erro' e 'metricas', em ordem de data. As métricas de
+        cada dia também são acrescentadas em saida/metricas.jsonl
+    """
+    if pdf_direto is None:
+        pdf_direto = sys.platform not in ('win32', 'darwin')
+    perfil = perfil_ativo(perfil)
+
+    arquivos = listar_pdfs(pasta, data_inicial, data_final)
+    if not arquivos:
+        print(f"[ERRO] Nenhum PDF do ERGON (DDMMYYYY.PDF) encontrado em: {pasta}")
+        return []
+
+    jobs = min(jobs or os.cpu_count() or 1, len(arquivos))
+    print(f"Processando {len(arquivos)} dias com {jobs} processos...")
+
+    # Template compilado uma única vez, antes do pool: os processos filhos
+    # herdam (ou leem do disco) o esqueleto em vez de compilá-lo ao mesmo tempo
+    cache, modelos = _caches(cache_dir)
+    if modelos is not None:
+        modelos.aquecer(template_path)
+
+    resultados = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futuros = [
+            executor.submit(_processar_dia, pdf_path, data, saida, template_path, estoque_minimo, pdf_direto, perfil,
+                            docx, cache_dir, bool(historico))
+            for data, pdf_path in arquivos
+        ]
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            resultados.append(resultado)
+            if resultado['erro']:
+                print(f"[ERRO] {resultado['data']}: {resultado['erro']}")
+            else:
+                print(f"[OK] {resultado['data']}: {resultado['produtos']} produtos")
+
+    resultados.sort(key=lambda resultado: resultado['data'])
+
+    # Alterações em relação ao dia anterior, com os produtos devolvidos pelos
+    # processos filhos; só o PDF do dia anterior ao primeiro do lote é lido aqui
+    ofertas = {resultado['pdf_ergon']: resultado.pop('oferta') for resultado in resultados}
+    for resultado in resultados:
+        anterior = pdf_anterior(pasta, data_do_arquivo(resultado['pdf_ergon']))
+        if resultado['produtos'] and anterior:
+            resultado['alteracoes'] = gravar_alteracoes(anterior, ofertas[resultado['pdf_ergon']],
+                                                        str(Path(saida) / resultado['data']), estoque_minimo, cache,
+                                                        anteriores=ofertas.get(anterior))
+
+    if not pdf_direto:
+        # Conversão pelo Word no processo principal, com uma única sessão para todos os dias
+        from conversor import ConversorPDF
+
+        gerados = [resultado for resultado in resultados if resultado['docx']]
+        # Com perfil, a conversão (no processo principal) é perfilada em saida/perfil/
+        conversao = Metricas(perfilador=Perfilador(Path(saida) / "perfil")) if perfil else None
+        convertidos = ConversorPDF.converter_lote([resultado['docx'] for resultado in gerados], metricas=conversao)
+        for resultado, conversao in zip(gerados, convertidos):
+            resultado['pdf'] = conversao['pdf']
+            if not conversao['sucesso']:
+                resultado['erro'] = conversao['erro']
+            else:
+                # A CPU da conversão é gasta pelo Word, fora deste processo
+                resultado['metricas']['etapas']['conversao'] = {
+                    'parede_s': conversao['segundos'], 'cpu_s': 0.0, 'chamadas': 1,
+                }
+
+    for resultado in resultados:
+        anexar_registro(resultado['metricas'], str(Path(saida) / "metricas.jsonl"))
+
+    tabelas = [resultado.pop('tabela') for resultado in resultados]
+    if historico:
+        _arquivar(resultados, tabelas, historico)
+
+    sucesso = sum(1 for resultado in resultados if resultado['pdf'])
+    print(f"\n[OK] {sucesso}/{len(resultados)} dias com PDF gerado em: {saida}")
+    return resultados
+
+def processar_dia(pdf_path, data, saida="output", template_path="OFERTA-DO-DIA.docx", estoque_minimo=5,
+                  pdf_direto=True, cache=None, modelos=None, metricas=None, anterior=None, docx=False, tabela=False):
+    """
+    Pipeline completo de um dia: extração → DOCX → PDF em saida/AAAA-MM-DD/
+
+    Args:
+        pdf_path (str): PDF do ERGON
+        data (datetime): Data do relatório (vira a data de validade)
+        pdf_direto (bool): Gera o PDF com o RenderizadorPDF, sem o DOCX (senão
+            só o DOCX é gerado)
+        cache (CacheExtracao): Cache da extração (opcional)
+        modelos (CacheModelos): Cache de templates compilados (opcional)
+        metricas (Metricas): Recebe os tempos e contadores de cada etapa (opcional)
+        anterior (str): PDF do ERGON do dia anterior; grava as alterações em
+            relação a ele (opcional)
+        docx (bool): Grava também o DOCX quando pdf_direto
+        tabela (bool): Devolve também a extração completa (sem filtro de
+            estoque) em 'tabela', para o histórico
+
+    Returns:
+        dict: 'data', 'pdf_ergon', 'produtos', 'docx', 'pdf', 'erro',
+        'alteracoes' (resumo das alterações, ou None), 'oferta' (produtos
+        filtrados do dia) e 'tabela' (TabelaProdutos, ou None)
+    """
+    pasta = Path(saida) / data.strftime("%Y-%m-%d")
+    resultado = {
+        'data': data.strftime("%Y-%m-%d"),
+        'pdf_ergon': pdf_path,
+        'produtos': 0,
+        'docx': None,
+        'pdf': None,
+        'erro': None,
+        'alteracoes': None,
+        'oferta': [],
+        'tabela': None,
+    }
+
+    try:
+        extrator = ExtratorPDF(pdf_path, cache=cache, backend='auto', metricas=metricas)
+        if tabela:
+            # Uma única extração completa: a oferta é filtrada da tabela
+            resultado['tabela'] = extrator.extrair_tabela()
+            produtos = resultado['tabela'].filtrar(estoque_minimo=estoque_minimo).para_lista()
+            if metricas is not None:
+                metricas.contar('produtos_emitidos', len(produtos))
+        else:
+            produtos = extrator.extrair_produtos(estoque_minimo=estoque_minimo)
+        resultado['oferta'] = produtos
+        resultado['produtos'] = len(produtos)
+        if not produtos:
+            resultado['erro'] = "Nenhum produto encontrado"
+            return resultado
+
+        extrator.salvar_resumo(str(pasta / "produtos_filtrados.txt"), produtos)
+        if anterior:
+            resultado['alteracoes'] = gravar_alteracoes(anterior, produtos, str(pasta), estoque_minimo, cache,
+                                                        metricas)
+
+        # O PDF direto não depende do DOCX: ele só é gerado se pedido (ou para o Word)
+        if docx or not pdf_direto:
+            gerador = GeradorOferta(produtos, modelos=modelos, metricas=metricas)
+            resultado['docx'] = gerador.gerar_docx(template_path, str(pasta / "OFERTA-DO-DIA.docx"),
+                                                   data_validade=data)
+            if not resultado['docx']:
+                resultado['erro'] = "Falha ao gerar DOCX"
+                return resultado
+
+        if pdf_direto:
+            with medir(metricas, 'renderizar_pdf'):
+                resultado['pdf'] = RenderizadorPDF(produtos).gerar_pdf(template_path, str(pasta / "OFERTA-DO-DIA.pdf"),
+                                                                       data=data)
+            if not resultado['pdf']:
+                resultado['erro'] = "Falha ao gerar PDF"
+    except Exception as e:
+        resultado['erro'] = str(e)
+
+    return resultado
+
+def _caches(cache_dir):
+    """
+    Caches de extração e de templates do processo, criados na primeira chamada
+
+    Args:
+        cache_dir (str): Pasta do cache (None = sem cache)
+
+    Returns:
+        tuple: (CacheExtracao, CacheModelos), ou (None, None) sem cache
+    """
+    global _CACHE, _MODELOS
+    if not cache_dir:
+        return None, None
+    if _CACHE is None or _CACHE.diretorio != Path(cache_dir):
+        _CACHE = CacheExtracao(cache_dir)
+        _MODELOS = CacheModelos(cache_dir)
+    return _CACHE, _MODELOS
+
+def _processar_dia(pdf_path, data, saida, template_path, estoque_minimo, pdf_direto, perfil=False, docx=False,
+                   cache_dir="output/.cache", tabela=False):
+    """processar_dia no processo filho, com os caches do processo"""
+    cache, modelos = _caches(cache_dir)
+
+    perfilador = Perfilador(Path(saida) / data.strftime("%Y-%m-%d") / "perfil") if perfil else None
+    metricas = Metricas(perfilador, pdf=pdf_path, data=data.strftime("%Y-%m-%d"), origem='lote',
+                        pdf_direto=pdf_direto)
+    resultado = processar_dia(pdf_path, data, saida, template_path, estoque_minimo, pdf_direto,
+                              cache=cache, modelos=modelos, metricas=metricas, docx=docx, tabela=tabela)
+    resultado['metricas'] = metricas.para_dict()
+    return resultado
+
+def _arquivar(resultados, tabelas, caminho):
+    """Grava no histórico a extração completa (devolvida pelos processos filhos) dos dias processados"""
+    from historico import HistoricoProdutos
+
+    dias = [(resultado['data'], tabela, resultado['pdf_ergon'])
+            for resultado, tabela in zip(resultados, tabelas) if resultado['produtos'] and tabela is not None]
+    try:
+        with HistoricoProdutos(caminho) as historico:
+            gravadas = historico.importar(dias)
+        print(f"[OK] {len(dias)} dias ({sum(gravadas)} linhas) gravados no historico: {caminho}")
+    except Exception as e:
+        print(f"[ERRO] Erro ao gravar historico: {e}")
+
+def _data_argumento(texto):
+    try:
+        return datetime.strptime(texto, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Data invalida (use AAAA-MM-DD): {texto}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera a OFERTA DO DIA para vários PDFs do ERGON")
+    parser.add_argument("pasta", nargs="?", default=".", help="Pasta com os arquivos DDMMYYYY.PDF")
+    parser.add_argument("--de", type=_data_argumento, help="Data inicial (AAAA-MM-DD)")
+    parser.add_argument("--ate", type=_data_argumento, help="Data final (AAAA-MM-DD)")
+    parser.add_argument("--saida", default="output", help="Pasta raiz dos resultados")
+    parser.add_argument("--template", default="OFERTA-DO-DIA.docx", help="Template DOCX")
+    parser.add_argument("--estoque-minimo", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=None, help="Número de processos")
+    parser.add_argument("--word", action="store_true", help="Converte o PDF pelo Word (docx2pdf)")
+    parser.add_argument("--docx", action="store_true", help="Grava também o DOCX com o PDF direto")
+    parser.add_argument("--profile", action="store_true",
+                        help="Grava cProfile e pico de memória de cada etapa em saida/AAAA-MM-DD/perfil/")
+    parser.add_argument("--historico", nargs="?", const="output/historico.sqlite3", default=None,
+                        help="Grava a extração completa de cada dia no histórico SQLite")
+    parser.add_argument("--sem-cache", action="store_true", help="Não usa o cache de extração/template")
+    parser.add_argument("--cache-dir", default="output/.cache", help="Pasta do cache")
+    args = parser.parse_args()
+
+    resultados = processar_lote(args.pasta, args.de, args.ate, saida=args.saida, template_path=args.template,
+                                estoque_minimo=args.estoque_minimo, pdf_direto=not args.word,
+                                jobs=args.jobs, perfil=args.profile, historico=args.historico, docx=args.docx,
+                                cache_dir=None if args.sem_cache else args.cache_dir)
+    sys.exit(0 if resultados and all(resultado['pdf'] for resultado in resultados) else 1)
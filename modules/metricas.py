@@ -0,0 +1,150 @@
+"""
+Módulo Métricas - Tempos e contadores de cada execução do pipeline
+Mede tempo de parede e de CPU por etapa e por página, conta as linhas lidas,
+reconhecidas e ignoradas pelo extrator e grava um registro JSON por execução
+em output/metricas.jsonl, para ver qual etapa piorou quando o layout do
+ERGON ou o template mudam.
+"""
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+from perfil import perfilar
+
+ARQUIVO_METRICAS = "output/metricas.jsonl"
+
+class Metricas:
+    """Acumula os tempos e contadores de uma execução"""
+
+    def __init__(self, perfilador=None, **contexto):
+        """
+        Args:
+            perfilador (Perfilador): Também perfila cada etapa (cProfile e
+                tracemalloc) quando informado
+            **contexto: Informações da execução gravadas junto com as
+                métricas (ex: pdf, motor, backend)
+        """
+        self.inicio = datetime.now()
+        self.perfilador = perfilador
+        self.contexto = contexto
+        self.etapas = {}
+        self.paginas = []
+        self.contadores = {}
+        self.valores = {}
+
+    @contextmanager
+    def etapa(self, nome):
+        """Mede o tempo de parede e de CPU do bloco e soma na etapa 'nome'"""
+        parede = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            with perfilar(self.perfilador, nome):
+                yield
+        finally:
+            self.registrar_etapa(nome, time.perf_counter() - parede, time.process_time() - cpu)
+
+    def registrar_etapa(self, nome, parede_s, cpu_s, chamadas=1):
+        """Soma tempos já medidos na etapa 'nome'"""
+        etapa = self.etapas.setdefault(nome, {'parede_s': 0.0, 'cpu_s': 0.0, 'chamadas': 0})
+        etapa['parede_s'] += parede_s
+        etapa['cpu_s'] += cpu_s
+        etapa['chamadas'] += chamadas
+
+    def pagina(self, numero, parede_s, cpu_s, produtos):
+        """Registra o tempo e o número de produtos de uma página do PDF"""
+        self.paginas.append({
+            'pagina': numero,
+            'parede_s': parede_s,
+            'cpu_s': cpu_s,
+            'produtos': produtos,
+        })
+
+    def contar(self, nome, quantidade=1):
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def definir(self, nome, valor):
+        self.valores[nome] = valor
+
+    def mesclar(self, dados):
+        """
+        Soma as métricas de outro registro (ex: de um processo filho da
+        extração em paralelo)
+
+        Args:
+            dados (dict): Resultado de Metricas.para_dict()
+        """
+        for nome, etapa in dados['etapas'].items():
+            self.registrar_etapa(nome, etapa['parede_s'], etapa['cpu_s'], etapa['chamadas'])
+        self.paginas.extend(dados['paginas'])
+        for nome, quantidade in dados['contadores'].items():
+            self.contar(nome, quantidade)
+        self.valores.update(dados['valores'])
+
+    def para_dict(self):
+        """
+        Returns:
+            dict: Registro da execução, pronto para json.dumps
+        """
+        contadores = self.contadores
+        candidatas = contadores.get('linhas_lidas', 0) - contadores.get('linhas_ignoradas', 0)
+        derivados = {}
+        if candidatas > 0:
+            # Linhas do corpo do relatório que nenhum padrão de produto reconheceu
+            derivados['taxa_falha_regex'] = 1 - contadores.get('linhas_reconhecidas', 0) / candidatas
+
+        registro = {
+            'inicio': self.inicio.isoformat(timespec='seconds'),
+            'contexto': self.contexto,
+            'etapas': self.etapas,
+            'paginas': sorted(self.paginas, key=lambda pagina: pagina['pagina']),
+            'contadores': contadores,
+            'valores': self.valores,
+            'derivados': derivados,
+        }
+        if self.perfilador is not None:
+            registro['memoria_pico_bytes'] = dict(self.perfilador.picos)
+            registro['perfil'] = str(self.perfilador.pasta)
+        return registro
+
+    def salvar(self, caminho=ARQUIVO_METRICAS):
+        """
+        Acrescenta o registro como uma linha JSON no log de métricas
+
+        Args:
+            caminho (str): Arquivo JSONL (padrão: output/metricas.jsonl)
+
+        Returns:
+            str: Caminho do arquivo, ou None em caso de erro
+        """
+        return anexar_registro(self.para_dict(), caminho)
+
+def anexar_registro(registro, caminho=ARQUIVO_METRICAS):
+    """
+    Acrescenta um registro (dict de Metricas.para_dict) no log de métricas
+
+    Returns:
+        str: Caminho do arquivo, ou None em caso de erro
+    """
+    try:
+        Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+        linha = json.dumps(registro, ensure_ascii=False) + "\n"
+        # Uma única escrita em modo append: processos diferentes gravando no
+        # mesmo log não intercalam as linhas
+        fd = os.open(caminho, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, linha.encode('utf-8'))
+        finally:
+            os.close(fd)
+        return caminho
+    except OSError as e:
+        print(f"[ERRO] Erro ao gravar metricas: {e}")
+        return None
+
+def medir(metricas, nome):
+    """metricas.etapa(nome), ou um contexto vazio quando não há métricas"""
+    if metricas is None:
+        return nullcontext()
+    return metricas.etapa(nome)
@@ -0,0 +1,369 @@
+"""
+Módulo Modelo - Template OFERTA-DO-DIA.docx pré-compilado
+O template é analisado uma única vez com o python-docx e vira um esqueleto:
+o pacote DOCX com marcadores no lugar das linhas de produtos e das datas de
+validade, mais os trechos XML da linha protótipo. Gerar um documento a partir
+do esqueleto é só juntar strings e gravar o ZIP, sem reabrir o template.
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import zipfile
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.opc.part import XmlPart
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import qn
+from lxml import etree
+
+# Muda quando o formato do esqueleto muda (invalida os esqueletos em disco)
+VERSAO_MODELO = "1"
+
+# As 2 primeiras linhas da tabela são cabeçalho (baseado na análise: 'HIGIENE...' e 'NOME...')
+LINHA_INICIO = 2
+
+# Datas DD/MM/YY ou DD/MM/YYYY, substituídas nas partes que mencionam "VALIDO"
+_PADRAO_DATA = re.compile(r'(\d{2}/\d{2}/\d{2,4})')
+_PADRAO_VALIDO = re.compile(r'V[AÁ]LIDO', re.IGNORECASE)
+
+# Atributos de identificação de parágrafo do Word, removidos das linhas clonadas
+_ATRIBUTOS_ID_WORD = (qn('w14:paraId'), qn('w14:textId'))
+
+_MARCADORES_CELULAS = ("@@DESCRICAO@@", "@@UNIDADE@@", "@@PRECO@@")
+_MARCADOR_LINHAS = "@@LINHAS@@"
+_MARCADOR_DATA_CURTA = "@@DATA_CURTA@@"
+_MARCADOR_DATA_LONGA = "@@DATA_LONGA@@"
+
+# Membro extra do esqueleto em disco com os dados da análise
+_MEMBRO_METADADOS = "tabeladodia/modelo.json"
+
+def partes_prototipo(linha_modelo):
+    """
+    Prepara a linha protótipo e a divide em trechos de XML em volta dos
+    valores (Descrição, Unidade, Preço)
+
+    Cada célula fica com um único parágrafo e um único run, mantendo a
+    formatação do primeiro run do template. Unidade e Preço são centralizados.
+
+    Args:
+        linha_modelo: Elemento <w:tr> usado como modelo (não é alterado)
+
+    Returns:
+        tuple: (declaracoes_xmlns, antes_desc, antes_unid, antes_preco, depois),
+        ou None se a linha tiver menos de 3 células
+    """
+    prototipo = deepcopy(linha_modelo)
+    celulas = prototipo.tc_lst
+    if len(celulas) < 3:
+        return None
+
+    # Os ids de parágrafo do Word (w14:paraId/textId) precisam ser únicos
+    for elemento in prototipo.iter():
+        for atributo in _ATRIBUTOS_ID_WORD:
+            elemento.attrib.pop(atributo, None)
+
+    for indice, tc in enumerate(celulas):
+        paragrafos = tc.p_lst
+        for p in paragrafos[1:]:
+            tc.remove(p)
+        p = paragrafos[0]
+
+        runs = p.r_lst
+        rpr = deepcopy(runs[0].rPr) if runs and runs[0].rPr is not None else None
+        for filho in list(p):
+            if filho is not p.pPr:
+                p.remove(filho)
+
+        if indice in (1, 2):
+            p.get_or_add_pPr().jc_val = WD_ALIGN_PARAGRAPH.CENTER
+
+        r = p.add_r()
+        if rpr is not None:
+            r.insert(0, rpr)
+        r.add_t(_MARCADORES_CELULAS[indice] if indice < 3 else "")
+
+    # Serializa dentro de um elemento com os mesmos namespaces, para que as
+    # declarações xmlns fiquem só no elemento externo e não em cada linha
+    envelope = OxmlElement('w:tbl', nsdecls=prototipo.nsmap)
+    envelope.append(prototipo)
+    xml = etree.tostring(envelope, encoding='unicode')
+    xml = xml[xml.index('>') + 1:xml.rindex('<')]
+
+    declaracoes = ' '.join(f'xmlns:{prefixo}="{uri}"' for prefixo, uri in prototipo.nsmap.items())
+    antes_desc, resto = xml.split(_MARCADORES_CELULAS[0])
+    antes_unid, resto = resto.split(_MARCADORES_CELULAS[1])
+    antes_preco, depois = resto.split(_MARCADORES_CELULAS[2])
+    return declaracoes, antes_desc, antes_unid, antes_preco, depois
+
+def montar_linhas(partes, produtos):
+    """
+    Monta o XML das linhas <w:tr> dos produtos a partir das partes do protótipo
+
+    Args:
+        partes (tuple): Retorno de partes_prototipo
+        produtos (iterable): Dicionários de produtos (percorrido uma única vez,
+            então pode ser um gerador como ExtratorPDF.iter_produtos)
+
+    Returns:
+        list: XML (str) de cada linha, na ordem dos produtos
+    """
+    _, antes_desc, antes_unid, antes_preco, depois = partes
+    return [
+        antes_desc + escape(str(produto['descricao'])) +
+        antes_unid + escape(str(produto['unidade'])) +
+        antes_preco + escape(f"R$ {produto['preco']:.2f}") +
+        depois
+        for produto in produtos
+    ]
+
+def reescrever_datas_validade(doc, nova_data):
+    """
+    Substitui, direto no XML, as datas das partes do documento que mencionam VALIDO
+    (o python-docx as vezes não encontra textos em headers complexos)
+
+    Args:
+        doc: Document do python-docx (alterado em memória)
+        nova_data (callable): Recebe (data_antiga, nome_da_parte) e devolve o
+            texto que a substitui, ou None para manter a data
+
+    Returns:
+        int: Número de partes modificadas
+    """
+    partes_modificadas = 0
+
+    for parte in doc.part.package.iter_parts():
+        if not parte.partname.endswith('.xml'):
+            continue
+
+        content = parte.blob.decode('utf-8')
+        if not _PADRAO_VALIDO.search(content):
+            continue
+
+        arquivo = os.path.basename(parte.partname)
+        novo_content = content
+        for data_antiga in _PADRAO_DATA.findall(content):
+            substituta = nova_data(data_antiga, arquivo)
+            if substituta is not None:
+                novo_content = novo_content.replace(data_antiga, substituta)
+
+        if novo_content != content:
+            novo_blob = novo_content.encode('utf-8')
+            if isinstance(parte, XmlPart):
+                parte._element = parse_xml(novo_blob)
+            else:
+                parte._blob = novo_blob
+            partes_modificadas += 1
+
+    return partes_modificadas
+
+class ModeloCompilado:
+    """
+    Esqueleto de um template OFERTA-DO-DIA.docx
+
+    Guarda os membros do pacote já prontos: document.xml dividido no ponto da
+    tabela onde entram as linhas de produtos, as partes com a data de validade
+    trocada por marcadores e os trechos XML da linha protótipo.
+    """
+
+    def __init__(self, membros, partes, partes_data):
+        """
+        Args:
+            membros (list): (nome, tipo_de_compressao, bytes) de cada membro do pacote
+            partes (tuple): Trechos da linha protótipo (ver partes_prototipo)
+            partes_data (list): Nomes dos membros que têm marcadores de data
+        """
+        self.membros = membros
+        self.partes = partes
+        self.partes_data = partes_data
+
+    @classmethod
+    def compilar(cls, template_path):
+        """
+        Analisa o template com o python-docx e monta o esqueleto
+
+        Returns:
+            ModeloCompilado, ou None se o template não tiver uma tabela utilizável
+        """
+        doc = Document(template_path)
+        if not doc.tables:
+            return None
+
+        tbl = doc.tables[0]._tbl
+        linhas_xml = tbl.tr_lst
+        partes = partes_prototipo(linhas_xml[min(LINHA_INICIO, len(linhas_xml) - 1)])
+        if partes is None:
+            return None
+
+        # Troca as linhas de dados por um marcador, onde as linhas novas serão inseridas
+        for linha in linhas_xml[LINHA_INICIO:]:
+            tbl.remove(linha)
+        tbl.append(etree.Comment(_MARCADOR_LINHAS))
+
+        def marcador_data(data_antiga, arquivo):
+            return _MARCADOR_DATA_CURTA if len(data_antiga) == 8 else _MARCADOR_DATA_LONGA
+        reescrever_datas_validade(doc, marcador_data)
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+
+        membros = []
+        partes_data = []
+        with zipfile.ZipFile(buffer) as pacote:
+            for info in pacote.infolist():
+                dados = pacote.read(info)
+                if _MARCADOR_DATA_CURTA.encode() in dados or _MARCADOR_DATA_LONGA.encode() in dados:
+                    partes_data.append(info.filename)
+                membros.append((info.filename, info.compress_type, dados))
+
+        return cls(membros, partes, partes_data)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Lê um esqueleto gravado por salvar()"""
+        membros = []
+        with zipfile.ZipFile(caminho) as pacote:
+            metadados = json.loads(pacote.read(_MEMBRO_METADADOS))
+            for info in pacote.infolist():
+                if info.filename != _MEMBRO_METADADOS:
+                    membros.append((info.filename, info.compress_type, pacote.read(info)))
+
+        if metadados.get('versao') != VERSAO_MODELO:
+            return None
+        return cls(membros, tuple(metadados['partes']), metadados['partes_data'])
+
+    def salvar(self, caminho):
+        """Grava o esqueleto em disco (um ZIP com os membros e os metadados)"""
+        metadados = {
+            'versao': VERSAO_MODELO,
+            'partes': list(self.partes),
+            'partes_data': self.partes_data,
+        }
+
+        # Grava em arquivo temporário (nome único: vários processos podem gravar
+        # o mesmo esqueleto ao mesmo tempo) e renomeia para nunca deixar
+        # esqueleto pela metade
+        fd, temporario = tempfile.mkstemp(suffix='.tmp', dir=Path(caminho).parent)
+        try:
+            with os.fdopen(fd, 'wb') as arquivo, zipfile.ZipFile(arquivo, 'w') as pacote:
+                for nome, compressao, dados in self.membros:
+                    pacote.writestr(nome, dados, compress_type=compressao)
+                pacote.writestr(_MEMBRO_METADADOS, json.dumps(metadados, ensure_ascii=False), zipfile.ZIP_DEFLATED)
+            os.replace(temporario, caminho)
+        except BaseException:
+            Path(temporario).unlink(missing_ok=True)
+            raise
+
+    def renderizar(self, linhas_xml, output_path, data=None):
+        """
+        Grava o DOCX final com as linhas de produtos e a data de validade
+
+        Args:
+            linhas_xml (list): XML das linhas <w:tr> (ver montar_linhas)
+            output_path (str): Caminho de saída do DOCX
+            data (datetime): Data de validade (padrão: hoje)
+        """
+        data = data or datetime.now()
+        datas = {
+            _MARCADOR_DATA_CURTA.encode(): data.strftime("%d/%m/%y").encode(),
+            _MARCADOR_DATA_LONGA.encode(): data.strftime("%d/%m/%Y").encode(),
+        }
+        marcador_linhas = f"<!--{_MARCADOR_LINHAS}-->".encode()
+
+        with zipfile.ZipFile(output_path, 'w') as pacote:
+            for nome, compressao, dados in self.membros:
+                if nome == 'word/document.xml':
+                    dados = dados.replace(marcador_linhas, ''.join(linhas_xml).encode('utf-8'))
+                if nome in self.partes_data:
+                    for marcador, texto in datas.items():
+                        dados = dados.replace(marcador, texto)
+                pacote.writestr(nome, dados, compress_type=compressao)
+
+class CacheModelos:
+    """
+    Cache dos templates compilados: em memória (validado pelo mtime/tamanho do
+    template) e em disco (pelo hash do conteúdo), para que gerações repetidas,
+    no mesmo processo ou em execuções seguintes, não re-analisem o template
+    """
+
+    def __init__(self, diretorio="output/.cache"):
+        """
+        Args:
+            diretorio (str): Pasta onde os esqueletos são gravados
+        """
+        self.diretorio = Path(diretorio)
+        self._memoria = {}
+
+    def obter(self, template_path):
+        """
+        Devolve o template compilado, compilando-o se ele mudou ou nunca foi visto
+
+        Returns:
+            ModeloCompilado, ou None se o template não tiver uma tabela utilizável
+        """
+        caminho = Path(template_path).resolve()
+        info = caminho.stat()
+        assinatura = (info.st_mtime_ns, info.st_size)
+
+        em_memoria = self._memoria.get(caminho)
+        if em_memoria and em_memoria[0] == assinatura:
+            return em_memoria[1]
+
+        # O mtime mudou (ou primeiro uso): o hash do conteúdo decide se o esqueleto em disco vale
+        sha = hashlib.sha256(caminho.read_bytes()).hexdigest()
+        arquivo = self.diretorio / f"modelo-{sha}-{VERSAO_MODELO}.docx"
+
+        modelo = None
+        if arquivo.exists():
+            try:
+                modelo = ModeloCompilado.carregar(arquivo)
+            except (zipfile.BadZipFile, KeyError, ValueError):
+                modelo = None
+
+        if modelo is None:
+            modelo = ModeloCompilado.compilar(caminho)
+            if modelo is not None:
+                self.diretorio.mkdir(parents=True, exist_ok=True)
+                modelo.salvar(arquivo)
+
+        self._memoria[caminho] = (assinatura, modelo)
+        return modelo
+
+    def aquecer(self, template_path):
+        """
+        Compila e grava o esqueleto antes de abrir um pool de processos, para
+        que os processos filhos só leiam o esqueleto do disco em vez de
+        compilarem o mesmo template ao mesmo tempo
+
+        Returns:
+            ModeloCompilado, ou None se o template não existir ou não puder
+            ser compilado (a geração cai no caminho sem esqueleto)
+        """
+        if not Path(template_path).exists():
+            return None
+        try:
+            return self.obter(template_path)
+        except Exception as e:
+            print(f"[ERRO] Erro ao compilar template {template_path}: {e}")
+            return None
+
+    def invalidar(self):
+        """
+        Descarta todos os templates compilados (memória e disco)
+
+        Returns:
+            int: Número de esqueletos removidos do disco
+        """
+        self._memoria.clear()
+        removidos = 0
+        for caminho in self.diretorio.glob("modelo-*.docx"):
+            caminho.unlink(missing_ok=True)
+            removidos += 1
+        return removidos
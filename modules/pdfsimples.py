@@ -0,0 +1,280 @@
+"""
+Módulo PDF Simples - Gravador mínimo de PDF em Python puro
+Escreve páginas com texto nas fontes padrão do PDF (Helvetica e
+Helvetica-Bold, codificação WinAnsi), retângulos e imagens PNG, sem Word,
+LibreOffice ou outras bibliotecas. As larguras das fontes vêm das métricas
+que o pdfminer (dependência do pdfplumber) já traz.
+"""
+import struct
+import zlib
+
+from pdfminer.fontmetrics import FONT_METRICS
+
+# Tamanho A4 em pontos
+A4 = (595.28, 841.89)
+
+_FONTES = {False: ('F1', 'Helvetica'), True: ('F2', 'Helvetica-Bold')}
+
+def codificar(texto):
+    """Converte o texto para WinAnsi (cp1252), descartando caracteres sem representação (ex: emojis)"""
+    return texto.encode('cp1252', errors='ignore')
+
+def largura_texto(texto, tamanho, negrito=False):
+    """
+    Largura do texto em pontos
+
+    Args:
+        texto (str): Texto (caracteres fora do WinAnsi são ignorados)
+        tamanho (float): Tamanho da fonte em pontos
+        negrito (bool): Helvetica-Bold em vez de Helvetica
+    """
+    larguras = FONT_METRICS[_FONTES[negrito][1]][1]
+    texto = codificar(texto).decode('cp1252')
+    return sum(larguras.get(c, 556) for c in texto) * tamanho / 1000
+
+def _escapar(dados):
+    return dados.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+def _cor(cor):
+    return ' '.join(f"{c / 255:.3f}" for c in cor)
+
+class PaginaPDF:
+    """Página em construção; as coordenadas são em pontos, com origem no canto inferior esquerdo"""
+
+    def __init__(self, documento):
+        self._documento = documento
+        self._comandos = []
+
+    def texto(self, x, y, texto, tamanho=10, negrito=False, cor=(0, 0, 0), alinhamento='esquerda'):
+        """
+        Escreve uma linha de texto
+
+        Args:
+            x (float): Posição horizontal (início, centro ou fim, conforme o alinhamento)
+            y (float): Linha de base
+            alinhamento (str): 'esquerda', 'centro' ou 'direita'
+        """
+        if alinhamento != 'esquerda':
+            largura = largura_texto(texto, tamanho, negrito)
+            x -= largura / 2 if alinhamento == 'centro' else largura
+        fonte = _FONTES[negrito][0]
+        self._comandos.append(
+            f"BT {_cor(cor)} rg /{fonte} {tamanho:g} Tf {x:.2f} {y:.2f} Td (".encode()
+            + _escapar(codificar(texto)) + b") Tj ET"
+        )
+
+    def retangulo(self, x, y, largura, altura, preenchimento=None, borda=(0, 0, 0), espessura=0.5):
+        """Desenha um retângulo (x, y é o canto inferior esquerdo); preenchimento/borda None omitem a parte"""
+        if preenchimento is None and borda is None:
+            return
+        comando = f"{x:.2f} {y:.2f} {largura:.2f} {altura:.2f} re"
+        if preenchimento is not None:
+            comando = f"{_cor(preenchimento)} rg " + comando
+        if borda is not None:
+            comando = f"{_cor(borda)} RG {espessura:g} w " + comando
+        operador = 'B' if preenchimento is not None and borda is not None else ('f' if borda is None else 'S')
+        self._comandos.append(f"{comando} {operador}".encode())
+
+    def imagem(self, nome, x, y, largura, altura):
+        """Desenha uma imagem registrada com DocumentoPDF.adicionar_imagem"""
+        self._comandos.append(f"q {largura:.2f} 0 0 {altura:.2f} {x:.2f} {y:.2f} cm /{nome} Do Q".encode())
+
+    def conteudo(self):
+        return b'\n'.join(self._comandos)
+
+class DocumentoPDF:
+    """Documento PDF montado em memória e gravado de uma vez"""
+
+    def __init__(self, tamanho=A4):
+        self.largura, self.altura = tamanho
+        self.paginas = []
+        self._imagens = []
+
+    def nova_pagina(self):
+        """Adiciona uma página em branco e a devolve"""
+        pagina = PaginaPDF(self)
+        self.paginas.append(pagina)
+        return pagina
+
+    def adicionar_imagem(self, png):
+        """
+        Registra uma imagem PNG para ser usada nas páginas
+
+        Args:
+            png (bytes): Conteúdo do arquivo PNG
+
+        Returns:
+            tuple: (nome, largura_px, altura_px), ou None se o PNG não for suportado
+        """
+        try:
+            largura, altura, rgb = decodificar_png(png)
+        except ValueError:
+            return None
+        nome = f"Im{len(self._imagens) + 1}"
+        self._imagens.append((nome, largura, altura, rgb))
+        return nome, largura, altura
+
+    def para_bytes(self):
+        """Serializa o documento"""
+        objetos = []
+
+        def novo_objeto(conteudo):
+            objetos.append(conteudo)
+            return len(objetos)
+
+        def fluxo(dados, dicionario=b""):
+            comprimido = zlib.compress(dados)
+            return (b"<< " + dicionario + b" /Filter /FlateDecode /Length " + str(len(comprimido)).encode()
+                    + b" >>\nstream\n" + comprimido + b"\nendstream")
+
+        catalogo = novo_objeto(None)
+        raiz_paginas = novo_objeto(None)
+
+        fontes = ' '.join(
+            f"/{rotulo} {novo_objeto(f'<< /Type /Font /Subtype /Type1 /BaseFont /{nome} /Encoding /WinAnsiEncoding >>'.encode())} 0 R"
+            for rotulo, nome in _FONTES.values()
+        )
+        imagens = ' '.join(
+            f"/{nome} {novo_objeto(fluxo(rgb, f'/Type /XObject /Subtype /Image /Width {largura} /Height {altura} /ColorSpace /DeviceRGB /BitsPerComponent 8'.encode()))} 0 R"
+            for nome, largura, altura, rgb in self._imagens
+        )
+        recursos = f"<< /Font << {fontes} >> /XObject << {imagens} >> >>"
+
+        ids_paginas = []
+        for pagina in self.paginas:
+            conteudo = novo_objeto(fluxo(pagina.conteudo()))
+            ids_paginas.append(novo_objeto(
+                f"<< /Type /Page /Parent {raiz_paginas} 0 R /MediaBox [0 0 {self.largura:g} {self.altura:g}] "
+                f"/Resources {recursos} /Contents {conteudo} 0 R >>".encode()
+            ))
+
+        objetos[catalogo - 1] = f"<< /Type /Catalog /Pages {raiz_paginas} 0 R >>".encode()
+        filhos = ' '.join(f"{i} 0 R" for i in ids_paginas)
+        objetos[raiz_paginas - 1] = f"<< /Type /Pages /Kids [{filhos}] /Count {len(ids_paginas)} >>".encode()
+
+        saida = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        deslocamentos = []
+        for numero, conteudo in enumerate(objetos, 1):
+            deslocamentos.append(len(saida))
+            saida += f"{numero} 0 obj\n".encode() + conteudo + b"\nendobj\n"
+
+        inicio_xref = len(saida)
+        saida += f"xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n".encode()
+        for deslocamento in deslocamentos:
+            saida += f"{deslocamento:010d} 00000 n \n".encode()
+        saida += (f"trailer\n<< /Size {len(objetos) + 1} /Root {catalogo} 0 R >>\n"
+                  f"startxref\n{inicio_xref}\n%%EOF\n").encode()
+        return bytes(saida)
+
+    def salvar(self, caminho):
+        """Grava o documento no caminho informado"""
+        with open(caminho, 'wb') as f:
+            f.write(self.para_bytes())
+
+def decodificar_png(png):
+    """
+    Decodifica um PNG (não entrelaçado) em RGB de 8 bits, compondo a
+    transparência sobre fundo branco
+
+    Returns:
+        tuple: (largura, altura, bytes RGB)
+
+    Raises:
+        ValueError: Se o arquivo não for um PNG suportado
+    """
+    if png[:8] != b'\x89PNG\r\n\x1a\n':
+        raise ValueError("Arquivo nao e PNG")
+
+    posicao = 8
+    idat = []
+    paleta = b''
+    transparencia = b''
+    while posicao < len(png):
+        tamanho, tipo = struct.unpack('>I4s', png[posicao:posicao + 8])
+        dados = png[posicao + 8:posicao + 8 + tamanho]
+        posicao += 12 + tamanho
+        if tipo == b'IHDR':
+            largura, altura, profundidade, tipo_cor, _, _, entrelacado = struct.unpack('>IIBBBBB', dados)
+        elif tipo == b'PLTE':
+            paleta = dados
+        elif tipo == b'tRNS':
+            transparencia = dados
+        elif tipo == b'IDAT':
+            idat.append(dados)
+        elif tipo == b'IEND':
+            break
+
+    canais = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}.get(tipo_cor)
+    if canais is None or entrelacado or (profundidade != 8 and not (tipo_cor == 3 and profundidade in (1, 2, 4))):
+        raise ValueError("Formato de PNG nao suportado")
+
+    bytes_linha = (largura * canais * profundidade + 7) // 8
+    passo = max(1, canais * profundidade // 8)
+    bruto = zlib.decompress(b''.join(idat))
+    linhas = _desfiltrar(bruto, bytes_linha, altura, passo)
+
+    if tipo_cor == 3:
+        # Paleta: converte os índices em RGBA
+        cores = [tuple(paleta[i:i + 3]) + (transparencia[i // 3] if i // 3 < len(transparencia) else 255,)
+                 for i in range(0, len(paleta), 3)]
+        por_byte = 8 // profundidade
+        mascara = (1 << profundidade) - 1
+        pixels = []
+        for linha in linhas:
+            indices = [(b >> (8 - profundidade * (k + 1))) & mascara for b in linha for k in range(por_byte)]
+            pixels.extend(cores[i] for i in indices[:largura])
+    else:
+        pixels = []
+        for linha in linhas:
+            for i in range(0, len(linha), canais):
+                p = linha[i:i + canais]
+                if tipo_cor == 0:
+                    pixels.append((p[0], p[0], p[0], 255))
+                elif tipo_cor == 4:
+                    pixels.append((p[0], p[0], p[0], p[1]))
+                elif tipo_cor == 2:
+                    pixels.append((p[0], p[1], p[2], 255))
+                else:
+                    pixels.append(tuple(p))
+
+    rgb = bytearray()
+    for r, g, b, a in pixels:
+        if a == 255:
+            rgb += bytes((r, g, b))
+        else:
+            rgb += bytes((c * a + 255 * (255 - a)) // 255 for c in (r, g, b))
+    return largura, altura, bytes(rgb)
+
+def _desfiltrar(bruto, bytes_linha, altura, passo):
+    """Desfaz os filtros de linha do PNG (None, Sub, Up, Average, Paeth)"""
+    linhas = []
+    anterior = bytearray(bytes_linha)
+    posicao = 0
+    for _ in range(altura):
+        filtro = bruto[posicao]
+        linha = bytearray(bruto[posicao + 1:posicao + 1 + bytes_linha])
+        posicao += 1 + bytes_linha
+
+        if filtro == 1:
+            for i in range(passo, bytes_linha):
+                linha[i] = (linha[i] + linha[i - passo]) & 0xFF
+        elif filtro == 2:
+            for i in range(bytes_linha):
+                linha[i] = (linha[i] + anterior[i]) & 0xFF
+        elif filtro == 3:
+            for i in range(bytes_linha):
+                esquerda = linha[i - passo] if i >= passo else 0
+                linha[i] = (linha[i] + (esquerda + anterior[i]) // 2) & 0xFF
+        elif filtro == 4:
+            for i in range(bytes_linha):
+                a = linha[i - passo] if i >= passo else 0
+                b = anterior[i]
+                c = anterior[i - passo] if i >= passo else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                preditor = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+                linha[i] = (linha[i] + preditor) & 0xFF
+
+        linhas.append(linha)
+        anterior = linha
+    return linhas
@@ -0,0 +1,106 @@
+"""
+Módulo Perfil - Perfilamento (cProfile + tracemalloc) das etapas do pipeline
+Ativado com --profile nos pontos de entrada (lote, vigia, teste_completo,
+app) ou com a variável de ambiente TABELADODIA_PERFIL=1. Para cada etapa
+medida pelas Metricas (extracao, preencher_tabela, data_validade,
+conversao, ...) grava, na pasta perfil/ ao lado da saída:
+    <etapa>.pstats          estatísticas do cProfile (python -m pstats)
+    <etapa>-memoria.txt     pico de memória e as N linhas que mais alocaram
+"""
+import cProfile
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+VARIAVEL_AMBIENTE = "TABELADODIA_PERFIL"
+
+def perfil_ativo(opcao=False):
+    """
+    Args:
+        opcao (bool): Valor da opção --profile
+
+    Returns:
+        bool: True se a opção foi passada ou TABELADODIA_PERFIL está definida
+        (e não é 0)
+    """
+    return bool(opcao) or os.environ.get(VARIAVEL_AMBIENTE, '') not in ('', '0')
+
+class Perfilador:
+    """Perfila as etapas de uma execução e grava os relatórios em uma pasta"""
+
+    def __init__(self, pasta, top=25):
+        """
+        Args:
+            pasta (str): Pasta dos relatórios (criada na primeira etapa)
+            top (int): Número de linhas no relatório de memória
+        """
+        self.pasta = Path(pasta)
+        self.top = top
+        self.picos = {}
+        self._perfis = {}
+        self._trava = threading.Lock()
+        self._ativo = False
+
+    @contextmanager
+    def etapa(self, nome):
+        """
+        Perfila o bloco como a etapa 'nome'. Chamadas repetidas da mesma etapa
+        acumulam no mesmo .pstats. Etapas aninhadas (ou em outra thread ao
+        mesmo tempo) ficam dentro do perfil da etapa que já está ativa.
+        """
+        with self._trava:
+            ocupado = self._ativo
+            self._ativo = True
+        if ocupado:
+            yield
+            return
+
+        perfil = self._perfis.setdefault(nome, cProfile.Profile())
+        iniciou_tracemalloc = not tracemalloc.is_tracing()
+        if iniciou_tracemalloc:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+
+        perfil.enable()
+        try:
+            yield
+        finally:
+            perfil.disable()
+            pico = tracemalloc.get_traced_memory()[1] - base
+            retrato = tracemalloc.take_snapshot()
+            if iniciou_tracemalloc:
+                tracemalloc.stop()
+            self.picos[nome] = max(pico, self.picos.get(nome, 0))
+            self._gravar(nome, perfil, retrato)
+            with self._trava:
+                self._ativo = False
+
+    def _gravar(self, nome, perfil, retrato):
+        """Grava o .pstats e o relatório de memória da etapa"""
+        try:
+            self.pasta.mkdir(parents=True, exist_ok=True)
+            perfil.dump_stats(str(self.pasta / f"{nome}.pstats"))
+
+            estatisticas = retrato.filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )).statistics('lineno')
+            linhas = [
+                f"Etapa: {nome}",
+                f"Pico de memoria: {self.picos[nome] / 1024 / 1024:.2f} MiB",
+                f"Top {self.top} alocacoes ainda vivas ao fim da etapa (por linha):",
+                "",
+            ]
+            linhas.extend(str(estatistica) for estatistica in estatisticas[:self.top])
+            (self.pasta / f"{nome}-memoria.txt").write_text("\n".join(linhas) + "\n", encoding='utf-8')
+        except OSError as e:
+            print(f"[ERRO] Erro ao gravar perfil da etapa {nome}: {e}")
+
+def perfilar(perfilador, nome):
+    """perfilador.etapa(nome), ou um contexto vazio quando não há perfilador"""
+    if perfilador is None:
+        return nullcontext()
+    return perfilador.etapa(nome)
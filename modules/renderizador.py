@@ -0,0 +1,234 @@
+"""
+Módulo Renderizador - Gera o PDF da OFERTA DO DIA direto dos produtos
+Alternativa ao caminho DOCX → PDF (docx2pdf/Word): desenha o cabeçalho do
+template (logo, validade e contatos), a tabela de três colunas (Descrição /
+Unidade / Preço) e cuida da paginação, sem processo externo.
+"""
+import os
+import re
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+from lxml import etree
+
+from pdfsimples import DocumentoPDF, codificar, largura_texto
+
+_NS = {
+    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'mc': 'http://schemas.openxmlformats.org/markup-compatibility/2006',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+}
+
+_PADRAO_DATA = re.compile(r'\d{2}/\d{2}/\d{2,4}')
+
+# Geometria da tabela do template (OFERTA-DO-DIA.docx), em pontos
+_LARGURAS_COLUNAS = (263.0, 63.0, 95.0)
+_ALTURA_CATEGORIA = 21.25
+_ALTURA_TITULOS = 20.85
+_ALTURA_LINHA = 15.0
+_MARGEM_SUPERIOR = 20.0
+_MARGEM_INFERIOR = 40.0
+_ALTURA_CABECALHO = 60.0
+_AZUL_TITULOS = (0x44, 0x72, 0xC4)
+_BRANCO = (255, 255, 255)
+
+# Cabeçalho usado quando o template não existe
+_CABECALHO_PADRAO = {
+    'logo': None,
+    'validade': 'VÁLIDO ATÉ',
+    'contatos': [],
+    'categoria': 'OFERTA DO DIA',
+    'titulos': ('NOME/DESCRIÇÃO', 'UNIDADE', 'PREÇO DE VENDA'),
+}
+
+# Cabeçalhos já lidos, por (template, mtime)
+_CABECALHOS = {}
+
+def _texto_paragrafo(p):
+    """Texto de um parágrafo do Word, com quebras de linha (<w:br/>) como \\n"""
+    partes = []
+    for elemento in p.iter(f"{{{_NS['w']}}}t", f"{{{_NS['w']}}}br", f"{{{_NS['w']}}}tab"):
+        if elemento.tag.endswith('}t'):
+            partes.append(elemento.text or '')
+        elif elemento.tag.endswith('}br'):
+            partes.append('\n')
+        else:
+            partes.append(' ')
+    return ''.join(partes)
+
+def ler_cabecalho(template_path):
+    """
+    Lê do template o que o renderizador reproduz: logo do cabeçalho, texto da
+    validade, contatos, título da categoria e títulos das colunas
+
+    Args:
+        template_path (str): Caminho do template DOCX
+
+    Returns:
+        dict: Chaves 'logo' (bytes PNG ou None), 'validade', 'contatos',
+        'categoria' e 'titulos'
+    """
+    if not template_path or not Path(template_path).exists():
+        return _CABECALHO_PADRAO
+
+    chave = (str(Path(template_path).resolve()), os.stat(template_path).st_mtime_ns)
+    if chave in _CABECALHOS:
+        return _CABECALHOS[chave]
+
+    cabecalho = dict(_CABECALHO_PADRAO)
+    with zipfile.ZipFile(template_path) as pacote:
+        nomes = set(pacote.namelist())
+
+        documento = etree.fromstring(pacote.read('word/document.xml'))
+        tabela = documento.find('.//w:tbl', _NS)
+        if tabela is not None:
+            linhas = tabela.findall('w:tr', _NS)
+            textos = [[''.join(_texto_paragrafo(p) for p in tc.iterfind('.//w:p', _NS)).strip()
+                       for tc in tr.findall('w:tc', _NS)] for tr in linhas[:2]]
+            if textos and textos[0]:
+                # Descarta o emoji do título, que as fontes padrão do PDF não têm
+                cabecalho['categoria'] = codificar(textos[0][0]).decode('cp1252').strip()
+            if len(textos) > 1 and len(textos[1]) >= 3:
+                cabecalho['titulos'] = tuple(textos[1][:3])
+
+        if 'word/header1.xml' in nomes:
+            header = etree.fromstring(pacote.read('word/header1.xml'))
+
+            # As caixas de texto aparecem duas vezes (mc:Choice e mc:Fallback); usa só a primeira
+            contatos = []
+            for caixa in header.iterfind('.//w:txbxContent', _NS):
+                if caixa.xpath('ancestor::mc:Fallback', namespaces=_NS):
+                    continue
+                paragrafos = [_texto_paragrafo(p).strip() for p in caixa.iterfind('w:p', _NS)]
+                validade = [p for p in paragrafos if 'VALIDO' in p.upper() or 'VÁLIDO' in p.upper()]
+                if validade:
+                    cabecalho['validade'] = _PADRAO_DATA.sub('', validade[0]).strip()
+                else:
+                    contatos.extend(linha for p in paragrafos for linha in p.split('\n') if linha.strip())
+            cabecalho['contatos'] = contatos
+
+            # Logo: a imagem referenciada pelo cabeçalho
+            blip = header.find('.//a:blip', _NS)
+            if blip is not None and 'word/_rels/header1.xml.rels' in nomes:
+                rid = blip.get(f"{{{_NS['r']}}}embed")
+                relacoes = etree.fromstring(pacote.read('word/_rels/header1.xml.rels'))
+                for relacao in relacoes.iterfind('rel:Relationship', _NS):
+                    alvo = 'word/' + relacao.get('Target', '')
+                    if relacao.get('Id') == rid and alvo.lower().endswith('.png') and alvo in nomes:
+                        cabecalho['logo'] = pacote.read(alvo)
+
+    _CABECALHOS[chave] = cabecalho
+    return cabecalho
+
+def _ajustar(texto, largura_maxima, tamanho, negrito=False, tamanho_minimo=7):
+    """Reduz a fonte (até tamanho_minimo) e, se ainda não couber, corta o texto com '...'"""
+    while tamanho > tamanho_minimo and largura_texto(texto, tamanho, negrito) > largura_maxima:
+        tamanho -= 0.5
+    if largura_texto(texto, tamanho, negrito) > largura_maxima:
+        while texto and largura_texto(texto + '...', tamanho, negrito) > largura_maxima:
+            texto = texto[:-1]
+        texto = texto.rstrip() + '...'
+    return texto, tamanho
+
+class RenderizadorPDF:
+    """Classe para gerar o PDF da OFERTA DO DIA sem passar pelo DOCX"""
+
+    def __init__(self, produtos):
+        self.produtos = produtos
+
+    def gerar_pdf(self, template_path="OFERTA-DO-DIA.docx", output_path="output/OFERTA-DO-DIA.pdf", data=None):
+        """
+        Gera o PDF da oferta direto da lista de produtos
+
+        Args:
+            template_path (str): Template DOCX de onde vêm logo, contatos e títulos
+            output_path (str): Caminho de saída do PDF
+            data (datetime): Data de validade (padrão: hoje)
+
+        Returns:
+            str: Caminho do arquivo gerado, ou None em caso de erro
+        """
+        try:
+            cabecalho = ler_cabecalho(template_path)
+            data = data or datetime.now()
+
+            documento = DocumentoPDF()
+            logo = documento.adicionar_imagem(cabecalho['logo']) if cabecalho['logo'] else None
+            validade = f"{cabecalho['validade']} {data.strftime('%d/%m/%y')}".strip()
+
+            x_tabela = (documento.largura - sum(_LARGURAS_COLUNAS)) / 2
+            total = 0
+            pagina = None
+            y = 0
+
+            # self.produtos pode ser um gerador, então é percorrido uma única vez
+            for produto in self.produtos:
+                if pagina is None or y - _ALTURA_LINHA < _MARGEM_INFERIOR:
+                    pagina = documento.nova_pagina()
+                    y = self._desenhar_cabecalho(pagina, documento, cabecalho, logo, validade)
+                    if len(documento.paginas) == 1:
+                        y = self._desenhar_linha(pagina, x_tabela, y, [cabecalho['categoria']],
+                                                 _ALTURA_CATEGORIA, tamanho=14, negrito=True,
+                                                 larguras=(sum(_LARGURAS_COLUNAS),))
+                    y = self._desenhar_linha(pagina, x_tabela, y, cabecalho['titulos'], _ALTURA_TITULOS,
+                                             tamanho=11, negrito=True, cor=_BRANCO, fundo=_AZUL_TITULOS)
+
+                valores = (str(produto['descricao']), str(produto['unidade']), f"R$ {produto['preco']:.2f}")
+                y = self._desenhar_linha(pagina, x_tabela, y, valores, _ALTURA_LINHA, tamanho=10)
+                total += 1
+
+            if pagina is None:
+                # Sem produtos: só o cabeçalho e os títulos da tabela
+                pagina = documento.nova_pagina()
+                y = self._desenhar_cabecalho(pagina, documento, cabecalho, logo, validade)
+                self._desenhar_linha(pagina, x_tabela, y, cabecalho['titulos'], _ALTURA_TITULOS,
+                                     tamanho=11, negrito=True, cor=_BRANCO, fundo=_AZUL_TITULOS)
+
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            documento.salvar(output_path)
+            print(f"[OK] {total} produtos em {len(documento.paginas)} pagina(s)")
+            print(f"[OK] PDF gerado: {output_path}")
+            return output_path
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao gerar PDF: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+
+    def _desenhar_cabecalho(self, pagina, documento, cabecalho, logo, validade):
+        """Desenha logo, validade e contatos no topo da página e devolve o y onde a tabela começa"""
+        topo = documento.altura - _MARGEM_SUPERIOR
+        centro = topo - _ALTURA_CABECALHO / 2
+
+        if logo:
+            nome, largura_px, altura_px = logo
+            altura = _ALTURA_CABECALHO
+            largura = altura * largura_px / altura_px
+            pagina.imagem(nome, (documento.largura - largura) / 2, topo - altura, largura, altura)
+
+        pagina.texto(_MARGEM_SUPERIOR + 10, centro - 5, validade, tamanho=14, negrito=True)
+
+        contatos = cabecalho['contatos']
+        y = centro + (len(contatos) - 1) * 5 - 3
+        for linha in contatos:
+            pagina.texto(documento.largura - _MARGEM_SUPERIOR - 10, y, linha, tamanho=8, negrito=True,
+                         alinhamento='direita')
+            y -= 10
+
+        return topo - _ALTURA_CABECALHO - 10
+
+    def _desenhar_linha(self, pagina, x, y, valores, altura, tamanho, negrito=False,
+                        cor=(0, 0, 0), fundo=None, larguras=_LARGURAS_COLUNAS):
+        """Desenha uma linha da tabela (células com borda e texto centralizado) e devolve o y seguinte"""
+        y -= altura
+        for valor, largura in zip(valores, larguras):
+            pagina.retangulo(x, y, largura, altura, preenchimento=fundo)
+            texto, tamanho_ajustado = _ajustar(valor, largura - 6, tamanho, negrito)
+            pagina.texto(x + largura / 2, y + (altura - tamanho_ajustado * 0.7) / 2, texto,
+                         tamanho=tamanho_ajustado, negrito=negrito, cor=cor, alinhamento='centro')
+            x += largura
+        return y
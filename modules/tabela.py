@@ -0,0 +1,196 @@
+"""
+Módulo Tabela - Tabela colunar de produtos (NumPy)
+Guarda os produtos extraídos em colunas em vez de uma lista de dicionários,
+para filtrar e ordenar milhares de linhas sem laços em Python
+"""
+import numpy as np
+
+CAMPOS = ('codigo', 'numero', 'descricao', 'estoque', 'unidade', 'local', 'marca', 'preco')
+
+class _Textos:
+    """Coluna de textos compacta: uma única string com os deslocamentos de cada valor"""
+
+    def __init__(self, valores):
+        self._dados = ''.join(valores)
+        self._limites = np.zeros(len(valores) + 1, dtype=np.int64)
+        np.cumsum([len(v) for v in valores], out=self._limites[1:])
+
+    def __getitem__(self, indice):
+        return self._dados[self._limites[indice]:self._limites[indice + 1]]
+
+class _Categorias:
+    """Coluna categórica: código inteiro por linha + lista de valores distintos"""
+
+    def __init__(self, valores):
+        indices = {}
+        self.codigos = np.fromiter(
+            (indices.setdefault(v, len(indices)) for v in valores),
+            dtype=np.int32, count=len(valores)
+        )
+        self.valores = list(indices)
+
+    def __getitem__(self, indice):
+        return self.valores[self.codigos[indice]]
+
+    def codigos_de(self, valores):
+        """Códigos correspondentes a um conjunto de valores (ignora os inexistentes)"""
+        procurados = set(valores)
+        return [i for i, v in enumerate(self.valores) if v in procurados]
+
+    def postos(self):
+        """Posição de cada código na ordem alfabética dos valores (para ordenar)"""
+        postos = np.empty(len(self.valores), dtype=np.int32)
+        postos[sorted(range(len(self.valores)), key=self.valores.__getitem__)] = np.arange(len(self.valores))
+        return postos
+
+class _Colunas:
+    """Armazenamento das colunas, compartilhado entre a tabela e suas visões filtradas"""
+
+    def __init__(self, produtos):
+        self.codigo = _Textos([p['codigo'] for p in produtos])
+        self.numero = _Textos([p['numero'] for p in produtos])
+        self.descricao = _Textos([p['descricao'] for p in produtos])
+        self.estoque = np.fromiter((p['estoque'] for p in produtos), dtype=np.int64, count=len(produtos))
+        self.unidade = _Categorias([p['unidade'] for p in produtos])
+        self.local = _Categorias([p['local'] for p in produtos])
+        self.marca = _Categorias([p['marca'] for p in produtos])
+        self.preco = np.fromiter((p['preco'] for p in produtos), dtype=np.float64, count=len(produtos))
+
+class TabelaProdutos:
+    """
+    Tabela colunar de produtos
+
+    Filtrar e ordenar devolvem novas tabelas que compartilham as colunas com a
+    original (apenas o vetor de linhas muda), então refazer um filtro é barato.
+    O acesso por linha devolve o mesmo dicionário produzido pelo ExtratorPDF,
+    e iterar a tabela percorre esses dicionários, então ela pode ser passada
+    diretamente ao GeradorOferta.
+    """
+
+    def __init__(self, colunas, linhas):
+        self._colunas = colunas
+        self._linhas = linhas
+
+    @classmethod
+    def de_produtos(cls, produtos):
+        """
+        Cria a tabela a partir de uma lista (ou iterável) de dicionários de produtos
+
+        Returns:
+            TabelaProdutos
+        """
+        produtos = list(produtos)
+        return cls(_Colunas(produtos), np.arange(len(produtos)))
+
+    def __len__(self):
+        return len(self._linhas)
+
+    def __getitem__(self, indice):
+        """
+        tabela[i] devolve o dicionário da linha i; fatias, máscaras booleanas e
+        vetores de índices devolvem uma nova TabelaProdutos
+        """
+        if isinstance(indice, (int, np.integer)):
+            return self._linha(self._linhas[indice])
+        return TabelaProdutos(self._colunas, self._linhas[indice])
+
+    def __iter__(self):
+        for linha in self._linhas:
+            yield self._linha(linha)
+
+    def _linha(self, linha):
+        c = self._colunas
+        return {
+            'codigo': c.codigo[linha],
+            'numero': c.numero[linha],
+            'descricao': c.descricao[linha],
+            'estoque': int(c.estoque[linha]),
+            'unidade': c.unidade[linha],
+            'local': c.local[linha],
+            'marca': c.marca[linha],
+            'preco': float(c.preco[linha]),
+        }
+
+    @property
+    def estoque(self):
+        """Vetor NumPy com o estoque das linhas da tabela"""
+        return self._colunas.estoque[self._linhas]
+
+    @property
+    def preco(self):
+        """Vetor NumPy com o preço das linhas da tabela"""
+        return self._colunas.preco[self._linhas]
+
+    def valores(self, campo):
+        """Valores distintos de uma coluna categórica ('unidade', 'local' ou 'marca') presentes na tabela"""
+        categorias = getattr(self._colunas, campo)
+        return [categorias.valores[c] for c in np.unique(categorias.codigos[self._linhas])]
+
+    def filtrar(self, estoque_minimo=None, marcas=None, unidades=None, preco_minimo=None, preco_maximo=None,
+                locais=None):
+        """
+        Filtra a tabela (todas as condições informadas precisam ser atendidas)
+
+        Args:
+            estoque_minimo (int): Mantém estoque > estoque_minimo
+            marcas (iterable): Mantém apenas estas marcas
+            unidades (iterable): Mantém apenas estas unidades (ex: ['CX', 'FD'])
+            preco_minimo (float): Mantém preço >= preco_minimo
+            preco_maximo (float): Mantém preço <= preco_maximo
+            locais (iterable): Mantém apenas estes locais (coluna Local do ERGON)
+
+        Returns:
+            TabelaProdutos: Nova tabela com as linhas filtradas
+        """
+        c = self._colunas
+        linhas = self._linhas
+        mascara = np.ones(len(linhas), dtype=bool)
+
+        if estoque_minimo is not None:
+            mascara &= c.estoque[linhas] > estoque_minimo
+        if marcas is not None:
+            mascara &= np.isin(c.marca.codigos[linhas], c.marca.codigos_de(marcas))
+        if unidades is not None:
+            mascara &= np.isin(c.unidade.codigos[linhas], c.unidade.codigos_de(unidades))
+        if preco_minimo is not None:
+            mascara &= c.preco[linhas] >= preco_minimo
+        if preco_maximo is not None:
+            mascara &= c.preco[linhas] <= preco_maximo
+        if locais is not None:
+            mascara &= np.isin(c.local.codigos[linhas], c.local.codigos_de(locais))
+
+        return TabelaProdutos(c, linhas[mascara])
+
+    def ordenar(self, campo='descricao', decrescente=False):
+        """
+        Ordena a tabela por um campo (ordenação estável)
+
+        Args:
+            campo (str): Um dos campos do produto (ex: 'descricao', 'preco')
+            decrescente (bool): Ordem decrescente
+
+        Returns:
+            TabelaProdutos: Nova tabela ordenada
+        """
+        if campo not in CAMPOS:
+            raise ValueError(f"Campo de ordenacao invalido: {campo}")
+
+        c = self._colunas
+        linhas = self._linhas
+        coluna = getattr(c, campo)
+
+        if isinstance(coluna, np.ndarray):
+            chaves = coluna[linhas]
+        elif isinstance(coluna, _Categorias):
+            chaves = coluna.postos()[coluna.codigos[linhas]]
+        else:
+            textos = [coluna[linha] for linha in linhas]
+            chaves = np.empty(len(linhas), dtype=np.int64)
+            chaves[sorted(range(len(linhas)), key=textos.__getitem__)] = np.arange(len(linhas))
+
+        ordem = np.argsort(-chaves if decrescente else chaves, kind='stable')
+        return TabelaProdutos(c, linhas[ordem])
+
+    def para_lista(self):
+        """Converte de volta para lista de dicionários"""
+        return list(self)
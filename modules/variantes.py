@@ -0,0 +1,265 @@
+"""
+Módulo Variantes - Várias ofertas a partir de uma única leitura do PDF
+Um arquivo JSON lista as ofertas impressas (por loja, estoque mínimo,
+unidade, marca...), cada uma com seu filtro, ordenação, template e saída.
+O PDF do ERGON é extraído uma vez para uma TabelaProdutos; cada variante
+só filtra/ordena a tabela em memória e gera o DOCX/PDF em um processo do
+pool, então dez variantes custam uma extração mais dez gerações.
+
+Exemplo de especificação (exemplos/variantes.json):
+    {
+      "estoque_minimo": 5,
+      "template": "OFERTA-DO-DIA.docx",
+      "variantes": [
+        {"nome": "geral"},
+        {"nome": "caixas", "unidades": ["CX"], "estoque_minimo": 20},
+        {"nome": "baratos", "preco_maximo": 50, "ordenar": "preco"}
+      ]
+    }
+
+Uso:
+    python modules/variantes.py exemplos/variantes.json 22112025.PDF --saida output/variantes
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from metricas import Metricas, medir
+
+# Filtros aceitos em cada variante (os mesmos de TabelaProdutos.filtrar)
+FILTROS = ('estoque_minimo', 'marcas', 'unidades', 'locais', 'preco_minimo', 'preco_maximo')
+# Demais chaves de uma variante
+_CHAVES = ('nome', 'ordenar', 'decrescente', 'template', 'docx', 'pdf') + FILTROS
+
+# Cache de templates do processo filho, reaproveitado entre as variantes que ele gera
+_MODELOS = None
+
+def carregar_variantes(caminho, saida="output/variantes"):
+    """
+    Lê e valida a especificação das variantes
+
+    Chaves no nível de cima do arquivo (ex: "estoque_minimo", "template")
+    valem como padrão para todas as variantes.
+
+    Args:
+        caminho (str): Arquivo JSON com a lista "variantes"
+        saida (str): Pasta padrão; cada variante sem "docx"/"pdf" é gravada
+            em saida/<nome>/
+
+    Returns:
+        list: Um dicionário por variante, com os padrões aplicados
+    """
+    especificacao = json.loads(Path(caminho).read_text(encoding='utf-8'))
+    padroes = {chave: valor for chave, valor in especificacao.items() if chave != 'variantes'}
+    padroes.setdefault('estoque_minimo', 5)
+    padroes.setdefault('template', "OFERTA-DO-DIA.docx")
+
+    variantes = []
+    nomes = set()
+    for indice, definicao in enumerate(especificacao.get('variantes', []), 1):
+        variante = {**padroes, **definicao}
+        desconhecidas = sorted(set(variante) - set(_CHAVES))
+        if desconhecidas:
+            raise ValueError(f"Variante {indice}: chave(s) desconhecida(s): {', '.join(desconhecidas)}")
+        nome = variante.get('nome')
+        if not nome:
+            raise ValueError(f"Variante {indice}: falta o 'nome'")
+        if nome in nomes:
+            raise ValueError(f"Variante repetida: {nome}")
+        nomes.add(nome)
+
+        pasta = Path(saida) / nome
+        variante.setdefault('docx', str(pasta / "OFERTA-DO-DIA.docx"))
+        variante.setdefault('pdf', str(pasta / "OFERTA-DO-DIA.pdf"))
+        variantes.append(variante)
+
+    if not variantes:
+        raise ValueError(f"Nenhuma variante definida em {caminho}")
+    return variantes
+
+def selecionar(tabela, variante):
+    """
+    Produtos de uma variante: filtro e ordenação aplicados na tabela em memória
+
+    Returns:
+        list: Produtos da variante
+    """
+    filtrada = tabela.filtrar(**{filtro: variante[filtro] for filtro in FILTROS if filtro in variante})
+    if variante.get('ordenar'):
+        filtrada = filtrada.ordenar(variante['ordenar'], variante.get('decrescente', False))
+    return filtrada.para_lista()
+
+def gerar_variantes(pdf_path, variantes, data=None, pdf_direto=None, jobs=None, cache_dir="output/.cache",
+                    motor='texto', metricas=None, docx=False):
+    """
+    Extrai o PDF uma vez e gera todas as variantes em paralelo
+
+    Args:
+        pdf_path (str): PDF do ERGON
+        variantes (list): Resultado de carregar_variantes
+        data (datetime): Data de validade (padrão: a do nome DDMMYYYY.PDF, ou hoje)
+        pdf_direto (bool): Gera os PDFs com o RenderizadorPDF em vez do Word
+            (padrão: sim, exceto no Windows/macOS)
+        jobs (int): Processos para gerar as variantes (padrão: um por núcleo;
+            1 = no próprio processo)
+        cache_dir (str): Pasta do cache de extração/template (None = sem cache)
+        motor (str): Motor de extração ('texto' ou 'colunas')
+        metricas (Metricas): Recebe os tempos da extração e de cada variante
+            (opcional)
+        docx (bool): Grava também o DOCX de cada variante com o PDF direto
+            (pelo Word o DOCX é sempre gerado)
+
+    Returns:
+        list: Um dicionário por variante com 'nome', 'produtos', 'docx' (None
+        se não foi gerado), 'pdf', 'erro' e 'segundos', na ordem da especificação
+    """
+    from cache import CacheExtracao
+    from extrator import ExtratorPDF
+    from lote import data_do_arquivo
+
+    if pdf_direto is None:
+        pdf_direto = sys.platform not in ('win32', 'darwin')
+    data = data or data_do_arquivo(pdf_path) or datetime.now()
+
+    # Extração completa (sem filtro) uma única vez; o filtro de cada variante
+    # é aplicado na tabela em memória
+    cache = CacheExtracao(cache_dir) if cache_dir else None
+    tabela = ExtratorPDF(pdf_path, cache=cache, motor=motor, backend='auto', metricas=metricas).extrair_tabela()
+    if not len(tabela):
+        return [{'nome': variante['nome'], 'produtos': 0, 'docx': None, 'pdf': None,
+                 'erro': "Nenhum produto encontrado", 'segundos': 0.0} for variante in variantes]
+
+    with medir(metricas, 'selecionar_variantes'):
+        selecoes = [selecionar(tabela, variante) for variante in variantes]
+
+    # Se algum DOCX vai ser gerado, os templates são compilados uma única vez,
+    # antes do pool: os processos filhos herdam (ou leem do disco) o esqueleto
+    # em vez de compilá-lo ao mesmo tempo
+    modelos = _modelos(cache_dir)
+    if modelos is not None and (docx or not pdf_direto):
+        for template in dict.fromkeys(variante['template'] for variante in variantes):
+            modelos.aquecer(template)
+
+    jobs = min(jobs or os.cpu_count() or 1, len(variantes))
+    print(f"Gerando {len(variantes)} variantes com {jobs} processos...")
+    argumentos = (variantes, selecoes, [data] * len(variantes),
+                  [pdf_direto] * len(variantes), [metricas is not None] * len(variantes), [cache_dir] * len(variantes),
+                  [docx] * len(variantes))
+    with medir(metricas, 'gerar_variantes'):
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                resultados = list(executor.map(_gerar_variante, *argumentos))
+        else:
+            resultados = list(map(_gerar_variante, *argumentos))
+
+    for resultado in resultados:
+        dados = resultado.pop('metricas')
+        if dados is not None:
+            metricas.mesclar(dados)
+        if resultado['erro']:
+            print(f"[ERRO] {resultado['nome']}: {resultado['erro']}")
+        else:
+            print(f"[OK] {resultado['nome']}: {resultado['produtos']} produtos em {resultado['segundos']:.2f}s")
+
+    if not pdf_direto:
+        # Conversão pelo Word no processo principal, com uma única sessão para todas as variantes
+        from conversor import ConversorPDF
+
+        gerados = [resultado for resultado in resultados if resultado['docx']]
+        pdfs = [variante['pdf'] for variante, resultado in zip(variantes, resultados) if resultado['docx']]
+        convertidos = ConversorPDF.converter_lote([resultado['docx'] for resultado in gerados], pdfs,
+                                                  metricas=metricas)
+        for resultado, conversao in zip(gerados, convertidos):
+            resultado['pdf'] = conversao['pdf']
+            if not conversao['sucesso']:
+                resultado['erro'] = conversao['erro']
+
+    if metricas is not None:
+        metricas.definir('variantes_s', {resultado['nome']: resultado['segundos'] for resultado in resultados})
+    return resultados
+
+def _modelos(cache_dir):
+    """
+    Cache de templates do processo, criado na primeira chamada
+
+    Args:
+        cache_dir (str): Pasta do cache (None = sem cache)
+
+    Returns:
+        CacheModelos: Cache da pasta, ou None sem cache
+    """
+    from modelo import CacheModelos
+
+    global _MODELOS
+    if not cache_dir:
+        return None
+    if _MODELOS is None or _MODELOS.diretorio != Path(cache_dir):
+        _MODELOS = CacheModelos(cache_dir)
+    return _MODELOS
+
+def _gerar_variante(variante, produtos, data, pdf_direto, coletar_metricas=False, cache_dir="output/.cache",
+                    docx=False):
+    """Gera o PDF direto e/ou o DOCX de uma variante (executado no processo filho)"""
+    from gerador import GeradorOferta
+
+    modelos = _modelos(cache_dir)
+    inicio = time.perf_counter()
+    metricas = Metricas() if coletar_metricas else None
+    resultado = {'nome': variante['nome'], 'produtos': len(produtos), 'docx': None, 'pdf': None, 'erro': None}
+    try:
+        if not produtos:
+            resultado['erro'] = "Nenhum produto na variante"
+        else:
+            # O PDF direto não depende do DOCX: ele só é gerado se pedido (ou para o Word)
+            if docx or not pdf_direto:
+                gerador = GeradorOferta(produtos, modelos=modelos, metricas=metricas)
+                resultado['docx'] = gerador.gerar_docx(variante['template'], variante['docx'], data_validade=data)
+                if not resultado['docx']:
+                    resultado['erro'] = "Falha ao gerar DOCX"
+            if pdf_direto and not resultado['erro']:
+                from renderizador import RenderizadorPDF
+
+                with medir(metricas, 'renderizar_pdf'):
+                    resultado['pdf'] = RenderizadorPDF(produtos).gerar_pdf(variante['template'], variante['pdf'],
+                                                                           data=data)
+                if not resultado['pdf']:
+                    resultado['erro'] = "Falha ao gerar PDF"
+    except Exception as e:
+        resultado['erro'] = str(e)
+
+    resultado['segundos'] = time.perf_counter() - inicio
+    resultado['metricas'] = metricas.para_dict() if metricas is not None else None
+    return resultado
+
+def _data_argumento(texto):
+    try:
+        return datetime.strptime(texto, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Data invalida (use AAAA-MM-DD): {texto}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera várias ofertas a partir de uma única extração do PDF do ERGON")
+    parser.add_argument("especificacao", help="Arquivo JSON com as variantes")
+    parser.add_argument("pdf", help="PDF do ERGON")
+    parser.add_argument("--saida", default="output/variantes", help="Pasta padrão (cada variante em saida/<nome>/)")
+    parser.add_argument("--data", type=_data_argumento, help="Data de validade (AAAA-MM-DD)")
+    parser.add_argument("--jobs", type=int, default=None, help="Número de processos")
+    parser.add_argument("--motor", default="texto", choices=("texto", "colunas"), help="Motor de extração")
+    parser.add_argument("--word", action="store_true", help="Converte os PDFs pelo Word (docx2pdf)")
+    parser.add_argument("--docx", action="store_true", help="Grava também o DOCX de cada variante com o PDF direto")
+    parser.add_argument("--sem-cache", action="store_true", help="Não usa o cache de extração/template")
+    parser.add_argument("--cache-dir", default="output/.cache", help="Pasta do cache")
+    args = parser.parse_args()
+
+    metricas = Metricas(pdf=args.pdf, origem='variantes', pdf_direto=not args.word)
+    resultados = gerar_variantes(args.pdf, carregar_variantes(args.especificacao, args.saida), data=args.data,
+                                 pdf_direto=not args.word, jobs=args.jobs,
+                                 cache_dir=None if args.sem_cache else args.cache_dir,
+                                 motor=args.motor, metricas=metricas, docx=args.docx)
+    metricas.salvar(str(Path(args.saida) / "metricas.jsonl"))
+    sys.exit(0 if all(resultado['pdf'] for resultado in resultados) else 1)
@@ -0,0 +1,266 @@
+"""
+Módulo Vigia - Modo daemon: gera a oferta assim que o PDF do ERGON chega
+Observa a pasta de entrada (inotify no Linux; varredura periódica nos
+outros sistemas ou com --polling) e, quando um DDMMYYYY.PDF novo termina de
+ser gravado, roda o pipeline completo na hora. Bibliotecas, cache da
+extração e template compilado ficam carregados entre uma execução e outra.
+
+Uso:
+    python modules/vigia.py                  # observa a pasta atual
+    python modules/vigia.py /mnt/ergon --saida output
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from cache import CacheExtracao
+from lote import data_do_arquivo, pdf_anterior, processar_dia
+from metricas import Metricas
+from modelo import CacheModelos
+from perfil import Perfilador, perfil_ativo
+from renderizador import ler_cabecalho
+
+# Eventos do inotify (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_EVENTO = struct.Struct('iIII')
+
+class _VigiaInotify:
+    """Eventos de arquivos da pasta via inotify (ctypes, sem dependências)"""
+
+    def __init__(self, pasta):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        mascara = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(self._fd, os.fsencode(str(pasta)), mascara) < 0:
+            erro = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(erro, f"inotify_add_watch falhou em {pasta}")
+
+    def esperar(self, timeout):
+        """Espera até timeout segundos e devolve os nomes de arquivos que mudaram"""
+        prontos, _, _ = select.select([self._fd], [], [], timeout)
+        if not prontos:
+            return set()
+
+        try:
+            dados = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        nomes = set()
+        posicao = 0
+        while posicao + _EVENTO.size <= len(dados):
+            _, _, _, tamanho = _EVENTO.unpack_from(dados, posicao)
+            inicio = posicao + _EVENTO.size
+            nome = dados[inicio:inicio + tamanho].rstrip(b'\0')
+            if nome:
+                nomes.add(os.fsdecode(nome))
+            posicao = inicio + tamanho
+        return nomes
+
+    def fechar(self):
+        os.close(self._fd)
+
+class _VigiaPolling:
+    """Alternativa sem inotify: compara mtime/tamanho dos arquivos a cada varredura"""
+
+    def __init__(self, pasta):
+        self._pasta = Path(pasta)
+        self._estado = self._varrer()
+
+    def _varrer(self):
+        estado = {}
+        for entrada in os.scandir(self._pasta):
+            if entrada.is_file():
+                info = entrada.stat()
+                estado[entrada.name] = (info.st_mtime_ns, info.st_size)
+        return estado
+
+    def esperar(self, timeout):
+        time.sleep(timeout)
+        estado = self._varrer()
+        mudaram = {nome for nome, assinatura in estado.items() if self._estado.get(nome) != assinatura}
+        self._estado = estado
+        return mudaram
+
+    def fechar(self):
+        pass
+
+def _abrir_vigia(pasta, polling=False):
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            vigia = _VigiaInotify(pasta)
+            print(f"[OK] Observando {pasta} (inotify)")
+            return vigia
+        except (OSError, AttributeError) as e:
+            print(f"[INFO] inotify indisponivel ({e}), usando varredura periodica")
+    vigia = _VigiaPolling(pasta)
+    print(f"[OK] Observando {pasta} (varredura periodica)")
+    return vigia
+
+def _termina_pdf(caminho):
+    """True se o arquivo já tem o marcador %%EOF no final (PDF gravado por completo)"""
+    with open(caminho, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 1024))
+        return b'%%EOF' in f.read()
+
+class DaemonOferta:
+    """Processo de longa duração que gera a oferta para cada PDF do ERGON que chega na pasta"""
+
+    def __init__(self, pasta=".", saida="output", template_path="OFERTA-DO-DIA.docx", estoque_minimo=5,
+                 espera=2.0, intervalo=1.0, polling=False, pdf_direto=None, perfil=False, docx=False,
+                 cache_dir=None):
+        """
+        Args:
+            pasta (str): Pasta onde o ERGON grava os DDMMYYYY.PDF
+            saida (str): Pasta raiz dos resultados (cada dia em saida/AAAA-MM-DD/)
+            template_path (str): Template DOCX
+            estoque_minimo (int): Estoque mínimo para entrar na oferta
+            espera (float): Segundos sem mudança no arquivo antes de processá-lo
+                (evita ler um PDF ainda sendo gravado)
+            intervalo (float): Intervalo entre verificações, em segundos
+            polling (bool): Força a varredura periódica em vez do inotify
+            pdf_direto (bool): Gera o PDF com o RenderizadorPDF em vez do Word
+                (padrão: sim, exceto no Windows/macOS)
+            perfil (bool): Grava cProfile/tracemalloc de cada etapa em
+                saida/AAAA-MM-DD/perfil/ (também ativado por TABELADODIA_PERFIL)
+            docx (bool): Grava também o DOCX com o PDF direto
+            cache_dir (str): Pasta do cache de extração/template (padrão:
+                saida/.cache, para não depender da pasta de onde o daemon é iniciado)
+        """
+        self.pasta = Path(pasta)
+        self.saida = saida
+        self.template_path = template_path
+        self.estoque_minimo = estoque_minimo
+        self.espera = espera
+        self.intervalo = intervalo
+        self.polling = polling
+        self.pdf_direto = sys.platform not in ('win32', 'darwin') if pdf_direto is None else pdf_direto
+        self.perfil = perfil_ativo(perfil)
+        self.docx = docx
+
+        cache_dir = cache_dir or Path(saida) / ".cache"
+        self.cache = CacheExtracao(cache_dir)
+        self.modelos = CacheModelos(cache_dir)
+        self._pendentes = {}
+        self._processados = {}
+
+    def aquecer(self):
+        """Carrega bibliotecas e compila o template antes do primeiro PDF chegar"""
+        inicio = time.perf_counter()
+        import pypdfium2  # noqa: F401 (backend rápido do extrator)
+        if Path(self.template_path).exists():
+            self.modelos.obter(self.template_path)
+            ler_cabecalho(self.template_path)
+        print(f"[OK] Pronto em {time.perf_counter() - inicio:.2f}s")
+
+    def executar(self):
+        """Loop principal (Ctrl+C para sair)"""
+        self.aquecer()
+
+        # PDF de hoje que chegou enquanto o daemon estava parado
+        hoje = self.pasta / f"{datetime.now().strftime('%d%m%Y')}.PDF"
+        saida_hoje = Path(self.saida) / datetime.now().strftime("%Y-%m-%d") / "OFERTA-DO-DIA.pdf"
+        if hoje.exists() and not saida_hoje.exists():
+            self._pendentes[hoje.name] = (time.monotonic(), None)
+
+        vigia = _abrir_vigia(self.pasta, self.polling)
+        try:
+            while True:
+                for nome in vigia.esperar(self.intervalo):
+                    if data_do_arquivo(nome) is not None:
+                        self._pendentes[nome] = (time.monotonic(), None)
+                self._verificar_pendentes()
+        except KeyboardInterrupt:
+            print("\n[INFO] Encerrando...")
+        finally:
+            vigia.fechar()
+
+    def _verificar_pendentes(self):
+        """Processa os arquivos pendentes que pararam de mudar"""
+        agora = time.monotonic()
+        for nome, (instante, tamanho) in list(self._pendentes.items()):
+            caminho = self.pasta / nome
+            # O arquivo pode sumir ou ser renomeado no meio da cópia, ou estar
+            # travado por quem o grava (compartilhamento no Windows): some da
+            # lista se não existe mais; nos outros erros tenta no próximo ciclo
+            try:
+                info = caminho.stat()
+                if info.st_size != tamanho:
+                    self._pendentes[nome] = (agora, info.st_size)
+                    continue
+                if agora - instante < self.espera or not _termina_pdf(caminho):
+                    continue
+            except FileNotFoundError:
+                del self._pendentes[nome]
+                continue
+            except OSError as e:
+                print(f"[INFO] {nome} ainda indisponivel ({e}); nova tentativa no proximo ciclo")
+                continue
+
+            del self._pendentes[nome]
+            assinatura = (info.st_mtime_ns, info.st_size)
+            if self._processados.get(nome) == assinatura:
+                continue
+            self._processados[nome] = assinatura
+            self._processar(caminho)
+
+    def _processar(self, caminho):
+        print("\n" + "="*80)
+        print(f"NOVO PDF DO ERGON: {caminho.name}")
+        print("="*80)
+
+        inicio = time.perf_counter()
+        data = data_do_arquivo(caminho)
+        perfilador = Perfilador(Path(self.saida) / data.strftime("%Y-%m-%d") / "perfil") if self.perfil else None
+        metricas = Metricas(perfilador, pdf=str(caminho), data=data.strftime("%Y-%m-%d"), origem='vigia',
+                            pdf_direto=self.pdf_direto)
+        resultado = processar_dia(str(caminho), data, self.saida, self.template_path, self.estoque_minimo,
+                                  self.pdf_direto, cache=self.cache, modelos=self.modelos, metricas=metricas,
+                                  anterior=pdf_anterior(self.pasta, data), docx=self.docx)
+
+        if resultado['docx'] and not self.pdf_direto:
+            from conversor import ConversorPDF
+            resultado['pdf'] = ConversorPDF.converter(resultado['docx'], metricas=metricas)
+            if not resultado['pdf']:
+                resultado['erro'] = "Falha ao converter para PDF"
+
+        metricas.definir('publicacao_s', time.perf_counter() - inicio)
+        metricas.salvar(str(Path(self.saida) / "metricas.jsonl"))
+
+        if resultado['erro']:
+            print(f"[ERRO] {caminho.name}: {resultado['erro']}")
+        else:
+            print(f"[OK] Oferta publicada em {time.perf_counter() - inicio:.2f}s: {resultado['pdf']}")
+        return resultado
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera a OFERTA DO DIA automaticamente quando o PDF do ERGON chega")
+    parser.add_argument("pasta", nargs="?", default=".", help="Pasta onde o ERGON grava os DDMMYYYY.PDF")
+    parser.add_argument("--saida", default="output", help="Pasta raiz dos resultados")
+    parser.add_argument("--template", default="OFERTA-DO-DIA.docx", help="Template DOCX")
+    parser.add_argument("--estoque-minimo", type=int, default=5)
+    parser.add_argument("--espera", type=float, default=2.0, help="Segundos sem mudança antes de processar o arquivo")
+    parser.add_argument("--polling", action="store_true", help="Usa varredura periódica em vez do inotify")
+    parser.add_argument("--word", action="store_true", help="Converte o PDF pelo Word (docx2pdf)")
+    parser.add_argument("--docx", action="store_true", help="Grava também o DOCX com o PDF direto")
+    parser.add_argument("--profile", action="store_true",
+                        help="Grava cProfile e pico de memória de cada etapa em saida/AAAA-MM-DD/perfil/")
+    parser.add_argument("--cache-dir", default=None, help="Pasta do cache (padrão: saida/.cache)")
+    args = parser.parse_args()
+
+    DaemonOferta(args.pasta, saida=args.saida, template_path=args.template, estoque_minimo=args.estoque_minimo,
+                 espera=args.espera, polling=args.polling, pdf_direto=not args.word,
+                 perfil=args.profile, docx=args.docx, cache_dir=args.cache_dir).executar()
@@ -0,0 +1,320 @@
+"""
+Benchmark do pipeline com PDFs sintéticos no formato do ERGON
+1. Gera relatórios DDMMYYYY.PDF com 10, 100, 1.000 e 10.000 linhas de
+   produto (estoque negativo, sem Local, sem Marca, descrições longas,
+   preço >= 1.000,00), com o mesmo layout de colunas do ERGON
+2. Mede cada etapa do ExtratorPDF, GeradorOferta e da geração do PDF
+   (RenderizadorPDF, ou ConversorPDF com --word), cada tamanho em um
+   processo novo para que o pico de RSS seja o daquele tamanho
+3. Compara com o baseline (scripts/benchmark_baseline.json) e marca como
+   REGRESSAO as etapas que ficaram mais lentas que a tolerância. Os tempos
+   dependem da máquina, então o baseline não é versionado: grave-o uma vez
+   com --salvar-baseline (sem ele a comparação falha)
+
+Uso:
+    python scripts/benchmark.py --salvar-baseline
+    python scripts/benchmark.py
+    python scripts/benchmark.py --tamanhos 10 100 --repeticoes 3
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import random
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).parent.parent
+sys.path.insert(0, str(RAIZ / "modules"))
+
+from pdfsimples import DocumentoPDF, largura_texto
+
+TAMANHOS = (10, 100, 1000, 10000)
+BASELINE = RAIZ / "scripts" / "benchmark_baseline.json"
+TOLERANCIA = 0.25
+# Diferenças menores que isso são ruído de medição, mesmo acima da tolerância
+_FOLGA_MINIMA_S = 0.005
+
+# Layout do relatório do ERGON (A4, fonte de 6 pt), em pontos a partir do topo
+_TAMANHO_FONTE = 6
+_TOPO_TABELA = 115.2
+_ALTURA_LINHA = 10.0
+_LINHAS_POR_PAGINA = 70
+# (campo, título, x, alinhada à direita): x é a borda esquerda ou a direita
+_COLUNAS = (
+    ('codigo', 'Código', 11.0, False),
+    ('numero', 'Número', 43.4, False),
+    ('descricao', 'Descrição', 115.4, False),
+    ('estoque', 'Estoque', 324.2, True),
+    ('unidade', 'Unid.', 331.4, False),
+    ('local', 'Local', 421.4, False),
+    ('marca', 'Marca', 450.2, False),
+    ('preco', 'Pr.Venda', 565.4, True),
+)
+_LARGURA_DESCRICAO = 175.0
+
+_PRODUTOS = ('LEITE', 'CAFE', 'OLEO SOJA', 'ARROZ', 'FEIJAO', 'ACUCAR', 'AER', 'COPO T.PLAS', 'PRATO T.PLAS',
+             'RACAO', 'SABONETE', 'DETERGENTE', 'BISCOITO', 'MACARRAO', 'FARINHA LACT', 'ESMALTE')
+_DETALHES = ('TRAD', 'EXTRAFORTE', 'ALMOFADA', 'VACUO', 'INTEGRAL', 'CALENDULA', 'LAVANDA', 'TRANSP',
+             'BRANC', 'FILHOTES', 'ADULTO', 'SUAVE', 'C VITAMINA E', 'PREVISIVEL DUO COLOR')
+_EMBALAGENS = ('12X150ML', '20X250G', '10X1KG', '24X80G', '20X900ML', '50X50ML', '27X395G', '20KG')
+_MARCAS = ('CCGL', 'TOTALPLAST', 'PEDIGREE', 'CONCÓRDIA', 'PILÃO', 'DOVE', 'MARATÁ', 'ITALAC',
+           'LEITE DE ROSAS', 'Mundial S/A Produ')
+_LOCAIS = ('GALPÃO', 'LOJA', 'DEP2')
+
+def _formatar_preco(valor):
+    """1234.5 -> '1.234,50' (formato do ERGON)"""
+    return f"{valor:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+
+def gerar_linhas(quantidade, semente=0):
+    """
+    Linhas de produto sintéticas, determinísticas para a mesma semente
+
+    Returns:
+        list: Dicionários com os campos do relatório, já como texto
+    """
+    aleatorio = random.Random(semente)
+    linhas = []
+    for indice in range(quantidade):
+        sorteio = aleatorio.random()
+        descricao = ' '.join((aleatorio.choice(_PRODUTOS), aleatorio.choice(_DETALHES),
+                              aleatorio.choice(_EMBALAGENS)))
+        if sorteio < 0.1:
+            # Descrição longa: ocupa a coluna inteira
+            descricao = ' '.join((descricao, aleatorio.choice(_DETALHES), aleatorio.choice(_DETALHES),
+                                  aleatorio.choice(_EMBALAGENS)))
+        while largura_texto(descricao, _TAMANHO_FONTE) > _LARGURA_DESCRICAO:
+            descricao = descricao[:-1].rstrip()
+
+        estoque = aleatorio.randint(-20, -1) if aleatorio.random() < 0.1 else aleatorio.randint(0, 20000)
+        preco = aleatorio.uniform(1000, 5000) if aleatorio.random() < 0.05 else aleatorio.uniform(5, 999)
+        linhas.append({
+            'codigo': str(100 + indice),
+            'numero': aleatorio.choice((str(100 + indice), f"CC{aleatorio.randint(10**7, 10**8 - 1)}",
+                                        f"{aleatorio.randint(1000, 999999)}")),
+            'descricao': descricao,
+            'estoque': str(estoque),
+            'unidade': aleatorio.choice(('CX', 'CX', 'FD', 'UN')),
+            # A maioria das linhas do ERGON vem sem Local
+            'local': aleatorio.choice(_LOCAIS) if aleatorio.random() < 0.2 else '',
+            'marca': '' if aleatorio.random() < 0.15 else aleatorio.choice(_MARCAS),
+            'preco': _formatar_preco(round(preco, 2)),
+        })
+    return linhas
+
+def gerar_pdf_ergon(caminho, linhas, data=None):
+    """
+    Grava um relatório no layout do ERGON (cabeçalho repetido em cada página)
+
+    Args:
+        caminho (str): Arquivo de saída
+        linhas (list): Resultado de gerar_linhas
+        data (datetime): Data de emissão (padrão: agora)
+
+    Returns:
+        int: Número de páginas
+    """
+    data = data or datetime.now()
+    documento = DocumentoPDF((595, 842))
+    altura = documento.altura
+
+    def escrever(pagina, x, topo, texto, direita=False, tamanho=_TAMANHO_FONTE, negrito=False):
+        pagina.texto(x, altura - topo - tamanho * 0.75, texto, tamanho=tamanho, negrito=negrito,
+                     alinhamento='direita' if direita else 'esquerda')
+
+    tracos = '-' * 160
+    paginas = [linhas[i:i + _LINHAS_POR_PAGINA] for i in range(0, len(linhas), _LINHAS_POR_PAGINA)] or [[]]
+    for numero, bloco in enumerate(paginas, 1):
+        pagina = documento.nova_pagina()
+        escrever(pagina, 11.0, 32.3, "TARUMA", tamanho=22, negrito=True)
+        escrever(pagina, 11.0, 55.2, "COMERCIAL TARUMA LTDA")
+        escrever(pagina, 403.4, 55.2, "Varejo")
+        escrever(pagina, 11.0, 65.2, "Fone : (93)9.9156-2448")
+        escrever(pagina, 403.4, 65.2, f"Pagina : {numero}")
+        escrever(pagina, 11.0, 75.2, f"Emitido em : {data.strftime('%d/%m/%Y as %H:%M:%S')}")
+        escrever(pagina, 11.0, 85.2, tracos)
+        for _, titulo, x, direita in _COLUNAS:
+            escrever(pagina, x, 95.2, titulo, direita)
+        escrever(pagina, 11.0, 105.2, tracos)
+
+        for indice, linha in enumerate(bloco):
+            topo = _TOPO_TABELA + indice * _ALTURA_LINHA
+            for campo, _, x, direita in _COLUNAS:
+                if linha[campo]:
+                    escrever(pagina, x, topo, linha[campo], direita)
+
+    documento.salvar(caminho)
+    return len(documento.paginas)
+
+def _pico_rss_bytes():
+    """Pico de memória residente do processo (None onde não há o módulo resource)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KiB; macOS em bytes
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+def medir_tamanho(tamanho, pasta, template_path, backend, motor, word):
+    """
+    Roda o pipeline uma vez sobre um PDF sintético de 'tamanho' linhas
+    (executado em um processo novo)
+
+    Returns:
+        dict: Tempos das etapas (registro de Metricas) e o pico de RSS
+    """
+    # As mensagens de progresso do pipeline poluiriam o relatório
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _medir_tamanho(tamanho, pasta, template_path, backend, motor, word)
+
+def _medir_tamanho(tamanho, pasta, template_path, backend, motor, word):
+    from extrator import ExtratorPDF
+    from gerador import GeradorOferta
+    from metricas import Metricas, medir
+    from renderizador import RenderizadorPDF
+
+    pdf_path = Path(pasta) / f"{tamanho}" / "01012030.PDF"
+    pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    paginas = gerar_pdf_ergon(str(pdf_path), gerar_linhas(tamanho), data=datetime(2030, 1, 1))
+
+    metricas = Metricas(tamanho=tamanho, backend=backend, motor=motor)
+    produtos = ExtratorPDF(str(pdf_path), backend=backend, motor=motor,
+                           metricas=metricas).extrair_produtos(estoque_minimo=5)
+
+    docx_path = str(pdf_path.parent / "OFERTA-DO-DIA.docx")
+    GeradorOferta(produtos, metricas=metricas).gerar_docx(template_path, docx_path, data_validade=datetime(2030, 1, 1))
+
+    if word:
+        from conversor import ConversorPDF
+        ConversorPDF.converter(docx_path, metricas=metricas)
+    else:
+        with medir(metricas, 'renderizar_pdf'):
+            RenderizadorPDF(produtos).gerar_pdf(template_path, str(pdf_path.parent / "OFERTA-DO-DIA.pdf"),
+                                                data=datetime(2030, 1, 1))
+
+    registro = metricas.para_dict()
+    return {
+        'linhas': tamanho,
+        'paginas': paginas,
+        'produtos': len(produtos),
+        'etapas': {nome: etapa['parede_s'] for nome, etapa in registro['etapas'].items()},
+        'taxa_falha_regex': registro['derivados'].get('taxa_falha_regex'),
+        'tamanho_docx_bytes': registro['valores'].get('tamanho_docx_bytes'),
+        'pico_rss_bytes': _pico_rss_bytes(),
+    }
+
+def _melhor(execucoes):
+    """Junta as repetições de um tamanho ficando com o menor tempo de cada etapa"""
+    resultado = dict(execucoes[0])
+    resultado['etapas'] = {
+        nome: min(execucao['etapas'][nome] for execucao in execucoes)
+        for nome in execucoes[0]['etapas']
+    }
+    picos = [execucao['pico_rss_bytes'] for execucao in execucoes if execucao['pico_rss_bytes'] is not None]
+    resultado['pico_rss_bytes'] = max(picos) if picos else None
+
+    extracao = resultado['etapas'].get('extracao')
+    geracao = sum(tempo for nome, tempo in resultado['etapas'].items() if nome != 'extracao')
+    resultado['linhas_por_s'] = resultado['linhas'] / extracao if extracao else None
+    resultado['produtos_por_s'] = resultado['produtos'] / geracao if geracao else None
+    return resultado
+
+def executar(tamanhos=TAMANHOS, repeticoes=1, template_path=str(RAIZ / "OFERTA-DO-DIA.docx"),
+             backend='pdfminer', motor='texto', word=False):
+    """
+    Executa o benchmark
+
+    Returns:
+        dict: Resultado por tamanho (chave = número de linhas, como texto)
+    """
+    resultados = {}
+    contexto = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory(prefix="benchmark-ergon-") as pasta:
+        for tamanho in tamanhos:
+            execucoes = []
+            for _ in range(repeticoes):
+                # Processo novo por execução: o pico de RSS é só desta execução
+                with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+                    execucoes.append(executor.submit(medir_tamanho, tamanho, pasta, template_path,
+                                                     backend, motor, word).result())
+            resultados[str(tamanho)] = _melhor(execucoes)
+            imprimir_tamanho(resultados[str(tamanho)])
+    return resultados
+
+def imprimir_tamanho(resultado):
+    rss = resultado['pico_rss_bytes']
+    print(f"\n{resultado['linhas']} linhas ({resultado['paginas']} paginas, {resultado['produtos']} produtos)")
+    for nome, tempo in resultado['etapas'].items():
+        print(f"  {nome:<20} {tempo * 1000:10.1f} ms")
+    if resultado['linhas_por_s']:
+        print(f"  {'linhas/s':<20} {resultado['linhas_por_s']:10.0f}")
+    if resultado['produtos_por_s']:
+        print(f"  {'produtos/s':<20} {resultado['produtos_por_s']:10.0f}")
+    if rss is not None:
+        print(f"  {'pico RSS':<20} {rss / 1024 / 1024:10.1f} MiB")
+
+def comparar(resultados, baseline, tolerancia=TOLERANCIA):
+    """
+    Compara os tempos com o baseline
+
+    Returns:
+        list: Mensagens das etapas que ficaram mais lentas que baseline * (1 + tolerancia)
+    """
+    regressoes = []
+    for tamanho, resultado in resultados.items():
+        referencia = baseline.get(tamanho)
+        if referencia is None:
+            continue
+        for nome, tempo in resultado['etapas'].items():
+            anterior = referencia['etapas'].get(nome)
+            if anterior and tempo > anterior * (1 + tolerancia) and tempo - anterior > _FOLGA_MINIMA_S:
+                regressoes.append(f"{tamanho} linhas / {nome}: {anterior * 1000:.1f} ms -> {tempo * 1000:.1f} ms "
+                                  f"(+{(tempo / anterior - 1) * 100:.0f}%)")
+        anterior = referencia.get('pico_rss_bytes')
+        atual = resultado['pico_rss_bytes']
+        if anterior and atual and atual > anterior * (1 + tolerancia):
+            regressoes.append(f"{tamanho} linhas / pico RSS: {anterior / 1024 / 1024:.1f} MiB -> "
+                              f"{atual / 1024 / 1024:.1f} MiB")
+    return regressoes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline com PDFs sintéticos do ERGON")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS), help="Linhas de produto por PDF")
+    parser.add_argument("--repeticoes", type=int, default=1, help="Execuções por tamanho (vale o menor tempo)")
+    parser.add_argument("--backend", default="pdfminer", choices=("auto", "pdfminer", "pdfium"),
+                        help="Backend do ExtratorPDF")
+    parser.add_argument("--motor", default="texto", choices=("texto", "colunas"), help="Motor do ExtratorPDF")
+    parser.add_argument("--template", default=str(RAIZ / "OFERTA-DO-DIA.docx"), help="Template DOCX")
+    parser.add_argument("--word", action="store_true", help="Converte pelo Word (ConversorPDF) em vez do renderizador")
+    parser.add_argument("--baseline", default=str(BASELINE), help="Arquivo de baseline")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="Aumento de tempo aceito antes de acusar regressão (0.25 = 25%%)")
+    parser.add_argument("--salvar-baseline", action="store_true", help="Grava o resultado como novo baseline")
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline)
+    if not args.salvar_baseline and not baseline_path.exists():
+        print(f"[ERRO] Baseline nao encontrado: {baseline_path}")
+        print("[INFO] Grave um com: python scripts/benchmark.py --salvar-baseline")
+        sys.exit(1)
+
+    resultados = executar(args.tamanhos, args.repeticoes, args.template, args.backend, args.motor, args.word)
+
+    if args.salvar_baseline:
+        baseline_path.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"\n[OK] Baseline gravado em: {baseline_path}")
+        sys.exit(0)
+
+    regressoes = comparar(resultados, json.loads(baseline_path.read_text(encoding='utf-8')), args.tolerancia)
+    print("\n" + "="*80)
+    if regressoes:
+        for regressao in regressoes:
+            print(f"[ERRO] REGRESSAO {regressao}")
+    else:
+        print(f"[OK] Sem regressões em relação a {baseline_path}")
+    sys.exit(1 if regressoes else 0)
@@ -0,0 +1,110 @@
+"""
+Benchmark da inicialização da interface (app.py)
+1. Mede o tempo de "import app" em processos novos (python -X importtime)
+   e lista os módulos que mais pesam
+2. Falha se o import de app.py carregar alguma biblioteca pesada do
+   pipeline (pdfplumber, python-docx, NumPy, docx2pdf...), que deve ficar
+   para o pré-aquecimento em segundo plano
+3. Havendo tela, mede também o tempo até a janela ser desenhada
+
+Uso:
+    python scripts/benchmark_inicializacao.py
+    python scripts/benchmark_inicializacao.py --limite-ms 150 --repeticoes 10
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).parent.parent
+
+# Bibliotecas que não podem ser importadas junto com a janela
+PESADAS = ('pdfplumber', 'pdfminer', 'pypdfium2', 'docx', 'lxml', 'numpy', 'docx2pdf', 'win32com', 'pythoncom')
+LIMITE_MS = 250
+
+_CODIGO_JANELA = """
+import time
+inicio = time.perf_counter()
+import tkinter as tk
+try:
+    root = tk.Tk()
+except tk.TclError:
+    print("null")
+    raise SystemExit
+import app
+app.AplicacaoOfertaDia(root)
+root.update()
+print((time.perf_counter() - inicio) * 1000)
+root.destroy()
+"""
+
+def _python(codigo, *opcoes):
+    return subprocess.run([sys.executable, *opcoes, "-c", codigo], cwd=RAIZ, capture_output=True, text=True,
+                          check=True)
+
+def medir_importacao():
+    """
+    Importa app.py em um processo novo com -X importtime
+
+    Returns:
+        tuple: (tempo total em ms, dict módulo -> tempo acumulado em ms)
+    """
+    resultado = _python("import app", "-X", "importtime")
+    acumulados = {}
+    for linha in resultado.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, acumulado, modulo = linha[len("import time:"):].split("|")
+        acumulados[modulo.strip()] = int(acumulado) / 1000
+    return acumulados.get('app', 0.0), acumulados
+
+def modulos_carregados():
+    """Módulos presentes em sys.modules logo após 'import app'"""
+    resultado = _python("import json, sys, app; print(json.dumps(sorted(sys.modules)))")
+    return json.loads(resultado.stdout)
+
+def medir_janela():
+    """Tempo em ms até a janela ser desenhada, ou None sem tela"""
+    try:
+        saida = _python(_CODIGO_JANELA).stdout.strip().splitlines()
+    except subprocess.CalledProcessError:
+        return None
+    return json.loads(saida[-1]) if saida else None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da inicialização de app.py")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Processos medidos (vale o menor tempo)")
+    parser.add_argument("--limite-ms", type=float, default=LIMITE_MS, help="Tempo máximo aceito para 'import app'")
+    parser.add_argument("--top", type=int, default=10, help="Módulos mais lentos listados")
+    args = parser.parse_args()
+
+    medicoes = [medir_importacao() for _ in range(args.repeticoes)]
+    total, acumulados = min(medicoes, key=lambda medicao: medicao[0])
+
+    print(f"import app: {total:.1f} ms (melhor de {args.repeticoes})")
+    # Só os imports de primeiro nível de cada pacote, para não repetir subpacotes
+    raizes = {modulo: tempo for modulo, tempo in acumulados.items() if '.' not in modulo and modulo != 'app'}
+    for modulo, tempo in sorted(raizes.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {modulo:<30} {tempo:8.1f} ms")
+
+    janela = medir_janela()
+    if janela is not None:
+        print(f"janela desenhada: {janela:.1f} ms")
+    else:
+        print("[INFO] Sem tela: tempo até a janela não medido")
+
+    erros = []
+    pesadas = sorted({modulo.split('.')[0] for modulo in modulos_carregados()} & set(PESADAS))
+    if pesadas:
+        erros.append(f"app.py importa bibliotecas pesadas na inicialização: {', '.join(pesadas)}")
+    if total > args.limite_ms:
+        erros.append(f"import app levou {total:.1f} ms (limite: {args.limite_ms:.0f} ms)")
+
+    print("\n" + "="*80)
+    for erro in erros:
+        print(f"[ERRO] {erro}")
+    if not erros:
+        print("[OK] Inicialização dentro do limite")
+    sys.exit(1 if erros else 0)
@@ -0,0 +1,104 @@
+"""
+Microbenchmark do parser de linhas do ExtratorPDF
+Compara o tokenizador atual com a regex antiga:
+1. Confere que os dois produzem os mesmos campos nas linhas dos PDFs de exemplo
+2. Mede o tempo por linha em linhas normais e em linhas patológicas
+"""
+import sys
+import re
+import timeit
+from pathlib import Path
+
+import pdfplumber
+
+RAIZ = Path(__file__).parent.parent
+sys.path.insert(0, str(RAIZ / "modules"))
+
+from extrator import ExtratorPDF
+
+# Regex usada antes do tokenizador (referência)
+PADRAO_ANTIGO = r'^(\d+)\s+(\S+)\s+(.+?)\s+(-?\d+)\s+(CX|FD|UN)\s+(\S+)?\s+(.+?)\s+([\d,]+)$'
+
+def extrair_produto_regex(linha):
+    """Implementação antiga de ExtratorPDF._extrair_produto"""
+    match = re.match(PADRAO_ANTIGO, linha.strip())
+
+    if match:
+        try:
+            return {
+                'codigo': match.group(1),
+                'numero': match.group(2),
+                'descricao': match.group(3).strip(),
+                'estoque': int(match.group(4)),
+                'unidade': match.group(5),
+                'local': match.group(6) if match.group(6) else "",
+                'marca': match.group(7).strip(),
+                'preco': float(match.group(8).replace(',', '.'))
+            }
+        except (ValueError, IndexError):
+            return None
+    return None
+
+def linhas_exemplos():
+    """Lê todas as linhas dos PDFs de exemplo"""
+    linhas = []
+    for pdf_path in sorted(RAIZ.glob("exemplos/*.PDF")) + sorted(RAIZ.glob("*.PDF")):
+        with pdfplumber.open(pdf_path) as pdf:
+            for pagina in pdf.pages:
+                linhas.extend(pagina.extract_text().split('\n'))
+    return linhas
+
+def linhas_patologicas():
+    """Linhas longas/malformadas que fazem a regex antiga retroceder muito"""
+    return {
+        "muitos pares 'N CX' sem preco": "1 2 " + "ABC 10 CX " * 200 + "MARCA X",
+        "descricao longa sem unidade": "1 2 " + "PALAVRA " * 400 + "10 KG MARCA 1,00",
+        "unidade no fim sem marca": "1 2 " + "10 CX " * 200 + "1,00",
+        "linha com espacos repetidos": "1   2   " + "A    1    " * 200 + "CX    1,00",
+    }
+
+def conferir_equivalencia(extrator, linhas):
+    """Retorna as linhas em que o tokenizador difere da regex antiga"""
+    return [l for l in linhas if extrator._extrair_produto(l) != extrair_produto_regex(l)]
+
+def medir(funcao, linha, repeticoes):
+    """Tempo médio por chamada em microssegundos"""
+    tempo = min(timeit.repeat(lambda: funcao(linha), number=repeticoes, repeat=3))
+    return tempo / repeticoes * 1e6
+
+def main():
+    extrator = ExtratorPDF(None)
+
+    print("="*80)
+    print("EQUIVALENCIA COM A REGEX ANTIGA")
+    print("="*80)
+    linhas = linhas_exemplos()
+    patologicas = linhas_patologicas()
+    diferentes = conferir_equivalencia(extrator, linhas + list(patologicas.values()))
+    print(f"Linhas conferidas: {len(linhas) + len(patologicas)}")
+    print(f"Diferencas: {len(diferentes)}")
+    for linha in diferentes[:10]:
+        print(f"  [DIFERENTE] {linha[:100]}")
+
+    print("\n" + "="*80)
+    print("TEMPO POR LINHA (us)")
+    print("="*80)
+    print(f"{'Caso':<35} {'Regex':>12} {'Tokenizador':>12} {'Ganho':>8}")
+
+    casos = {"linhas dos exemplos (media)": None}
+    casos.update(patologicas)
+    for nome, linha in casos.items():
+        if linha is None:
+            amostra = [l for l in linhas if l.strip()]
+            t_regex = medir(lambda _: [extrair_produto_regex(l) for l in amostra], None, 20) / len(amostra)
+            t_token = medir(lambda _: [extrator._extrair_produto(l) for l in amostra], None, 20) / len(amostra)
+        else:
+            t_regex = medir(extrair_produto_regex, linha, 20)
+            t_token = medir(extrator._extrair_produto, linha, 20)
+        print(f"{nome:<35} {t_regex:>12.2f} {t_token:>12.2f} {t_regex / t_token:>7.1f}x")
+
+    return not diferentes
+
+if __name__ == "__main__":
+    sucesso = main()
+    sys.exit(0 if sucesso else 1)
@@ -2,6 +2,7 @@
 Script de teste completo - Workflow completo do sistema
 Testa: Extração → Geração com data de validade → Conversão → Abertura
 """
+import argparse
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -12,9 +13,17 @@ sys.path.insert(0, str(Path(__file__).parent / "modules"))
 from extrator import ExtratorPDF
 from gerador import GeradorOferta
 from conversor import ConversorPDF
+from metricas import Metricas
+from perfil import Perfilador, perfil_ativo
 
-def teste_completo():
-    """Executa teste completo do sistema"""
+def teste_completo(perfil=False):
+    """
+    Executa teste completo do sistema
+    
+    Args:
+        perfil (bool): Grava cProfile e pico de memória de cada etapa em
+            output/perfil/ (também ativado por TABELADODIA_PERFIL)
+    """
     print("="*80)
     print("TESTE COMPLETO DO SISTEMA OFERTA DO DIA")
     print("="*80)
@@ -25,7 +34,10 @@ def teste_completo():
     hoje = datetime.now().strftime("%d%m%Y")
     pdf_path = f"{hoje}.PDF"
     
-    extrator = ExtratorPDF(pdf_path)
+    perfilador = Perfilador("output/perfil") if perfil_ativo(perfil) else None
+    metricas = Metricas(perfilador, pdf=pdf_path, origem='teste_completo')
+    
+    extrator = ExtratorPDF(pdf_path, metricas=metricas)
     produtos = extrator.extrair_produtos(estoque_minimo=5)
     
     if not produtos:
@@ -36,7 +48,7 @@ def teste_completo():
     
     # Passo 2: Geração DOCX com data de validade
     print("[2/3] Gerando DOCX com data de validade...")
-    gerador = GeradorOferta(produtos)
+    gerador = GeradorOferta(produtos, metricas=metricas)
     docx_path = gerador.gerar_docx()
     
     if not docx_path:
@@ -48,7 +60,8 @@ def teste_completo():
     # Passo 3: Conversão para PDF
     print("[3/3] Convertendo para PDF...")
     conversor = ConversorPDF()
-    pdf_path_final = conversor.converter(docx_path)
+    pdf_path_final = conversor.converter(docx_path, metricas=metricas)
+    metricas.salvar()
     
     if not pdf_path_final:
         print("[ERRO] Falha ao converter para PDF!")
@@ -65,9 +78,16 @@ def teste_completo():
     print(f"  - {pdf_path_final}")
     print(f"\nProdutos incluidos: {len(produtos)}")
     print(f"Data de validade: {datetime.now().strftime('%d/%m/%Y')}")
+    if perfilador is not None:
+        print(f"Perfil das etapas: {perfilador.pasta}")
     
     return True
 
 if __name__ == "__main__":
-    sucesso = teste_completo()
+    parser = argparse.ArgumentParser(description="Teste completo: extração → DOCX → PDF")
+    parser.add_argument("--profile", action="store_true",
+                        help="Grava cProfile e pico de memória de cada etapa em output/perfil/")
+    args = parser.parse_args()
+    
+    sucesso = teste_completo(perfil=args.profile)
     sys.exit(0 if sucesso else 1)